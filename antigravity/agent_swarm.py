@@ -20,6 +20,14 @@ Architecture:
 
   All coordinated, all parallel, all cloud-backed
 
+Scheduling:
+  - Tasks form a DAG via `dependencies`; cycles are rejected at add_task
+  - run() keeps a ready queue of tasks whose dependencies are completed and
+    dispatches continuously up to max_concurrent (no batch barriers)
+  - A failed task fails its dependents instead of leaving them pending
+  - Agents with spare capacity sit in a per-role free-list (O(1) pick)
+  - critical_path() estimates the minimum wall time of the task graph
+
 Cost: $0 (Ollama only, no subscriptions)
 Memory: Minimal (agents are lightweight)
 Scale: Unlimited (add more agents = linear scale)
@@ -28,10 +36,11 @@ Scale: Unlimited (add more agents = linear scale)
 import asyncio
 import json
 import time
+from collections import deque
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from antigravity.config import PROJECT_ROOT
@@ -119,15 +128,20 @@ class AgentSwarm:
     Usage:
         swarm = AgentSwarm(num_agents=100)
 
-        # Add tasks
-        task = SwarmTask(
+        # Add tasks (dependencies by task id)
+        outline = await swarm.add_task(
+            role=AgentRole.ARCHITECT,
+            description="Outline YouTube script",
+            prompt="Outline a 10-minute script about...",
+        )
+        await swarm.add_task(
             role=AgentRole.CONTENT_WRITER,
             description="Write YouTube script",
-            prompt="Create a 10-minute script about..."
+            prompt="Create a 10-minute script about...",
+            dependencies=[outline],
         )
-        await swarm.add_task(task)
 
-        # Run swarm (all tasks in parallel)
+        # Run swarm (every task starts as soon as its dependencies are done)
         results = await swarm.run()
     """
 
@@ -141,16 +155,22 @@ class AgentSwarm:
         self.tasks: Dict[str, SwarmTask] = {}
         self.pending_tasks: List[str] = []
         self.completed_results: List[Dict[str, Any]] = []
+        # task_id → ids of tasks that list it as a dependency
+        self.dependents: Dict[str, List[str]] = {}
+        # Agents with spare capacity, per role (an agent is listed while active < capacity)
+        self._free: Dict[AgentRole, Deque[SwarmAgent]] = {role: deque() for role in AgentRole}
 
         # Create lightweight agents (just Ollama, not heavy processes)
         for i in range(num_agents):
             agent_id = f"agent_{i:03d}"
             role = list(AgentRole)[i % len(AgentRole)]
-            self.agents[agent_id] = SwarmAgent(
+            agent = SwarmAgent(
                 agent_id=agent_id,
                 role=role,
                 capacity=5,  # Each agent handles 5 tasks
             )
+            self.agents[agent_id] = agent
+            self._free[role].append(agent)
 
         self._ensure_directories()
         print(f"🐝 Swarm initialized: {num_agents} agents ready")
@@ -165,59 +185,202 @@ class AgentSwarm:
         description: str,
         prompt: str,
         dependencies: Optional[List[str]] = None,
+        task_id: Optional[str] = None,
     ) -> str:
-        """Add task to swarm queue."""
-        task_id = f"task_{uuid4().hex[:8]}"
+        """
+        Add task to swarm queue.
+
+        Dependencies may name tasks that are added later (pass task_id to
+        give them a known id). Raises ValueError if the task would close a
+        dependency cycle.
+        """
+        task_id = task_id or f"task_{uuid4().hex[:8]}"
+        if task_id in self.tasks:
+            raise ValueError(f"Task {task_id} already exists")
+        dependencies = list(dict.fromkeys(dependencies or []))
+
+        cycle = self._find_cycle(task_id, dependencies)
+        if cycle:
+            raise ValueError(f"Dependency cycle: {' → '.join(cycle)}")
 
         task = SwarmTask(
             task_id=task_id,
             role=role,
             description=description,
             prompt=prompt,
-            dependencies=dependencies or [],
+            dependencies=dependencies,
         )
 
         self.tasks[task_id] = task
         self.pending_tasks.append(task_id)
+        for dep_id in dependencies:
+            self.dependents.setdefault(dep_id, []).append(task_id)
 
         return task_id
 
+    def _find_cycle(self, task_id: str, dependencies: List[str]) -> Optional[List[str]]:
+        """Path task_id → ... → task_id through the dependency edges, if adding it closes one."""
+        if task_id in dependencies:
+            return [task_id, task_id]
+        # Only tasks already depending on task_id (forward references) can close a cycle:
+        # walk from task_id along dependents and see whether one of its new dependencies is hit.
+        targets = set(dependencies)
+        parent: Dict[str, str] = {}
+        stack = [task_id]
+        while stack:
+            node = stack.pop()
+            for dependent in self.dependents.get(node, []):
+                if dependent in parent:
+                    continue
+                parent[dependent] = node
+                if dependent in targets:
+                    path = [dependent]
+                    while path[-1] != task_id:
+                        path.append(parent[path[-1]])
+                    return [task_id] + path
+                stack.append(dependent)
+        return None
+
     async def run(self, max_concurrent: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Execute all tasks in parallel.
+        Execute all pending tasks in dependency order.
 
-        Returns results from all agents.
+        A task is dispatched as soon as all its dependencies are completed
+        and a slot is free; up to max_concurrent tasks run at any time.
+        Returns results in the order the tasks were added.
         """
         print(f"\n🚀 Running swarm with {len(self.pending_tasks)} tasks")
 
-        # Determine max concurrency
+        # Determine max concurrency (never more than the agents can hold)
+        capacity = sum(agent.capacity for agent in self.agents.values())
         if max_concurrent is None:
-            max_concurrent = len(self.agents) * 5  # 100 agents * 5 tasks each
-
-        # Create batches of tasks
-        batches = [
-            self.pending_tasks[i : i + max_concurrent]
-            for i in range(0, len(self.pending_tasks), max_concurrent)
+            max_concurrent = capacity  # 100 agents * 5 tasks each
+        max_concurrent = max(1, min(max_concurrent, capacity))
+
+        estimate, path = self.critical_path()
+        if len(path) > 1:
+            print(f"   Critical path: {len(path)} tasks, ~{estimate:.1f}s")
+
+        order = list(self.pending_tasks)
+        waiting: Dict[str, int] = {}
+        ready: Deque[str] = deque()
+        for task_id in order:
+            task = self.tasks[task_id]
+            missing = [dep for dep in task.dependencies if dep not in self.tasks]
+            if missing:
+                self._fail_without_running(task, f"Dependency {missing[0]} not found")
+                continue
+            open_deps = [
+                dep for dep in task.dependencies
+                if self.tasks[dep].status != TaskStatus.COMPLETED
+            ]
+            failed = next((dep for dep in open_deps if self.tasks[dep].status == TaskStatus.FAILED), None)
+            if failed:
+                self._fail_without_running(task, f"Dependency {failed} failed")
+                continue
+            waiting[task_id] = len(open_deps)
+            if not open_deps:
+                ready.append(task_id)
+
+        # Tasks failed during setup propagate to their dependents before dispatch
+        for task_id in order:
+            if self.tasks[task_id].status == TaskStatus.FAILED:
+                self._fail_dependents(task_id, waiting)
+
+        running: Dict[asyncio.Task, str] = {}
+        while ready or running:
+            while ready and len(running) < max_concurrent:
+                task_id = ready.popleft()
+                running[asyncio.create_task(self._execute_task(task_id))] = task_id
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                task_id = running.pop(future)
+                if self.tasks[task_id].status == TaskStatus.COMPLETED:
+                    for dependent in self.dependents.get(task_id, []):
+                        if dependent in waiting:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0:
+                                ready.append(dependent)
+                else:
+                    self._fail_dependents(task_id, waiting)
+
+        self.pending_tasks = [
+            task_id for task_id in order
+            if self.tasks[task_id].status not in (TaskStatus.COMPLETED, TaskStatus.FAILED)
         ]
 
-        all_results = []
-
-        for batch_num, batch in enumerate(batches):
-            print(f"\n📦 Batch {batch_num + 1}/{len(batches)} ({len(batch)} tasks)")
+        all_results = [self.tasks[task_id].to_dict() for task_id in order]
+        self._log_results(all_results)
+        return all_results
 
-            # Execute batch in parallel
-            batch_results = await asyncio.gather(
-                *[self._execute_task(task_id) for task_id in batch],
-                return_exceptions=False,
-            )
+    def _fail_without_running(self, task: SwarmTask, error: str) -> None:
+        task.status = TaskStatus.FAILED
+        task.error = error
+        task.completed_at = time.time()
+
+    def _fail_dependents(self, task_id: str, waiting: Dict[str, int]) -> None:
+        """Fail every task that (transitively) depends on a failed task."""
+        stack = [task_id]
+        while stack:
+            failed_id = stack.pop()
+            for dependent in self.dependents.get(failed_id, []):
+                if waiting.pop(dependent, None) is None:
+                    continue
+                self._fail_without_running(self.tasks[dependent], f"Dependency {failed_id} failed")
+                stack.append(dependent)
+
+    def critical_path(self, durations: Optional[Dict[str, float]] = None) -> Tuple[float, List[str]]:
+        """
+        Longest dependency chain among the pending tasks → (seconds, [task_ids]).
 
-            all_results.extend(batch_results)
+        Durations default to the average runtime of each role so far
+        (1s for roles that have not completed anything yet).
+        """
+        if durations is None:
+            per_role: Dict[AgentRole, List[float]] = {}
+            for task in self.tasks.values():
+                if task.status == TaskStatus.COMPLETED and task.duration_seconds:
+                    per_role.setdefault(task.role, []).append(task.duration_seconds)
+            averages = {role: sum(times) / len(times) for role, times in per_role.items()}
+            durations = {
+                task_id: averages.get(task.role, 1.0) for task_id, task in self.tasks.items()
+            }
 
-        self._log_results(all_results)
-        return all_results
+        pending = set(self.pending_tasks)
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+
+        def finish_time(task_id: str) -> float:
+            # Iterative DFS: graphs can be deeper than the recursion limit
+            stack = [task_id]
+            while stack:
+                node = stack[-1]
+                deps = [d for d in self.tasks[node].dependencies if d in pending]
+                todo = [d for d in deps if d not in finish]
+                if todo:
+                    stack.extend(todo)
+                    continue
+                stack.pop()
+                if node in finish:
+                    continue
+                before = max(deps, key=lambda d: finish[d], default=None)
+                finish[node] = (finish[before] if before else 0.0) + durations.get(node, 0.0)
+                previous[node] = before
+            return finish[task_id]
+
+        if not self.pending_tasks:
+            return 0.0, []
+        best = max(self.pending_tasks, key=finish_time)
+        path = []
+        node: Optional[str] = best
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return finish[best], path[::-1]
 
     async def _execute_task(self, task_id: str) -> Dict[str, Any]:
-        """Execute single task (assigned to available agent)."""
+        """Execute single task (dependencies are already completed)."""
         task = self.tasks[task_id]
 
         # Find available agent
@@ -230,23 +393,13 @@ class AgentSwarm:
         # Assign to agent
         task.agent_id = agent.agent_id
         task.status = TaskStatus.ASSIGNED
-        agent.active_tasks += 1
 
         try:
-            # Check dependencies
-            for dep_id in task.dependencies:
-                if dep_id not in self.tasks:
-                    raise ValueError(f"Dependency {dep_id} not found")
-                dep = self.tasks[dep_id]
-                if dep.status != TaskStatus.COMPLETED:
-                    task.status = TaskStatus.PENDING
-                    agent.active_tasks -= 1
-                    return task.to_dict()
-
             # Execute with Offline Claude
             task.started_at = time.time()
             task.status = TaskStatus.RUNNING
 
+            # Lightweight session: model discovery + client are shared (model_registry)
             claude = OfflineClaude()
             result = await claude.think(
                 task=task.prompt,
@@ -269,25 +422,31 @@ class AgentSwarm:
 
         finally:
             task.completed_at = time.time()
-            agent.active_tasks -= 1
+            self._release_agent(agent)
             agent.total_runtime_seconds += task.duration_seconds
             agent.last_active = time.time()
 
         return task.to_dict()
 
     def _find_available_agent(self, role: AgentRole) -> Optional[SwarmAgent]:
-        """Find an available agent (preferring matching role)."""
-        # First, try to find agent with matching role
-        for agent in self.agents.values():
-            if agent.role == role and agent.is_available:
-                return agent
-
-        # Otherwise, find any available agent
-        for agent in self.agents.values():
-            if agent.is_available:
-                return agent
-
-        return None
+        """Take a slot on an available agent (preferring matching role). O(1) per role."""
+        free = self._free[role]
+        if not free:
+            # Otherwise, any role with spare capacity (at most len(AgentRole) checks)
+            free = next((q for q in self._free.values() if q), None)
+            if free is None:
+                return None
+        agent = free[0]
+        agent.active_tasks += 1
+        if not agent.is_available:
+            free.popleft()
+        return agent
+
+    def _release_agent(self, agent: SwarmAgent) -> None:
+        """Give the slot back; a full agent re-enters its role's free-list."""
+        agent.active_tasks -= 1
+        if agent.active_tasks == agent.capacity - 1:
+            self._free[agent.role].append(agent)
 
     def get_swarm_status(self) -> Dict[str, Any]:
         """Get overall swarm status."""
@@ -4,12 +4,22 @@ Autonomous Daemon — Continuous Operation Without Human Input
 Runs 24/7, completes tasks autonomously, handles context limits gracefully.
 
 Features:
-  1. Persistent task queue
+  1. Persistent task queue (priority heap + append-only journal)
   2. Multi-model execution (Claude→Ollama fallback)
   3. Automatic checkpointing
   4. Context-aware continuation
   5. Self-healing on errors
   6. Work logging for audit trail
+  7. Concurrent workers, sized by the ResourceAwareExecutor tier
+
+Queue persistence:
+  queue.jsonl is a journal of state transitions (enqueue / start /
+  complete / fail), one appended line each — nothing is rewritten on
+  insert. On startup the journal is replayed; tasks that were RUNNING
+  when the process died go back to PENDING. Once the journal holds
+  JOURNAL_COMPACT_AFTER lines (and mostly dead ones), it is compacted
+  to one enqueue line per open task. Old queue.jsonl files (one task
+  dict per line) replay as enqueues.
 
 Perfect for:
   - Background automation
@@ -20,12 +30,15 @@ Perfect for:
 """
 
 import asyncio
+import heapq
+import itertools
 import json
+import os
 import time
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List
+from typing import List, Optional, Set, Tuple
 
 from antigravity.config import PROJECT_ROOT
 from antigravity.state_recovery import StateCheckpoint
@@ -43,6 +56,11 @@ class TaskStatus(str, Enum):
     DEFERRED = "deferred"
 
 
+JOURNAL_COMPACT_AFTER = 1000  # journal lines before compaction is considered
+RESOURCE_RECHECK_SEC = 30     # how often a busy daemon re-reads the resource tier
+IDLE_SLEEP_SEC = 300          # max wait for new tasks when the queue is empty
+
+
 class TaskPriority(int, Enum):
     """Task priority levels."""
     CRITICAL = 10
@@ -78,7 +96,10 @@ class AutonomousTask:
     @classmethod
     def from_dict(cls, data: dict) -> "AutonomousTask":
         """Create from dict."""
-        return cls(**data)
+        task = cls(**data)
+        task.priority = TaskPriority(task.priority)
+        task.status = TaskStatus(task.status)
+        return task
 
     def duration_seconds(self) -> float:
         """How long did task take."""
@@ -99,7 +120,7 @@ class AutonomousDaemon:
             agent_role="analyst",
             prompt="Research and list..."
         )
-        await daemon.run()  # Runs forever
+        await daemon.run()  # Runs forever (workers = tier concurrency)
     """
 
     TASK_QUEUE_FILE = Path(PROJECT_ROOT) / "antigravity" / "_daemon" / "queue.jsonl"
@@ -108,7 +129,12 @@ class AutonomousDaemon:
 
     def __init__(self):
         self.tasks: dict[str, AutonomousTask] = {}
-        self.task_queue: List[str] = []
+        # Heap of (-priority, seq, task_id): highest priority first, FIFO within a priority.
+        # Entries are not removed when a task changes state; pops skip non-pending tasks.
+        self.task_queue: List[Tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._journal_lines = 0
+        self._wakeup: Optional[asyncio.Event] = None
         self.claude = OfflineClaude()
         self.executor = get_executor()
         self.is_running = False
@@ -123,33 +149,90 @@ class AutonomousDaemon:
         """Create daemon directories."""
         self.TASK_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
 
+    # ─── Queue + Journal ────────────────────────────────────────────────
+    def _push(self, task: AutonomousTask) -> None:
+        heapq.heappush(self.task_queue, (-int(task.priority), next(self._seq), task.task_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
     def _load_queue(self) -> None:
-        """Load task queue from disk."""
+        """Replay the journal: rebuild tasks and the priority heap."""
+        if not self.TASK_QUEUE_FILE.exists():
+            return
         try:
-            if self.TASK_QUEUE_FILE.exists():
-                with open(self.TASK_QUEUE_FILE) as f:
-                    for line in f:
-                        data = json.loads(line)
-                        task = AutonomousTask.from_dict(data)
-                        self.tasks[task.task_id] = task
-                        if task.status in (
-                            TaskStatus.PENDING,
-                            TaskStatus.PAUSED,
-                        ):
-                            self.task_queue.append(task.task_id)
-        except Exception as e:
+            with open(self.TASK_QUEUE_FILE) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._replay(json.loads(line))
+                    except (json.JSONDecodeError, TypeError, ValueError) as e:
+                        # Torn last line after a crash, or a corrupt entry
+                        print(f"⚠️  Skipping journal entry: {e}")
+                    self._journal_lines += 1
+        except OSError as e:
             print(f"⚠️  Error loading queue: {e}")
 
-    def _save_queue(self) -> None:
-        """Save task queue to disk."""
+        for task in self.tasks.values():
+            if task.status == TaskStatus.RUNNING:
+                # Interrupted mid-run (crash / kill): run it again
+                task.status = TaskStatus.PENDING
+                task.started_at = None
+            if task.status in (TaskStatus.PENDING, TaskStatus.PAUSED):
+                self._push(task)
+        self._maybe_compact()
+
+    def _replay(self, entry: dict) -> None:
+        op = entry.get("op")
+        if op is None:  # legacy queue.jsonl: one task dict per line
+            op, entry = "enqueue", {"task": entry}
+        if op == "enqueue":
+            task = AutonomousTask.from_dict(entry["task"])
+            self.tasks[task.task_id] = task
+            return
+        task = self.tasks.get(entry.get("task_id"))
+        if task is None:
+            return
+        for key, value in entry.get("fields", {}).items():
+            setattr(task, key, value)
+        task.status = TaskStatus(task.status)
+
+    def _journal(self, entry: dict) -> None:
+        """Append one state transition (O(1) — the queue file is never rewritten here)."""
         try:
-            with open(self.TASK_QUEUE_FILE, "w") as f:
-                for task_id in self.task_queue:
-                    if task_id in self.tasks:
-                        task = self.tasks[task_id]
-                        f.write(json.dumps(task.to_dict()) + "\n")
-        except Exception as e:
-            print(f"❌ Error saving queue: {e}")
+            with open(self.TASK_QUEUE_FILE, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._journal_lines += 1
+        except OSError as e:
+            print(f"❌ Error writing queue journal: {e}")
+
+    def _journal_update(self, op: str, task: AutonomousTask, *fields: str) -> None:
+        values = {name: getattr(task, name) for name in ("status",) + fields}
+        self._journal({"op": op, "task_id": task.task_id, "fields": values})
+
+    def _open_tasks(self) -> List[AutonomousTask]:
+        return [
+            task for task in self.tasks.values()
+            if task.status not in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+        ]
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the journal as one enqueue per open task once it is mostly dead lines."""
+        open_tasks = self._open_tasks()
+        if self._journal_lines < JOURNAL_COMPACT_AFTER or self._journal_lines < 4 * len(open_tasks):
+            return
+        tmp = self.TASK_QUEUE_FILE.with_suffix(".jsonl.tmp")
+        try:
+            with open(tmp, "w") as f:
+                for task in open_tasks:
+                    f.write(json.dumps({"op": "enqueue", "task": task.to_dict()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.TASK_QUEUE_FILE)
+            self._journal_lines = len(open_tasks)
+        except OSError as e:
+            print(f"❌ Error compacting queue journal: {e}")
 
     def _log_work(self, task: AutonomousTask) -> None:
         """Log completed work."""
@@ -191,36 +274,37 @@ class AutonomousDaemon:
         )
 
         self.tasks[task_id] = task
-        self.task_queue.append(task_id)
-
-        # Sort by priority
-        self.task_queue.sort(
-            key=lambda tid: -self.tasks[tid].priority.value,
-            reverse=False,
-        )
-
-        self._save_queue()
+        self._journal({"op": "enqueue", "task": task.to_dict()})
+        self._push(task)
 
         print(f"✓ Task added: {task_id} ({name})")
         return task_id
 
-    async def run(self, max_runtime_hours: Optional[float] = None) -> None:
+    async def run(
+        self,
+        max_runtime_hours: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
         """
         Run daemon forever (or for specified hours).
 
         Handles:
           - Task execution in priority order
-          - Resource constraints (pauses if memory tight)
+          - Concurrent workers: as many as the resource tier allows
+            (ResourceAwareExecutor.TIER_CONCURRENCY, capped by max_workers)
+          - Resource constraints (no new tasks while CRITICAL)
           - Automatic retries on failure
           - Graceful shutdown
           - Context limit handling
         """
         self.is_running = True
+        self._wakeup = asyncio.Event()
         print(f"\n{'='*60}")
         print("🤖 Autonomous Daemon Started")
         print(f"{'='*60}\n")
 
         start_time = time.time()
+        running: Set[asyncio.Task] = set()
 
         try:
             while self.is_running:
@@ -231,55 +315,68 @@ class AutonomousDaemon:
                         print(f"⏱️  Runtime limit reached ({elapsed:.1f}h)")
                         break
 
-                # Check resources
+                # Check resources → number of workers
                 resources = self.executor.get_system_resources()
-                if resources.tier.value == "critical":
+                workers = resources.available_concurrency
+                if max_workers is not None:
+                    workers = min(workers, max_workers)
+                if workers <= 0 and not running:
                     print("⚠️  System in CRITICAL state, pausing")
                     await asyncio.sleep(60)
                     continue
 
-                # Get next task
-                task_id = await self._get_next_task()
-                if not task_id:
+                # Fill free worker slots
+                while len(running) < workers:
+                    task_id = self._get_next_task()
+                    if not task_id:
+                        break
+                    running.add(asyncio.create_task(self._execute_task(self.tasks[task_id])))
+
+                if not running:
                     print("⏸️  No tasks, sleeping...")
-                    await asyncio.sleep(300)  # Sleep 5 min
-                    continue
+                # Wake on: a task finishing, a new task (add_task), or the next resource check
+                self._wakeup.clear()
+                wakeup = asyncio.create_task(self._wakeup.wait())
+                done, _ = await asyncio.wait(
+                    running | {wakeup},
+                    timeout=RESOURCE_RECHECK_SEC if running else IDLE_SLEEP_SEC,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                wakeup.cancel()
+                running -= done
 
-                # Execute task
-                task = self.tasks[task_id]
-                await self._execute_task(task)
+            if running:
+                print(f"⏳ Waiting for {len(running)} running task(s)...")
+                await asyncio.gather(*running, return_exceptions=True)
+                running.clear()
 
         except KeyboardInterrupt:
             print("\n⏹️  Daemon interrupted")
         except Exception as e:
             print(f"❌ Daemon error: {e}")
         finally:
+            # Interrupted tasks stay RUNNING in the journal and are replayed as PENDING
+            for worker in running:
+                worker.cancel()
             self.is_running = False
+            self._wakeup = None
             self._save_status()
             print("\n✓ Daemon shut down cleanly")
 
-    async def _get_next_task(self) -> Optional[str]:
-        """Get next task from queue."""
-        # Remove completed tasks from queue
-        self.task_queue = [
-            tid
-            for tid in self.task_queue
-            if self.tasks[tid].status
-            not in (TaskStatus.COMPLETED, TaskStatus.FAILED)
-        ]
-
-        # Return first pending task
-        for task_id in self.task_queue:
-            task = self.tasks[task_id]
-            if task.status == TaskStatus.PENDING:
+    def _get_next_task(self) -> Optional[str]:
+        """Pop the highest-priority pending task (O(log n))."""
+        while self.task_queue:
+            _, _, task_id = heapq.heappop(self.task_queue)
+            task = self.tasks.get(task_id)
+            if task is not None and task.status == TaskStatus.PENDING:
                 return task_id
-
         return None
 
     async def _execute_task(self, task: AutonomousTask) -> None:
         """Execute a single task."""
         task.status = TaskStatus.RUNNING
         task.started_at = time.time()
+        self._journal_update("start", task, "started_at")
 
         print(f"\n🚀 {task.name}")
         print(f"   ID: {task.task_id}")
@@ -342,7 +439,14 @@ class AutonomousDaemon:
         finally:
             task.completed_at = time.time()
             self._log_work(task)
-            self._save_queue()
+            # Still RUNNING = cancelled on shutdown: journal keeps "start", replay re-queues it
+            if task.status == TaskStatus.COMPLETED:
+                self._journal_update("complete", task, "result", "tokens_used", "completed_at")
+            elif task.status != TaskStatus.RUNNING:
+                self._journal_update("fail", task, "error", "retry_count", "completed_at")
+            if task.status == TaskStatus.PENDING:
+                self._push(task)  # retry, behind tasks of the same priority
+            self._maybe_compact()
 
     def _save_status(self) -> None:
         """Save daemon status."""
@@ -38,6 +38,11 @@ _load_dotenv()
 # ─── Ollama Connection ──────────────────────────────────────────────
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_API_V1 = f"{OLLAMA_BASE_URL}/v1"  # OpenAI-compatible endpoint
+# How long the discovered model list is reused before /models is asked again
+MODEL_DISCOVERY_TTL_SEC = float(os.getenv("MODEL_DISCOVERY_TTL_SEC", "300"))
+# Embeddings for semantic knowledge retrieval (auto = Ollama if reachable, else hashed TF-IDF)
+KNOWLEDGE_EMBED_MODEL = os.getenv("KNOWLEDGE_EMBED_MODEL", "nomic-embed-text")
+KNOWLEDGE_EMBEDDER = os.getenv("KNOWLEDGE_EMBEDDER", "auto")  # auto | ollama | hashed
 
 # ─── Google Gemini Connection ───────────────────────────────────────
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
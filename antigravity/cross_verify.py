@@ -63,14 +63,16 @@ class VerificationGate:
     This prevents confirmation bias and catches hallucinations.
     """
 
-    def __init__(self, router, max_attempts: int = 2):
+    def __init__(self, router, max_attempts: int = 2, hedge: bool = True):
         """
         Args:
             router: UnifiedRouter instance
             max_attempts: Max fix-and-retry cycles before giving up
+            hedge: Use hedged router calls (backup provider when the primary is slow)
         """
         self.router = router
         self.max_attempts = max_attempts
+        self.hedge = hedge
 
     async def execute_verified(
         self,
@@ -105,6 +107,7 @@ class VerificationGate:
                 prompt=prompt,
                 agent_key=agent_key,
                 context=context,
+                hedge=self.hedge,
             )
 
             if not exec_result.get("success"):
@@ -196,6 +199,7 @@ RESPOND IN JSON:
         result = await self.router.execute(
             prompt=verification_prompt,
             agent_key="qa",  # Always QA agent for verification
+            hedge=self.hedge,
         )
 
         if not result.get("success"):
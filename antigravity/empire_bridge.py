@@ -34,6 +34,7 @@ Usage:
     status = bridge.system_status()
 """
 
+import asyncio
 import json
 import sys
 from datetime import datetime
@@ -172,7 +173,7 @@ class EmpireBridge:
 
         # Inject knowledge context if relevant
         if self.knowledge:
-            ki_context = self.knowledge.export_for_agent(prompt[:100])
+            ki_context = await asyncio.to_thread(self.knowledge.export_for_agent, prompt[:100])
             if ki_context and "Keine relevanten" not in ki_context:
                 context = f"{ki_context}\n\n{context}" if context else ki_context
 
@@ -0,0 +1,293 @@
+"""
+File Index — Persistent, Incremental Repository Index
+======================================================
+/api/system ran a full rglob over the repo on every request (four times,
+once per extension) and structure_builder walked the tree again to count
+lines. With generated output directories that is hundreds of thousands
+of stat calls per dashboard refresh.
+
+This index keeps one row per file in SQLite (path, dir, ext, size,
+mtime, lines) and refreshes incrementally:
+  - directories whose mtime did not change are not listed again —
+    their children come from the index (a directory's mtime changes
+    whenever an entry is added, removed or renamed)
+  - files are re-read (line count) only when size or mtime changed
+  - check_files=False trusts unchanged directories completely: one stat
+    per directory, no per-file stat. Structure-only callers (/api/system)
+    use it; in-place edits are picked up by the next full refresh
+  - refresh_if_stale() throttles walks for request handlers
+
+Aggregates (files / lines / bytes per extension) are cached counters,
+recomputed only when a refresh changed something.
+
+Excluded everywhere: .git, __pycache__, virtualenvs, node_modules, tool caches,
+_state (runtime SQLite DBs) and the index's own directory — otherwise every
+refresh would re-list it and re-upsert its own -wal/-shm files.
+
+Usage:
+    from antigravity.file_index import get_file_index
+    index = get_file_index()
+    index.refresh()
+    index.totals()             → {"files": ..., "lines": ..., "bytes": ...}
+    index.files(ext=".py")     → [{"path", "dir", "lines", ...}, ...]
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from antigravity.config import PROJECT_ROOT
+
+# ─── Config ─────────────────────────────────────────────────────────
+INDEX_DB = Path(__file__).parent / "_state" / "file_index.db"
+EXCLUDED_DIRS = {
+    ".git", "__pycache__", ".venv", "venv", "node_modules",
+    ".ruff_cache", ".pytest_cache", ".mypy_cache", ".tox", ".nox", "_state",
+}
+SQLITE_SIDECARS = ("-wal", "-shm", "-journal")  # rewritten on every commit of some DB
+LINE_COUNT_EXTS = {
+    ".py", ".md", ".js", ".ts", ".tsx", ".jsx", ".json", ".yml", ".yaml", ".toml",
+    ".sh", ".html", ".css", ".txt", ".rs", ".sql", ".ini", ".cfg",
+}
+LINE_COUNT_MAX_BYTES = 5 * 1024 * 1024  # bigger files are data, not code
+RACY_MTIME_SEC = 2.0  # a dir modified this recently may still change within its mtime tick
+
+
+def _count_lines(path: str, ext: str, size: int) -> int:
+    """Lines like str.split("\\n") counts them (newlines + 1), as structure_builder always did."""
+    if ext not in LINE_COUNT_EXTS or size > LINE_COUNT_MAX_BYTES:
+        return 0
+    try:
+        with open(path, "rb") as f:
+            return f.read().count(b"\n") + 1
+    except OSError:
+        return 0
+
+
+class FileIndex:
+    """SQLite index of the files below `root`, refreshed by directory mtime."""
+
+    def __init__(self, root: Path = Path(PROJECT_ROOT), path: Path = INDEX_DB):
+        self.root = Path(root)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._counters: Optional[Dict[str, dict]] = None
+        try:
+            self._own_dir = self.path.parent.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            self._own_dir = None  # index lives outside the tree
+        self.refreshed_at = 0.0
+        self.last_refresh: dict = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    dir TEXT NOT NULL,
+                    ext TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    lines INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+                CREATE INDEX IF NOT EXISTS idx_files_ext ON files(ext);
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    mtime_ns INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS counters (
+                    ext TEXT PRIMARY KEY,
+                    files INTEGER NOT NULL,
+                    lines INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL
+                );"""
+            )
+            self._conn = conn
+        return self._conn
+
+    def _excluded(self, rel_dir: str) -> bool:
+        return rel_dir.rsplit("/", 1)[-1] in EXCLUDED_DIRS or rel_dir == self._own_dir
+
+    # ─── Refresh ────────────────────────────────────────────────────
+    def refresh(self, check_files: bool = True) -> dict:
+        """Bring the index up to date. Returns what the walk did."""
+        with self._lock:
+            return self._refresh_locked(check_files)
+
+    def refresh_if_stale(self, max_age_sec: float, check_files: bool = True) -> dict:
+        """Refresh unless the last refresh is younger than max_age_sec."""
+        if time.time() - self.refreshed_at < max_age_sec:
+            return {}
+        with self._lock:
+            if time.time() - self.refreshed_at < max_age_sec:
+                return {}  # another thread refreshed meanwhile
+            return self._refresh_locked(check_files)
+
+    def _refresh_locked(self, check_files: bool) -> dict:
+        db = self._db()
+        started = time.time()
+        known_dirs = {path: mtime for path, mtime in db.execute("SELECT path, mtime_ns FROM dirs")}
+        subdirs: Dict[str, List[str]] = {}
+        for path, parent in db.execute("SELECT path, parent FROM dirs"):
+            if parent is not None:
+                subdirs.setdefault(parent, []).append(path)
+        known_files: Dict[str, tuple] = {}
+        files_in: Dict[str, List[str]] = {}
+        for path, dir_, size, mtime_ns in db.execute("SELECT path, dir, size, mtime_ns FROM files"):
+            known_files[path] = (size, mtime_ns)
+            files_in.setdefault(dir_, []).append(path)
+
+        upserts: List[tuple] = []
+        dir_rows: List[tuple] = []
+        seen_dirs = set()
+        seen_files = set()
+        stats = {"dirs_listed": 0, "dirs_skipped": 0, "files_updated": 0, "files_removed": 0}
+        racy_ns = int((started - RACY_MTIME_SEC) * 1e9)
+
+        def check_file(rel: str, rel_dir: str, abs_path: str, st) -> None:
+            seen_files.add(rel)
+            if known_files.get(rel) == (st.st_size, st.st_mtime_ns):
+                return
+            ext = os.path.splitext(rel)[1].lower()
+            upserts.append((rel, rel_dir, ext, st.st_size, st.st_mtime_ns, _count_lines(abs_path, ext, st.st_size)))
+
+        stack = [("", None)]
+        while stack:
+            rel_dir, parent = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else str(self.root)
+            try:
+                dir_mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+            seen_dirs.add(rel_dir)
+            # Racy: a dir changed within the last tick may change again unnoticed → re-list next time
+            dir_rows.append((rel_dir, parent, dir_mtime if dir_mtime < racy_ns else -1))
+
+            if known_dirs.get(rel_dir) == dir_mtime:
+                stats["dirs_skipped"] += 1
+                stack.extend((sub, rel_dir) for sub in subdirs.get(rel_dir, ()) if not self._excluded(sub))
+                for rel in files_in.get(rel_dir, ()):
+                    if not check_files:
+                        seen_files.add(rel)
+                        continue
+                    abs_path = os.path.join(self.root, rel)
+                    try:
+                        check_file(rel, rel_dir, abs_path, os.stat(abs_path))
+                    except OSError:
+                        pass  # vanished without a dir mtime change (clock skew) → removed below
+                continue
+
+            stats["dirs_listed"] += 1
+            try:
+                entries = list(os.scandir(abs_dir))
+            except OSError:
+                continue
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self._excluded(rel):
+                            stack.append((rel, rel_dir))
+                    elif entry.is_file() and not entry.name.endswith(SQLITE_SIDECARS):
+                        check_file(rel, rel_dir, entry.path, entry.stat())
+                except OSError:
+                    continue
+
+        removed_files = [(p,) for p in known_files if p not in seen_files]
+        removed_dirs = [(p,) for p in known_dirs if p not in seen_dirs]
+        db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", upserts)
+        db.executemany("DELETE FROM files WHERE path = ?", removed_files)
+        db.executemany("DELETE FROM dirs WHERE path = ?", removed_dirs)
+        db.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", dir_rows)
+        if upserts or removed_files:
+            self._recount(db)
+        elif self._counters is None:
+            self._load_counters(db)
+        db.commit()
+
+        stats["files_updated"] = len(upserts)
+        stats["files_removed"] = len(removed_files)
+        stats["seconds"] = round(time.time() - started, 3)
+        self.refreshed_at = time.time()
+        self.last_refresh = stats
+        return stats
+
+    # ─── Counters ───────────────────────────────────────────────────
+    def _load_counters(self, db: sqlite3.Connection) -> bool:
+        rows = db.execute("SELECT ext, files, lines, bytes FROM counters").fetchall()
+        self._counters = {ext: {"files": f, "lines": n, "bytes": b} for ext, f, n, b in rows}
+        return bool(rows)
+
+    def _recount(self, db: sqlite3.Connection) -> None:
+        db.execute("DELETE FROM counters")
+        db.execute(
+            "INSERT INTO counters SELECT ext, COUNT(*), SUM(lines), SUM(size) FROM files GROUP BY ext"
+        )
+        self._load_counters(db)
+
+    def counters(self) -> Dict[str, dict]:
+        """{ext: {files, lines, bytes}} — cached, no table scan."""
+        if self._counters is None:
+            with self._lock:
+                if self._counters is None:
+                    self._load_counters(self._db())
+        return self._counters
+
+    def totals(self, exts: Optional[List[str]] = None) -> dict:
+        """Summed counters, optionally for some extensions only."""
+        total = {"files": 0, "lines": 0, "bytes": 0}
+        for ext, c in self.counters().items():
+            if exts is None or ext in exts:
+                for key in total:
+                    total[key] += c[key]
+        return total
+
+    # ─── Queries ────────────────────────────────────────────────────
+    def files(self, ext: Optional[str] = None) -> List[dict]:
+        """Indexed files (optionally one extension), sorted by path."""
+        sql = "SELECT path, dir, ext, size, lines FROM files"
+        args: tuple = ()
+        if ext is not None:
+            sql += " WHERE ext = ?"
+            args = (ext,)
+        with self._lock:
+            rows = self._db().execute(sql + " ORDER BY path", args).fetchall()
+        return [
+            {"path": p, "dir": d or ".", "ext": e, "size": s, "lines": n}
+            for p, d, e, s, n in rows
+        ]
+
+    def by_dir(self, ext: Optional[str] = None) -> Dict[str, dict]:
+        """{dir: {files, lines}} aggregated in SQL."""
+        sql = "SELECT dir, COUNT(*), SUM(lines) FROM files"
+        args: tuple = ()
+        if ext is not None:
+            sql += " WHERE ext = ?"
+            args = (ext,)
+        with self._lock:
+            rows = self._db().execute(sql + " GROUP BY dir", args).fetchall()
+        return {d or ".": {"files": f, "lines": n or 0} for d, f, n in rows}
+
+
+# ─── Module-level singleton ─────────────────────────────────────────
+_index: Optional[FileIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_file_index() -> FileIndex:
+    """Shared index of the project root."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FileIndex()
+        return _index
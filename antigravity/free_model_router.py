@@ -25,6 +25,7 @@ from enum import Enum
 import asyncio
 import aiohttp
 from antigravity.config import GEMINI_API_KEY, ANTHROPIC_API_KEY, OLLAMA_BASE_URL
+from antigravity.http_pool import pooled_session
 
 logger = logging.getLogger(__name__)
 
@@ -222,7 +223,7 @@ class FreeModelRouter:
 
             model = models[0]  # Use first available
 
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.ollama_base}/api/generate",
                     json={
@@ -266,7 +267,7 @@ class FreeModelRouter:
             )
             model = models[0]
 
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     FREE_SERVICES["openrouter"]["endpoint"],
                     headers={
@@ -313,7 +314,7 @@ class FreeModelRouter:
             )
             model = models[0]
 
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     FREE_SERVICES["together"]["endpoint"],
                     headers={"Authorization": f"Bearer {self.together_key}"},
@@ -10,8 +10,10 @@ Supports:
 - Vertex AI (Google Cloud project + region)
 - Streaming responses
 - Model listing & health checks
+- Native async (achat / achat_stream / ahealth_check) next to the sync API
 """
 
+import asyncio
 import json
 from antigravity.config import (
     AgentConfig,
@@ -19,10 +21,12 @@ from antigravity.config import (
     GOOGLE_CLOUD_PROJECT,
     GOOGLE_CLOUD_REGION,
 )
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterator, Optional
 
 import httpx
 
+from antigravity.http_pool import get_async_client, get_http_client
+
 # Endpoints
 GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
 VERTEX_AI_BASE = (
@@ -153,61 +157,60 @@ class GeminiClient:
 
         return headers
 
-    def chat(
+    async def _aget_headers(self) -> dict[str, str]:
+        """Headers without blocking the loop (Vertex shells out to gcloud)."""
+        if self.use_vertex:
+            return await asyncio.to_thread(self._get_headers)
+        return self._get_headers()
+
+    def _prepare(
         self,
         agent: AgentConfig,
         user_message: str,
-        context: Optional[str] = None,
-    ) -> dict[str, Any]:
-        """
-        Send a chat request to Gemini.
-
-        Args:
-            agent: The agent configuration
-            user_message: The user/task message
-            context: Optional additional context
-
-        Returns:
-            dict with keys: content, model, usage, raw_response
-        """
+        context: Optional[str],
+        stream: bool = False,
+    ) -> tuple[str, str, dict[str, Any]]:
+        """Model, URL and payload for a request."""
         model = self._get_model_name(agent)
-        url = self._build_url(model, stream=False)
-        payload = self._build_payload(agent, user_message, context)
-        headers = self._get_headers()
+        url = self._build_url(model, stream=stream)
+        # Add alt=sse for streaming in direct API mode
+        if stream and not self.use_vertex and "?" in url:
+            url += "&alt=sse"
+        payload = self._build_payload(agent, user_message, context, stream=stream)
+        return model, url, payload
 
-        try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-        except httpx.ConnectError:
-            raise ConnectionError(
+    def _translate_error(self, exc: httpx.HTTPError, model: str) -> Exception:
+        """Map httpx errors to the builtin exceptions the router fails over on."""
+        if isinstance(exc, httpx.ConnectError):
+            return ConnectionError(
                 "Cannot connect to Gemini API. Check your internet connection "
                 "and API key."
             )
-        except httpx.TimeoutException:
-            raise TimeoutError(
+        if isinstance(exc, httpx.TimeoutException):
+            return TimeoutError(
                 f"Gemini request timed out after {self.timeout}s for model "
                 f"{model}. Try increasing timeout."
             )
-        except httpx.HTTPStatusError as exc:
+        if isinstance(exc, httpx.HTTPStatusError):
             status = exc.response.status_code
             body = exc.response.text[:500]
             if status == 403:
-                raise PermissionError(
+                return PermissionError(
                     f"Gemini API access denied (403). Check GEMINI_API_KEY or "
                     f"Google Cloud permissions. Response: {body}"
                 )
             if status == 429:
-                raise RuntimeError(
+                return RuntimeError(
                     f"Gemini API rate limit hit (429). Wait and retry. "
                     f"Response: {body}"
                 )
-            raise RuntimeError(
+            return RuntimeError(
                 f"Gemini API error {status}: {body}"
             )
+        return ConnectionError(f"Gemini request failed: {exc}")
 
-        # Parse response
+    @staticmethod
+    def _parse_response(data: dict[str, Any], model: str) -> dict[str, Any]:
         try:
             candidates = data.get("candidates", [])
             if not candidates:
@@ -234,53 +237,158 @@ class GeminiClient:
             "raw_response": data,
         }
 
-    def chat_stream(
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[list[str]]:
+        """Text parts of one SSE line ([] to skip), None at [DONE]."""
+        if not line or line.startswith(":"):
+            return []
+        if line.startswith("data: "):
+            line = line[6:]
+        if line.strip() == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(line)
+            candidates = chunk.get("candidates", [])
+            if not candidates:
+                return []
+            parts = candidates[0].get("content", {}).get("parts", [])
+            return [part.get("text", "") for part in parts if part.get("text", "")]
+        except (json.JSONDecodeError, KeyError, IndexError, AttributeError):
+            return []
+
+    def _health_url(self) -> str:
+        if self.use_vertex:
+            return (
+                f"https://{self.region}-aiplatform.googleapis.com/v1/"
+                f"projects/{self.project}/locations/{self.region}/"
+                f"publishers/google/models"
+            )
+        return f"{self.base_url}/models?key={self.api_key}"
+
+    # ─── Async API ──────────────────────────────────────────────────
+    async def achat(
         self,
         agent: AgentConfig,
         user_message: str,
         context: Optional[str] = None,
-    ):
+    ) -> dict[str, Any]:
         """
-        Stream a chat response from Gemini (yields chunks).
+        Send a chat request to Gemini (native async).
+
+        Args:
+            agent: The agent configuration
+            user_message: The user/task message
+            context: Optional additional context
+
+        Returns:
+            dict with keys: content, model, usage, raw_response
+        """
+        model, url, payload = self._prepare(agent, user_message, context)
+        headers = await self._aget_headers()
+
+        try:
+            response = await get_async_client().post(url, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as exc:
+            raise self._translate_error(exc, model) from exc
+
+        return self._parse_response(data, model)
+
+    async def achat_stream(
+        self,
+        agent: AgentConfig,
+        user_message: str,
+        context: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response from Gemini (async generator).
 
         Yields:
             str: Content chunks as they arrive
         """
-        model = self._get_model_name(agent)
-        url = self._build_url(model, stream=True)
-        # Add alt=sse for streaming in direct API mode
-        if not self.use_vertex and "?" in url:
-            url += "&alt=sse"
-        payload = self._build_payload(agent, user_message, context, stream=True)
-        headers = self._get_headers()
+        model, url, payload = self._prepare(agent, user_message, context, stream=True)
+        headers = await self._aget_headers()
 
-        with httpx.Client(timeout=self.timeout) as client:
-            with client.stream(
-                "POST", url, json=payload, headers=headers
+        try:
+            async with get_async_client().stream(
+                "POST", url, json=payload, headers=headers, timeout=self.timeout
             ) as response:
                 response.raise_for_status()
-                for line in response.iter_lines():
-                    if not line or line.startswith(":"):
-                        continue
-                    if line.startswith("data: "):
-                        line = line[6:]
-                    if line.strip() == "[DONE]":
+                async for line in response.aiter_lines():
+                    texts = self._parse_stream_line(line)
+                    if texts is None:
                         break
-                    try:
-                        chunk = json.loads(line)
-                        candidates = chunk.get("candidates", [])
-                        if candidates:
-                            parts = (
-                                candidates[0]
-                                .get("content", {})
-                                .get("parts", [])
-                            )
-                            for part in parts:
-                                text = part.get("text", "")
-                                if text:
-                                    yield text
-                    except (json.JSONDecodeError, KeyError, IndexError):
-                        continue
+                    for text in texts:
+                        yield text
+        except httpx.HTTPError as exc:
+            raise self._translate_error(exc, model) from exc
+
+    async def ahealth_check(self) -> bool:
+        """Check if Gemini API is accessible (async)."""
+        if not self.api_key and not self.use_vertex:
+            return False
+        try:
+            headers = await self._aget_headers()
+            response = await get_async_client().get(self._health_url(), headers=headers, timeout=10.0)
+            return response.status_code == 200
+        except (httpx.ConnectError, httpx.TimeoutException):
+            return False
+
+    # ─── Sync API (CLI callers) ─────────────────────────────────────
+    def chat(
+        self,
+        agent: AgentConfig,
+        user_message: str,
+        context: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Send a chat request to Gemini.
+
+        Args:
+            agent: The agent configuration
+            user_message: The user/task message
+            context: Optional additional context
+
+        Returns:
+            dict with keys: content, model, usage, raw_response
+        """
+        model, url, payload = self._prepare(agent, user_message, context)
+        headers = self._get_headers()
+
+        try:
+            response = get_http_client().post(url, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as exc:
+            raise self._translate_error(exc, model) from exc
+
+        return self._parse_response(data, model)
+
+    def chat_stream(
+        self,
+        agent: AgentConfig,
+        user_message: str,
+        context: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a chat response from Gemini (yields chunks).
+
+        Yields:
+            str: Content chunks as they arrive
+        """
+        model, url, payload = self._prepare(agent, user_message, context, stream=True)
+        headers = self._get_headers()
+
+        with get_http_client().stream(
+            "POST", url, json=payload, headers=headers, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                texts = self._parse_stream_line(line)
+                if texts is None:
+                    break
+                yield from texts
 
     def list_models(self) -> list[dict[str, Any]]:
         """List available Gemini models."""
@@ -297,11 +405,10 @@ class GeminiClient:
 
             headers = self._get_headers()
 
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("models", [])
+            response = get_http_client().get(url, headers=headers, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            return data.get("models", [])
         except (httpx.ConnectError, httpx.TimeoutException, httpx.HTTPStatusError):
             return []
 
@@ -311,20 +418,10 @@ class GeminiClient:
             if not self.api_key and not self.use_vertex:
                 return False
 
-            if self.use_vertex:
-                url = (
-                    f"https://{self.region}-aiplatform.googleapis.com/v1/"
-                    f"projects/{self.project}/locations/{self.region}/"
-                    f"publishers/google/models"
-                )
-            else:
-                url = f"{self.base_url}/models?key={self.api_key}"
-
             headers = self._get_headers()
 
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, headers=headers)
-                return response.status_code == 200
+            response = get_http_client().get(self._health_url(), headers=headers, timeout=10.0)
+            return response.status_code == 200
         except (httpx.ConnectError, httpx.TimeoutException):
             return False
 
@@ -0,0 +1,196 @@
+"""
+HTTP Pool — Process-Wide Connection Pools for all Provider Clients
+===================================================================
+Every provider call used to open a fresh httpx.Client / aiohttp
+ClientSession, paying a TCP (+TLS) handshake and DNS lookup per
+request. Under swarm load that is a measurable share of task latency.
+
+This registry hands out long-lived, shared clients instead:
+- httpx.Client (sync)              → get_http_client()
+- httpx.AsyncClient (per loop)     → get_async_client()
+- aiohttp.ClientSession (per loop) → pooled_session() / get_aiohttp_session()
+
+All pools use keep-alive and a total connection limit; aiohttp adds a
+per-host limit and DNS caching (httpx has no per-host limit, only a cap
+on idle keep-alive connections across all hosts). HTTP/2 is enabled for
+httpx when the optional 'h2' package is installed. Async clients are
+bound to the event loop that created them, so each loop gets its own,
+closed when that loop shuts down (asyncio.run → shutdown_asyncgens).
+
+Lifecycle:
+    await aclose_all()   # on async shutdown (FastAPI shutdown hook, end of main)
+    close_all()          # sync clients — also registered with atexit
+
+Usage:
+    from antigravity.http_pool import get_http_client, pooled_session
+    response = get_http_client().post(url, json=payload, timeout=120.0)
+
+    async with pooled_session() as session:   # shared, not closed on exit
+        async with session.post(url, json=payload) as resp:
+            ...
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+
+# ─── Pool Limits ────────────────────────────────────────────────────
+POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_LIMIT", "200"))
+POOL_MAX_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "50"))  # aiohttp only
+POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_KEEPALIVE", "50"))  # httpx: idle connections, all hosts
+POOL_KEEPALIVE_SEC = 30.0
+DNS_CACHE_TTL_SEC = 300
+DEFAULT_TIMEOUT_SEC = 120.0
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+_async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_aiohttp_sessions: dict = {}
+_loop_guards: dict[asyncio.AbstractEventLoop, list] = {}
+
+
+def _httpx_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=POOL_MAX_KEEPALIVE,
+        keepalive_expiry=POOL_KEEPALIVE_SEC,
+    )
+
+
+def _drop_closed_loops(registry: dict):
+    """Forget clients whose event loop is gone.
+
+    Normally they are closed already (see _close_on_loop_shutdown). A loop
+    closed without shutdown_asyncgens() leaves them open, and they cannot be
+    closed from another loop — their transports belong to the dead one.
+    """
+    for loop in [lp for lp in registry if lp.is_closed()]:
+        registry.pop(loop, None)
+        _loop_guards.pop(loop, None)
+
+
+def _close_on_loop_shutdown(loop: asyncio.AbstractEventLoop, aclose) -> None:
+    """Run `aclose()` on `loop` while it shuts down.
+
+    A suspended async generator is closed by loop.shutdown_asyncgens(),
+    which asyncio.run() calls before closing the loop — the only point
+    where the loop's connections can still be closed cleanly.
+    """
+    async def guard():
+        try:
+            yield
+        finally:
+            await aclose()
+
+    agen = guard()
+    _loop_guards.setdefault(loop, []).append(agen)  # strong ref: GC would close it early
+    loop.create_task(agen.__anext__())
+
+
+# ─── Sync httpx ─────────────────────────────────────────────────────
+def get_http_client() -> httpx.Client:
+    """Shared sync httpx client (thread-safe). Pass timeout= per request."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                timeout=DEFAULT_TIMEOUT_SEC,
+                limits=_httpx_limits(),
+                http2=HTTP2_AVAILABLE,
+            )
+        return _sync_client
+
+
+# ─── Async httpx ────────────────────────────────────────────────────
+def get_async_client() -> httpx.AsyncClient:
+    """Shared httpx.AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _drop_closed_loops(_async_clients)
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=DEFAULT_TIMEOUT_SEC,
+                limits=_httpx_limits(),
+                http2=HTTP2_AVAILABLE,
+            )
+            _async_clients[loop] = client
+            _close_on_loop_shutdown(loop, client.aclose)
+        return client
+
+
+# ─── aiohttp ────────────────────────────────────────────────────────
+def get_aiohttp_session():
+    """Shared aiohttp.ClientSession for the running event loop."""
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _drop_closed_loops(_aiohttp_sessions)
+        session = _aiohttp_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_MAX_CONNECTIONS,
+                limit_per_host=POOL_MAX_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL_SEC,
+                keepalive_timeout=POOL_KEEPALIVE_SEC,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT_SEC),
+            )
+            _aiohttp_sessions[loop] = session
+            _close_on_loop_shutdown(loop, session.close)
+        return session
+
+
+@asynccontextmanager
+async def pooled_session():
+    """Drop-in for `async with aiohttp.ClientSession() as session:` that keeps the pool open."""
+    yield get_aiohttp_session()
+
+
+# ─── Lifecycle ──────────────────────────────────────────────────────
+async def aclose_all():
+    """Close the async pools of the running loop (call on shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+        session = _aiohttp_sessions.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def close_all():
+    """Close the shared sync client."""
+    global _sync_client
+    with _lock:
+        client, _sync_client = _sync_client, None
+    if client is not None:
+        client.close()
+
+
+def pool_stats() -> dict:
+    """Snapshot of the registry for status reports."""
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "sync_client": _sync_client is not None and not _sync_client.is_closed,
+        "async_clients": len(_async_clients),
+        "aiohttp_sessions": len(_aiohttp_sessions),
+        "max_connections": POOL_MAX_CONNECTIONS,
+        "max_per_host": POOL_MAX_PER_HOST,
+        "max_keepalive": POOL_MAX_KEEPALIVE,
+    }
+
+
+atexit.register(close_all)
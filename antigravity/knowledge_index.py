@@ -0,0 +1,235 @@
+"""
+Knowledge Index — Inverted Index + BM25 for the Knowledge Store
+=================================================================
+KnowledgeStore.search() used to scan every Knowledge Item with a substring
+match on each call (and export_for_agent runs on every prompt injection).
+This index keeps search cost proportional to the matching postings, not
+to the size of the store.
+
+Structures (all maintained incrementally on add):
+  - postings:  term → {doc_no: weighted term frequency}
+               title ×3, tags ×2, type ×1, content ×1
+  - tags/types: tag / ki_type → [doc_no, ...] posting lists
+  - ids:       ki_id → doc_no, offsets[doc_no] → byte offset in the JSONL
+
+doc_no is the position of the item in knowledge_items.jsonl (valid lines only).
+Identifiers are indexed whole and by their parts, so both "kimi_swarm"
+and "swarm" find an item about kimi_swarm.
+Ranking is Okapi BM25; query terms without an exact posting fall back
+to prefix matches ("gemin" → "gemini"), similar to the old substring search.
+
+Persisted as knowledge_search_index.json next to the JSONL. The file
+records how many bytes of the JSONL it covers, so a stale index is not
+rebuilt — only the tail written after the last save gets indexed.
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+from bisect import bisect_left
+from heapq import nlargest
+from pathlib import Path
+from typing import Iterable, Optional
+
+INDEX_VERSION = 2  # 2: identifiers are also indexed by their _-separated parts
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"title": 3, "tags": 2, "type": 1, "content": 1}
+MAX_PREFIX_EXPANSION = 50  # terms per query word when falling back to prefix matching
+
+_TOKEN_RE = re.compile(r"[0-9a-zäöüß_]+")
+
+
+def tokenize(text: str, identifier_parts: bool = False) -> list[str]:
+    """Lowercase word tokens (≥2 chars). Hyphens/dots split: 'crash-safety' → crash, safety.
+
+    identifier_parts=True (used for indexing) also yields the parts of
+    snake_case identifiers: 'kimi_swarm' → kimi_swarm, kimi, swarm.
+    """
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1]
+    if not identifier_parts:
+        return tokens
+    out = []
+    for token in tokens:
+        out.append(token)
+        if "_" in token:
+            out.extend(part for part in token.split("_") if len(part) > 1)
+    return out
+
+
+class KnowledgeIndex:
+    """Incremental BM25 inverted index with tag/type posting lists and an id→offset map."""
+
+    def __init__(self):
+        self.postings: dict[str, dict[int, int]] = {}
+        self.doc_len: list[int] = []
+        self.total_len = 0
+        self.tags: dict[str, list[int]] = {}
+        self.types: dict[str, list[int]] = {}
+        self.ids: dict[str, int] = {}
+        self.offsets: list[int] = []
+        self.covered_bytes = 0  # JSONL bytes already indexed
+        self._vocab: Optional[list[str]] = None  # sorted terms for prefix lookup (lazy)
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    # ─── Build ──────────────────────────────────────────────────────
+    def add(self, data: dict, offset: int, end_offset: int) -> int:
+        """Index one item (as stored in the JSONL). Returns its doc_no."""
+        doc_no = len(self.doc_len)
+        tags = [str(t) for t in data.get("tags", [])]
+        ki_type = str(data.get("type", ""))
+
+        tf: dict[str, int] = {}
+        fields = (
+            ("title", data.get("title", "")),
+            ("tags", " ".join(tags)),
+            ("type", ki_type),
+            ("content", data.get("content", "")),
+        )
+        length = 0
+        for name, text in fields:
+            weight = FIELD_WEIGHTS[name]
+            for term in tokenize(str(text), identifier_parts=True):
+                tf[term] = tf.get(term, 0) + weight
+                length += weight
+
+        for term, freq in tf.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                self.postings[term] = {doc_no: freq}
+                self._vocab = None
+            else:
+                posting[doc_no] = freq
+
+        self.doc_len.append(length)
+        self.total_len += length
+        for tag in {t.lower() for t in tags}:
+            self.tags.setdefault(tag, []).append(doc_no)
+        self.types.setdefault(ki_type, []).append(doc_no)
+        ki_id = data.get("id", "")
+        if ki_id:
+            self.ids.setdefault(ki_id, doc_no)  # first wins, like the old linear get()
+        self.offsets.append(offset)
+        self.covered_bytes = max(self.covered_bytes, end_offset)
+        return doc_no
+
+    # ─── Query ──────────────────────────────────────────────────────
+    def search(self, query: str, limit: int = 20) -> list[tuple[float, int]]:
+        """BM25 top-k as (score, doc_no), best first. Ties → newer doc first."""
+        n_docs = len(self.doc_len)
+        if not n_docs:
+            return []
+        avg_len = self.total_len / n_docs or 1.0
+
+        scores: dict[int, float] = {}
+        doc_len = self.doc_len
+        k_base = BM25_K1 * (1 - BM25_B)
+        k_len = BM25_K1 * BM25_B / avg_len
+        for word in set(tokenize(query)):
+            for term in self._expand(word):
+                posting = self.postings[term]
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                gain = idf * (BM25_K1 + 1)
+                get = scores.get
+                for doc_no, freq in posting.items():
+                    scores[doc_no] = get(doc_no, 0.0) + gain * freq / (freq + k_base + k_len * doc_len[doc_no])
+
+        return nlargest(limit, ((score, doc_no) for doc_no, score in scores.items()))
+
+    def _expand(self, word: str) -> list[str]:
+        if word in self.postings:
+            return [word]
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        start = bisect_left(self._vocab, word)
+        matches = []
+        for term in self._vocab[start:start + MAX_PREFIX_EXPANSION]:
+            if not term.startswith(word):
+                break
+            matches.append(term)
+        return matches
+
+    def by_tag(self, tag: str) -> list[int]:
+        return self.tags.get(tag.lower(), [])
+
+    def by_type(self, ki_type: str) -> list[int]:
+        return self.types.get(ki_type, [])
+
+    def doc_no(self, ki_id: str) -> Optional[int]:
+        return self.ids.get(ki_id)
+
+    # ─── Persistence ────────────────────────────────────────────────
+    def save(self, path: Path) -> bool:
+        """Atomic write (tmp + rename)."""
+        path = Path(path)
+        data = {
+            "version": INDEX_VERSION,
+            "covered_bytes": self.covered_bytes,
+            "doc_len": self.doc_len,
+            "offsets": self.offsets,
+            "ids": self.ids,
+            "tags": self.tags,
+            "types": self.types,
+            # Flat [doc, tf, doc, tf, ...] lists parse much faster than nested pairs
+            "postings": {term: [x for pair in p.items() for x in pair] for term, p in self.postings.items()},
+        }
+        try:
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".ki_index_", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+            return True
+        except (OSError, TypeError, ValueError):
+            return False
+
+    @classmethod
+    def load(cls, path: Path, store_size: int) -> Optional["KnowledgeIndex"]:
+        """Load a persisted index; None if missing, corrupt or not matching the JSONL."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        if data.get("version") != INDEX_VERSION or data.get("covered_bytes", 0) > store_size:
+            # JSONL was truncated or rewritten since the index was saved
+            return None
+
+        index = cls()
+        try:
+            index.covered_bytes = data["covered_bytes"]
+            index.doc_len = data["doc_len"]
+            index.total_len = sum(index.doc_len)
+            index.offsets = data["offsets"]
+            index.ids = data["ids"]
+            index.tags = data["tags"]
+            index.types = data["types"]
+            index.postings = {term: dict(zip(p[::2], p[1::2])) for term, p in data["postings"].items()}
+        except (KeyError, TypeError, ValueError):
+            return None
+        if len(index.offsets) != len(index.doc_len):
+            return None
+        return index
+
+
+def scan_jsonl(path: Path, start: int = 0) -> Iterable[tuple[int, int, dict]]:
+    """Yield (offset, end_offset, item_dict) for every valid line from byte offset `start`."""
+    if not Path(path).exists():
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            end = offset + len(raw)
+            line = raw.strip()
+            if line:
+                try:
+                    yield offset, end, json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass  # Skip corrupt lines
+            offset = end
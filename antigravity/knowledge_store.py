@@ -12,6 +12,10 @@ agent outputs, and system events. Enables:
 
 Knowledge Items (KI) are tagged, timestamped, and searchable.
 Stored as JSONL for append-only durability (crash-safe).
+Search runs on an incremental BM25 inverted index (knowledge_index.py)
+persisted next to the JSONL — no linear scan per query. Items are read
+lazily from their byte offset, so opening the store costs nothing.
+Semantic and hybrid (keyword + vector) retrieval via knowledge_vectors.py.
 
 Usage:
     from antigravity.knowledge_store import KnowledgeStore
@@ -24,24 +28,39 @@ Usage:
 
     # Search knowledge
     results = ks.search("gemini config")
+    results = ks.search("model startup freezes", mode="hybrid")
     results = ks.search_by_tag("bugfix")
 
     # Get recent knowledge
     recent = ks.recent(limit=10)
 """
 
+import atexit
 import json
+import threading
 import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
+from heapq import nlargest
 from pathlib import Path
 from typing import Optional
 
 from antigravity.config import PROJECT_ROOT
+from antigravity.knowledge_index import KnowledgeIndex, scan_jsonl, tokenize
+from antigravity.knowledge_vectors import NUMPY_AVAILABLE, VectorIndex, item_text, make_embedder
+
+SEARCH_MODES = ("keyword", "semantic", "hybrid")
+RRF_K = 60  # Reciprocal Rank Fusion constant for hybrid ranking
 
 
 # ─── Knowledge Item ───────────────────────────────────────────────────────────
 
+_id_lock = threading.Lock()
+_last_id_ms = 0
+
+
 @dataclass
 class KnowledgeItem:
     """A single piece of distilled knowledge."""
@@ -57,8 +76,11 @@ class KnowledgeItem:
 
     def __post_init__(self):
         if not self.ki_id:
-            # Generate compact ID from timestamp
-            self.ki_id = f"ki_{int(time.time() * 1000)}"
+            # Generate compact ID from timestamp (strictly increasing per process)
+            global _last_id_ms
+            with _id_lock:
+                _last_id_ms = max(int(time.time() * 1000), _last_id_ms + 1)
+                self.ki_id = f"ki_{_last_id_ms}"
 
     def to_dict(self) -> dict:
         return {
@@ -104,35 +126,173 @@ class KnowledgeStore:
     """
     Persistent, crash-safe knowledge storage.
     Uses JSONL (one JSON per line) for append-only writes.
+
+    Opening and inserting are O(1): nothing is parsed up front. The search index
+    (byte offsets per item) is loaded on the first query and items are
+    read from their offset on demand (small LRU cache). Stats are kept
+    as running counters and flushed by a timer instead of per insert.
     """
 
     STORE_DIR = Path(PROJECT_ROOT) / "antigravity" / "_knowledge"
     STORE_FILE = STORE_DIR / "knowledge_items.jsonl"
     INDEX_FILE = STORE_DIR / "knowledge_index.json"
+    SEARCH_INDEX_FILE = STORE_DIR / "knowledge_search_index.json"
+    VECTOR_FILE = STORE_DIR / "knowledge_vectors.npz"
+    FLUSH_INTERVAL_SEC = 5.0  # stats + search index are written at most this often
+    ITEM_CACHE_SIZE = 1024  # materialized KnowledgeItems kept in memory
+    VECTOR_RETRY_SEC = 300.0  # after an embedding backend error, keyword-only this long
 
     def __init__(self):
         self.STORE_DIR.mkdir(parents=True, exist_ok=True)
-        self._items: list[KnowledgeItem] = []
-        self._load()
-
-    def _load(self):
-        """Load all knowledge items from JSONL file."""
-        self._items = []
-        if not self.STORE_FILE.exists():
-            return
-
+        self._index: Optional[KnowledgeIndex] = None  # loaded on first search/get
+        self._stats: Optional[dict] = None  # loaded on first count/stats/add
+        self._cache: OrderedDict[int, KnowledgeItem] = OrderedDict()
+        self._reader = None
+        self._lock = threading.RLock()
+        self._vectors: Optional[VectorIndex] = None  # loaded on first semantic query
+        self._vectors_retry_at = 0.0  # embedding backend failed → retry after this time
+        self._index_dirty = False
+        self._stats_dirty = False
+        self._vectors_dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        _open_stores.add(self)
+
+    # ─── Lazy loading ─────────────────────────────────────────────────────
+
+    def _store_size(self) -> int:
         try:
-            for line in self.STORE_FILE.read_text().splitlines():
-                line = line.strip()
-                if not line:
-                    continue
+            return self.STORE_FILE.stat().st_size
+        except OSError:
+            return 0
+
+    def _ensure_index(self) -> KnowledgeIndex:
+        """Persisted search index + the JSONL tail written after it was saved."""
+        with self._lock:
+            if self._index is None:
+                index = KnowledgeIndex.load(self.SEARCH_INDEX_FILE, self._store_size())
+                if index is None or not self._index_matches(index):
+                    index = KnowledgeIndex()
+                self._index = index
+                if self._catch_up_index():
+                    self._mark_dirty(index=True)
+            return self._index
+
+    def _index_matches(self, index: KnowledgeIndex) -> bool:
+        """Cheap check that the JSONL was not rewritten under a persisted index."""
+        if not len(index):
+            return index.covered_bytes == 0
+        data = self._read_at(index.offsets[-1])
+        return data is not None and index.doc_no(data.get("id", "")) is not None
+
+    def _catch_up_index(self, until: Optional[int] = None) -> int:
+        added = 0
+        for offset, end, data in scan_jsonl(self.STORE_FILE, self._index.covered_bytes):
+            if until is not None and offset >= until:
+                break
+            if isinstance(data, dict):
+                self._index.add(data, offset, end)
+                added += 1
+        return added
+
+    def _ensure_vectors(self) -> Optional[VectorIndex]:
+        """Vector index caught up with the search index; None if semantic search is unavailable."""
+        if not NUMPY_AVAILABLE or time.time() < self._vectors_retry_at:
+            return None
+        with self._lock:
+            index = self._ensure_index()
+            try:
+                if self._vectors is None:
+                    vectors = VectorIndex.load(self.VECTOR_FILE)
+                    if vectors is None or vectors.count > len(index):
+                        vectors = VectorIndex(make_embedder())
+                    self._vectors = vectors
+                if self._vectors.count < len(index):
+                    texts = [
+                        item_text(self._read_at(index.offsets[doc_no]) or {})
+                        for doc_no in range(self._vectors.count, len(index))
+                    ]
+                    self._vectors.add_texts(texts)
+                    self._mark_dirty(vectors=True)
+            except ConnectionError:
+                # Embedding backend gone (e.g. Ollama stopped) — keyword-only for a while
+                self._vectors_retry_at = time.time() + self.VECTOR_RETRY_SEC
+                return None
+            return self._vectors
+
+    def _ensure_stats(self) -> dict:
+        """Running counters from the stats file, caught up with the JSONL tail."""
+        with self._lock:
+            if self._stats is None:
+                stats = self._empty_stats()
                 try:
-                    data = json.loads(line)
-                    self._items.append(KnowledgeItem.from_dict(data))
-                except json.JSONDecodeError:
-                    continue  # Skip corrupt lines
-        except Exception:
-            pass
+                    saved = json.loads(self.INDEX_FILE.read_text())
+                    # Files written before incremental stats lack these fields → full recount
+                    if "covered_bytes" in saved and "tag_counts" in saved and saved["covered_bytes"] <= self._store_size():
+                        stats.update({key: saved[key] for key in stats})
+                except (OSError, json.JSONDecodeError, TypeError):
+                    pass
+                self._stats = stats
+                if self._catch_up_stats():
+                    self._mark_dirty(stats=True)
+            return self._stats
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {"total_items": 0, "by_type": {}, "tag_counts": {}, "by_source": {}, "covered_bytes": 0}
+
+    def _catch_up_stats(self, until: Optional[int] = None) -> int:
+        counted = 0
+        for offset, end, data in scan_jsonl(self.STORE_FILE, self._stats["covered_bytes"]):
+            if until is not None and offset >= until:
+                break
+            if isinstance(data, dict):
+                self._count(data)
+                counted += 1
+            self._stats["covered_bytes"] = end
+        return counted
+
+    def _count(self, data: dict):
+        stats = self._stats
+        stats["total_items"] += 1
+        ki_type = data.get("type", "learning")
+        stats["by_type"][ki_type] = stats["by_type"].get(ki_type, 0) + 1
+        for tag in data.get("tags", []):
+            stats["tag_counts"][tag] = stats["tag_counts"].get(tag, 0) + 1
+        if data.get("source"):
+            stats["by_source"][data["source"]] = stats["by_source"].get(data["source"], 0) + 1
+
+    def _read_at(self, offset: int) -> Optional[dict]:
+        try:
+            if self._reader is None:
+                self._reader = open(self.STORE_FILE, "rb")
+            self._reader.seek(offset)
+            return json.loads(self._reader.readline())
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def _item(self, doc_no: int) -> KnowledgeItem:
+        """Materialize one item from its byte offset (LRU cached)."""
+        with self._lock:
+            ki = self._cache.get(doc_no)
+            if ki is not None:
+                self._cache.move_to_end(doc_no)
+                return ki
+            data = self._read_at(self._ensure_index().offsets[doc_no]) or {}
+            ki = KnowledgeItem.from_dict(data)
+            self._remember(doc_no, ki)
+            return ki
+
+    def _remember(self, doc_no: int, ki: KnowledgeItem):
+        self._cache[doc_no] = ki
+        if len(self._cache) > self.ITEM_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _iter_all(self):
+        for _, _, data in scan_jsonl(self.STORE_FILE):
+            if isinstance(data, dict):
+                yield KnowledgeItem.from_dict(data)
+
+    # ─── Write ────────────────────────────────────────────────────────────
 
     def add(
         self,
@@ -155,76 +315,119 @@ class KnowledgeStore:
             references=references or [],
         )
 
-        # Append to JSONL (crash-safe: one line at a time)
-        try:
-            with open(self.STORE_FILE, "a") as f:
-                f.write(json.dumps(ki.to_dict(), ensure_ascii=False) + "\n")
-        except Exception as e:
-            raise IOError(f"Failed to write knowledge item: {e}")
-
-        self._items.append(ki)
-        self._update_index()
+        with self._lock:
+            stats = self._ensure_stats()
+
+            # Append to JSONL (crash-safe: one line at a time)
+            data = ki.to_dict()
+            line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+            try:
+                with open(self.STORE_FILE, "ab") as f:
+                    offset = f.tell()
+                    f.write(line)
+            except Exception as e:
+                raise IOError(f"Failed to write knowledge item: {e}")
+
+            # Lines appended by another process since we loaded come first
+            if offset > stats["covered_bytes"]:
+                self._catch_up_stats(until=offset)
+            self._count(data)
+            stats["covered_bytes"] = offset + len(line)
+            self._mark_dirty(stats=True)
+
+            # Search index only if already loaded — otherwise it indexes the tail on first query
+            if self._index is not None:
+                if offset > self._index.covered_bytes:
+                    self._catch_up_index(until=offset)
+                doc_no = self._index.add(data, offset, offset + len(line))
+                self._remember(doc_no, ki)
+                self._mark_dirty(index=True)
+
+                # Embed incrementally when the vector index is live and in step
+                if self._vectors is not None and self._vectors.count == doc_no:
+                    try:
+                        self._vectors.add_texts([item_text(data)])
+                        self._mark_dirty(vectors=True)
+                    except ConnectionError:
+                        pass  # Caught up on the next semantic query
         return ki
 
-    def search(self, query: str, limit: int = 20) -> list[KnowledgeItem]:
-        """Search knowledge items by text query."""
-        results = [ki for ki in self._items if ki.matches_query(query)]
-        # Sort by relevance (newer = more relevant for now)
-        results.sort(key=lambda ki: ki.created_at, reverse=True)
-        return results[:limit]
+    # ─── Query ────────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 20, mode: str = "keyword") -> list[KnowledgeItem]:
+        """
+        Search knowledge items by text query, best first.
+
+        mode: keyword (BM25), semantic (embedding cosine) or hybrid
+              (Reciprocal Rank Fusion of both). Falls back to keyword
+              when no vector index is available.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}. Available: {SEARCH_MODES}")
+        if not tokenize(query):
+            # No indexable words (empty / single characters) — old substring behavior
+            results = (ki for ki in self._iter_all() if ki.matches_query(query))
+            return nlargest(limit, results, key=lambda ki: ki.created_at)
+
+        keyword_hits = self._ensure_index().search(query, limit if mode == "keyword" else limit * 4)
+        vectors = self._ensure_vectors() if mode != "keyword" else None
+        if vectors is None:
+            return [self._item(doc_no) for _, doc_no in keyword_hits[:limit]]
+
+        semantic_hits = vectors.search(query, limit if mode == "semantic" else limit * 4)
+        if mode == "semantic":
+            return [self._item(doc_no) for _, doc_no in semantic_hits]
+
+        fused: dict[int, float] = {}
+        for hits in (keyword_hits, semantic_hits):
+            for rank, (_, doc_no) in enumerate(hits):
+                fused[doc_no] = fused.get(doc_no, 0.0) + 1.0 / (RRF_K + rank + 1)
+        best = nlargest(limit, fused.items(), key=lambda x: x[1])
+        return [self._item(doc_no) for doc_no, _ in best]
 
     def search_by_tag(self, tag: str) -> list[KnowledgeItem]:
         """Find all items with a specific tag."""
-        tag_lower = tag.lower()
-        return [ki for ki in self._items if any(tag_lower == t.lower() for t in ki.tags)]
+        return [self._item(doc_no) for doc_no in self._ensure_index().by_tag(tag)]
 
     def search_by_type(self, ki_type: str) -> list[KnowledgeItem]:
         """Find all items of a specific type."""
-        return [ki for ki in self._items if ki.ki_type == ki_type]
+        return [self._item(doc_no) for doc_no in self._ensure_index().by_type(ki_type)]
 
     def recent(self, limit: int = 10) -> list[KnowledgeItem]:
-        """Get most recent knowledge items."""
-        sorted_items = sorted(self._items, key=lambda ki: ki.created_at, reverse=True)
-        return sorted_items[:limit]
+        """Get most recent knowledge items (append order = creation order)."""
+        total = len(self._ensure_index())
+        return [self._item(doc_no) for doc_no in range(total - 1, max(total - limit, 0) - 1, -1)]
 
     def get(self, ki_id: str) -> Optional[KnowledgeItem]:
         """Get a specific knowledge item by ID."""
-        for ki in self._items:
-            if ki.ki_id == ki_id:
-                return ki
-        return None
+        doc_no = self._ensure_index().doc_no(ki_id)
+        return self._item(doc_no) if doc_no is not None else None
 
     def count(self) -> int:
         """Total number of knowledge items."""
-        return len(self._items)
+        return self._ensure_stats()["total_items"]
 
     def stats(self) -> dict:
         """Get statistics about stored knowledge."""
-        type_counts: dict[str, int] = {}
-        tag_counts: dict[str, int] = {}
-        source_counts: dict[str, int] = {}
-
-        for ki in self._items:
-            type_counts[ki.ki_type] = type_counts.get(ki.ki_type, 0) + 1
-            for tag in ki.tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            if ki.source:
-                source_counts[ki.source] = source_counts.get(ki.source, 0) + 1
-
+        stats = self._ensure_stats()
         return {
-            "total_items": len(self._items),
-            "by_type": type_counts,
-            "top_tags": dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:20]),
-            "by_source": source_counts,
+            "total_items": stats["total_items"],
+            "by_type": dict(stats["by_type"]),
+            "top_tags": dict(sorted(stats["tag_counts"].items(), key=lambda x: x[1], reverse=True)[:20]),
+            "by_source": dict(stats["by_source"]),
         }
 
-    def export_for_agent(self, query: str = "", limit: int = 10) -> str:
+    def export_for_agent(self, query: str = "", limit: int = 10, mode: str = "keyword") -> str:
         """
         Export relevant knowledge as a formatted string for agent context injection.
         This is the key integration point — agents get relevant past knowledge
         injected into their prompts automatically.
+
+        mode="hybrid" also finds items phrased differently from the prompt, but
+        embeds the query (and, on first use, the whole store) with blocking
+        calls — from async code run it via asyncio.to_thread.
         """
-        items = self.search(query, limit) if query else self.recent(limit)
+        items = self.search(query, limit, mode=mode) if query else self.recent(limit)
 
         if not items:
             return "Keine relevanten Knowledge Items gefunden."
@@ -239,10 +442,46 @@ class KnowledgeStore:
 
         return "\n".join(lines)
 
-    def _update_index(self):
-        """Update the search index file."""
+    # ─── Persistence ──────────────────────────────────────────────────────
+
+    def _mark_dirty(self, index: bool = False, stats: bool = False, vectors: bool = False):
+        self._index_dirty |= index
+        self._stats_dirty |= stats
+        self._vectors_dirty |= vectors
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.FLUSH_INTERVAL_SEC, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write stats file and search index if they changed (timer, atexit, or manual)."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._stats_dirty and self._stats is not None:
+                self._write_stats()
+                self._stats_dirty = False
+            if self._index_dirty and self._index is not None:
+                self._index.save(self.SEARCH_INDEX_FILE)
+                self._index_dirty = False
+            if self._vectors_dirty and self._vectors is not None:
+                self._vectors.save(self.VECTOR_FILE)
+                self._vectors_dirty = False
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _write_stats(self):
+        """Update the stats index file."""
         try:
             index = self.stats()
+            index["tag_counts"] = self._stats["tag_counts"]
+            index["covered_bytes"] = self._stats["covered_bytes"]
             index["last_updated"] = datetime.now().isoformat()
             # Atomic write
             tmp = self.INDEX_FILE.with_suffix(".json.tmp")
@@ -252,6 +491,16 @@ class KnowledgeStore:
             pass
 
 
+# Flush pending stats / index of every open store on interpreter exit
+_open_stores: "weakref.WeakSet[KnowledgeStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_open_stores):
+        store.flush()
+
+
 # ─── Pre-seed with crash knowledge ────────────────────────────────────────────
 
 def seed_initial_knowledge():
@@ -359,5 +608,6 @@ def seed_initial_knowledge():
             source=s.get("source", ""),
             references=s.get("references", []),
         )
+    ks.flush()
 
     return ks
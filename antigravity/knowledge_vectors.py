@@ -0,0 +1,277 @@
+"""
+Knowledge Vectors — Semantic Retrieval for the Knowledge Store
+================================================================
+BM25 only finds items that share words with the query. A fix stored as
+"Ollama haengt beim Modell-Laden" is invisible to "model startup freezes".
+This module adds a vector index over all Knowledge Items.
+
+Embedders (both fully offline, CPU only):
+  - OllamaEmbedder:      local /api/embed endpoint (KNOWLEDGE_EMBED_MODEL)
+  - HashedTfidfEmbedder: pure NumPy fallback — unigrams + bigrams hashed
+                         into a fixed-size signed vector (log tf), IDF
+                         weighting applied on the query side so document
+                         vectors never need re-computing on add
+
+Search:
+  - brute-force cosine top-k (one matrix-vector product) for small stores
+  - IVF (spherical k-means coarse quantizer, exact re-rank inside the
+    closest lists) once the store holds ANN_THRESHOLD+ items. Recall
+    depends on how well the embeddings cluster: good for real
+    embedding models, weaker for hashed TF-IDF vectors
+
+Row i of the matrix is doc_no i of the KnowledgeIndex. Persisted as
+knowledge_vectors.npz next to the JSONL; tail items are embedded on load.
+NumPy is optional — without it KnowledgeStore stays keyword-only.
+"""
+
+import json
+import math
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from antigravity.config import KNOWLEDGE_EMBED_MODEL, KNOWLEDGE_EMBEDDER, OLLAMA_BASE_URL
+from antigravity.http_pool import get_http_client
+from antigravity.knowledge_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+HASH_DIM = 512
+ANN_THRESHOLD = 50_000  # below this, exact brute force is fast enough (~10 ms)
+IVF_PROBE_FRACTION = 0.125  # share of the inverted lists searched per query
+IVF_TRAIN_ITERATIONS = 6
+EMBED_BATCH = 64
+
+
+def item_text(data: dict) -> str:
+    """Text that represents a Knowledge Item for embedding."""
+    tags = " ".join(str(t) for t in data.get("tags", []))
+    return f"{data.get('title', '')}\n{tags}\n{data.get('content', '')}"
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ─── Embedders ──────────────────────────────────────────────────────
+class HashedTfidfEmbedder:
+    """Feature-hashed TF-IDF. Document frequencies are kept per bucket."""
+
+    def __init__(self, dim: int = HASH_DIM):
+        self.dim = dim
+        self.name = f"hashed-tfidf-{dim}"
+        self.df = np.zeros(dim, dtype=np.float32)
+        self.n_docs = 0
+
+    def _vector(self, text: str):
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return np.sign(vec) * np.log1p(np.abs(vec))
+
+    def embed_documents(self, texts: list[str]):
+        matrix = np.stack([self._vector(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+        self.df += (matrix != 0).sum(axis=0)
+        self.n_docs += len(texts)
+        return _normalize_rows(matrix)
+
+    def embed_query(self, text: str):
+        idf = np.log((1.0 + self.n_docs) / (1.0 + self.df)) + 1.0
+        vec = self._vector(text) * idf
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+
+class OllamaEmbedder:
+    """Embeddings from the local Ollama server (/api/embed)."""
+
+    def __init__(self, model: str = KNOWLEDGE_EMBED_MODEL, base_url: str = OLLAMA_BASE_URL):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.name = f"ollama:{model}"
+
+    @classmethod
+    def reachable(cls, model: str = KNOWLEDGE_EMBED_MODEL, base_url: str = OLLAMA_BASE_URL) -> bool:
+        """Is Ollama up and the embedding model pulled?"""
+        try:
+            response = get_http_client().get(f"{base_url.rstrip('/')}/api/tags", timeout=2.0)
+            names = [m.get("name", "") for m in response.json().get("models", [])]
+        except (httpx.HTTPError, ValueError):
+            return False
+        return any(name == model or name.split(":")[0] == model for name in names)
+
+    def embed_documents(self, texts: list[str]):
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        try:
+            response = get_http_client().post(
+                f"{self.base_url}/api/embed",
+                json={"model": self.model, "input": texts},
+                timeout=120.0,
+            )
+            response.raise_for_status()
+            vectors = np.asarray(response.json()["embeddings"], dtype=np.float32)
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise ConnectionError(f"Ollama embedding failed ({self.model}): {e}") from e
+        return _normalize_rows(vectors)
+
+    def embed_query(self, text: str):
+        return self.embed_documents([text])[0]
+
+
+def make_embedder(name: Optional[str] = None):
+    """Embedder by persisted name, or chosen by KNOWLEDGE_EMBEDDER for a new index."""
+    if name is None:
+        if KNOWLEDGE_EMBEDDER == "ollama" or (KNOWLEDGE_EMBEDDER == "auto" and OllamaEmbedder.reachable()):
+            return OllamaEmbedder()
+        return HashedTfidfEmbedder()
+    if name.startswith("ollama:"):
+        return OllamaEmbedder(model=name.split(":", 1)[1])
+    return HashedTfidfEmbedder(dim=int(name.rsplit("-", 1)[1]))
+
+
+# ─── Approximate index ──────────────────────────────────────────────
+class _IVF:
+    """Inverted-file index: vectors bucketed by their nearest k-means centroid."""
+
+    def __init__(self, vectors):
+        n = len(vectors)
+        n_lists = max(1, int(math.sqrt(n)))
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(n, size=min(n, n_lists * 32), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize_rows(centroids)
+        self.centroids = centroids
+        self.trained_on = n
+        self.lists: list[list[int]] = [[] for _ in range(n_lists)]
+        self.assign(vectors, start=0)
+
+    def assign(self, vectors, start: int):
+        for offset in range(0, len(vectors), 4096):
+            chunk = vectors[offset:offset + 4096]
+            for i, c in enumerate(np.argmax(chunk @ self.centroids.T, axis=1)):
+                self.lists[c].append(start + offset + i)
+
+    def candidates(self, query):
+        probe = max(1, int(len(self.lists) * IVF_PROBE_FRACTION))
+        closest = np.argsort(-(self.centroids @ query))[:probe]
+        return np.concatenate([np.asarray(self.lists[c], dtype=np.int64) for c in closest])
+
+
+# ─── Vector Index ───────────────────────────────────────────────────
+class VectorIndex:
+    """Growable float32 matrix of normalized embeddings + optional IVF."""
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self._matrix = None  # capacity grows by doubling (amortized O(1) append)
+        self.count = 0
+        self._ivf: Optional[_IVF] = None
+
+    @property
+    def vectors(self):
+        return self._matrix[:self.count] if self._matrix is not None else None
+
+    def add_texts(self, texts: list[str]):
+        """Embed and append (row i = doc_no i)."""
+        for start in range(0, len(texts), EMBED_BATCH):
+            self._append(self.embedder.embed_documents(texts[start:start + EMBED_BATCH]))
+
+    def _append(self, rows):
+        if not len(rows):
+            return
+        if self._matrix is None:
+            self._matrix = np.zeros((max(64, len(rows)), rows.shape[1]), dtype=np.float32)
+        needed = self.count + len(rows)
+        if needed > len(self._matrix):
+            grown = np.zeros((max(needed, 2 * len(self._matrix)), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self.count] = self._matrix[:self.count]
+            self._matrix = grown
+        self._matrix[self.count:needed] = rows
+        if self._ivf is not None:
+            self._ivf.assign(rows, start=self.count)
+        self.count = needed
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[float, int]]:
+        """Cosine top-k as (similarity, doc_no), best first."""
+        if not self.count:
+            return []
+        q = self.embedder.embed_query(query)
+        vectors = self.vectors
+        if self.count >= ANN_THRESHOLD:
+            if self._ivf is None or self.count > 2 * self._ivf.trained_on:
+                self._ivf = _IVF(vectors)
+            candidates = self._ivf.candidates(q)
+            sims = vectors[candidates] @ q
+        else:
+            candidates = None
+            sims = vectors @ q
+
+        k = min(limit, len(sims))
+        if not k:
+            return []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        doc_nos = candidates[top] if candidates is not None else top
+        return [(float(sims[i]), int(d)) for i, d in zip(top, doc_nos)]
+
+    # ─── Persistence ────────────────────────────────────────────────
+    def save(self, path: Path) -> bool:
+        """Atomic write of vectors (+ hashed-embedder document frequencies)."""
+        path = Path(path)
+        extra = {}
+        if isinstance(self.embedder, HashedTfidfEmbedder):
+            extra = {"df": self.embedder.df, "n_docs": np.array(self.embedder.n_docs)}
+        try:
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".ki_vectors_", suffix=".npz")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    vectors=self.vectors if self.count else np.zeros((0, 0), np.float32),
+                    meta=np.array(json.dumps({"embedder": self.embedder.name, "count": self.count})),
+                    **extra,
+                )
+            os.replace(tmp, path)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["VectorIndex"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                embedder = make_embedder(meta["embedder"])
+                if isinstance(embedder, HashedTfidfEmbedder):
+                    embedder.df = data["df"].astype(np.float32)
+                    embedder.n_docs = int(data["n_docs"])
+                index = cls(embedder)
+                vectors = data["vectors"]
+                if meta["count"]:
+                    index._append(vectors.astype(np.float32))
+        except (OSError, KeyError, ValueError, json.JSONDecodeError):
+            return None
+        return index
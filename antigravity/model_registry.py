@@ -0,0 +1,143 @@
+"""
+Model Registry — Process-Wide Ollama Model Discovery
+======================================================
+Every OfflineClaude() used to call Ollama's /models endpoint synchronously
+in its constructor. AgentSwarm builds one per task, so 500 concurrent
+tasks meant 500 blocking HTTP calls before any work started.
+
+The registry discovers the available models once and shares the result:
+  - model list cached for MODEL_DISCOVERY_TTL_SEC (failed lookups only
+    for NEGATIVE_TTL_SEC, so a freshly started Ollama is picked up soon)
+  - async refresh is single-flight per event loop: concurrent callers
+    await the same request
+  - one OllamaClient for all sessions (its HTTP pools are shared anyway,
+    see http_pool.py)
+  - session() hands out a lightweight OfflineClaude per task — no I/O
+    in the constructor, only its own history and token count
+
+Usage:
+    from antigravity.model_registry import get_model_registry
+    claude = get_model_registry().session()
+    result = await claude.think(task="...", role=ClaudeRole.CODER)
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from antigravity.config import MODEL_DISCOVERY_TTL_SEC, OLLAMA_API_V1
+from antigravity.http_pool import get_async_client
+from antigravity.ollama_client import OllamaClient
+
+NEGATIVE_TTL_SEC = 10.0
+
+# Model rankings by task type
+MODEL_RANKING = {
+    "code": ["qwen2.5-coder:14b", "mistral", "llama2"],
+    "reasoning": ["mistral", "qwen2.5-coder:14b", "llama2"],
+    "analysis": ["qwen2.5-coder:14b", "mistral"],
+    "creative": ["mistral", "llama2"],
+    "general": ["qwen2.5-coder:14b", "mistral", "llama2"],
+}
+
+
+class ModelRegistry:
+    """Cached Ollama model list + shared client + session factory."""
+
+    def __init__(self, base_url: str = OLLAMA_API_V1, ttl_sec: float = MODEL_DISCOVERY_TTL_SEC):
+        self.client = OllamaClient(base_url=base_url)
+        self.ttl_sec = ttl_sec
+        self._models: List[str] = []
+        self._expires = 0.0
+        self._lock = threading.Lock()
+        self._refreshing: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self.discoveries = 0
+
+    # ─── Discovery ──────────────────────────────────────────────────
+    def _fresh(self) -> bool:
+        return time.monotonic() < self._expires
+
+    def _store(self, data: list) -> List[str]:
+        names = [m.get("id") or m.get("name") for m in data]
+        models = [name for name in names if name]
+        with self._lock:
+            if models and models != self._models:
+                print(f"✓ Ollama models: {', '.join(models)}")
+            self._models = models
+            self._expires = time.monotonic() + (self.ttl_sec if models else NEGATIVE_TTL_SEC)
+            self.discoveries += 1
+        return models
+
+    def available(self) -> List[str]:
+        """Model names (sync; refreshes over HTTP only when the TTL ran out)."""
+        if not self._fresh():
+            self._store(self.client.list_models())
+        return self._models
+
+    async def aavailable(self) -> List[str]:
+        """Model names (async; concurrent refreshes share one request)."""
+        if self._fresh():
+            return self._models
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [lp for lp in self._refreshing if lp.is_closed()]:
+                self._refreshing.pop(stale, None)
+            pending = self._refreshing.get(loop)
+            if pending is None or pending.done():
+                pending = loop.create_task(self._arefresh())
+                self._refreshing[loop] = pending
+        return await asyncio.shield(pending)
+
+    async def _arefresh(self) -> List[str]:
+        try:
+            response = await get_async_client().get(f"{self.client.base_url}/models", timeout=10.0)
+            response.raise_for_status()
+            data = response.json().get("data", [])
+        except (httpx.HTTPError, ValueError):
+            data = []
+        return self._store(data)
+
+    def invalidate(self) -> None:
+        """Force re-discovery on the next lookup (e.g. after `ollama pull`)."""
+        with self._lock:
+            self._expires = 0.0
+
+    # ─── Selection ──────────────────────────────────────────────────
+    @staticmethod
+    def select(models: List[str], task_type: str = "general") -> Optional[str]:
+        """Best available model for the task type, else the first one."""
+        for preferred in MODEL_RANKING.get(task_type, MODEL_RANKING["general"]):
+            if any(preferred in m for m in models):
+                return preferred
+        return models[0] if models else None
+
+    def session(self):
+        """New lightweight OfflineClaude bound to this registry (one per task)."""
+        from antigravity.offline_claude import OfflineClaude
+
+        return OfflineClaude(registry=self)
+
+    def stats(self) -> dict:
+        return {
+            "models": list(self._models),
+            "fresh": self._fresh(),
+            "ttl_sec": self.ttl_sec,
+            "discoveries": self.discoveries,
+        }
+
+
+# ─── Global Registry ────────────────────────────────────────────────
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide model registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
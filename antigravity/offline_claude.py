@@ -17,17 +17,22 @@ Behavior mirrors Claude:
   - Explains reasoning
   - Provides code with explanations
   - Handles long context (8K-32K tokens)
+
+Model discovery and the Ollama client live in model_registry.py and are
+shared process-wide; an OfflineClaude is just a cheap session (history,
+token count), so creating one per task costs no I/O.
 """
 
 import json
-import os
 import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from typing import Optional
+from uuid import uuid4
 
-from antigravity.ollama_client import OllamaClient
-from antigravity.config import PROJECT_ROOT
+from antigravity.config import PROJECT_ROOT, AgentConfig
+from antigravity.model_registry import MODEL_RANKING, ModelRegistry, get_model_registry
 
 
 class ClaudeRole(str, Enum):
@@ -57,10 +62,11 @@ class ClaudePrompt:
             )
 
         context_text = f"\n\nContext:\n{self.context}" if self.context else ""
+        role = getattr(self.role, "value", self.role)  # ClaudeRole or plain role name
 
         return f"""You are Claude, an AI assistant created by Anthropic.
 
-Role: {self.role.value.upper()} - {self.task}
+Role: {str(role).upper()} - {self.task}
 
 Your approach:
 - Think step-by-step before responding
@@ -80,57 +86,41 @@ class OfflineClaude:
     Local Claude emulator using Ollama models.
 
     Usage:
-        claude = OfflineClaude()
+        claude = OfflineClaude()   # or get_model_registry().session()
         response = await claude.think(
             task="Design authentication system",
             role=ClaudeRole.ARCHITECT
         )
     """
 
-    # Model rankings by task type
-    MODEL_RANKING = {
-        "code": ["qwen2.5-coder:14b", "mistral", "llama2"],
-        "reasoning": ["mistral", "qwen2.5-coder:14b", "llama2"],
-        "analysis": ["qwen2.5-coder:14b", "mistral"],
-        "creative": ["mistral", "llama2"],
-        "general": ["qwen2.5-coder:14b", "mistral", "llama2"],
-    }
-
-    def __init__(self):
-        self.ollama = OllamaClient()
+    MODEL_RANKING = MODEL_RANKING
+
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        self.registry = registry or get_model_registry()
+        self.ollama = self.registry.client
         self.conversation_history = []
         self.context_window = 8192  # Default
         self.used_tokens = 0
         self.session_id = self._generate_session_id()
-        self.model = None
-        self._ensure_models()
 
-    def _ensure_models(self) -> None:
-        """Ensure at least one model is available."""
-        try:
-            models = self.ollama.list_models()
-            if not models:
-                print("❌ No models available in Ollama")
-                print("   Install: ollama pull qwen2.5-coder:14b")
-                return
-
-            self.available_models = [m.get("name") for m in models]
-            # Pick best available
-            for preferred in self.MODEL_RANKING["code"]:
-                if any(preferred in m for m in self.available_models):
-                    self.model = preferred
-                    break
-
-            if not self.model:
-                self.model = self.available_models[0]
-
-            print(f"✓ Using model: {self.model}")
-        except Exception as e:
-            print(f"❌ Ollama error: {e}")
+    @property
+    def available_models(self) -> list:
+        return self.registry.available()
+
+    @property
+    def model(self) -> Optional[str]:
+        """Default model (best available for code)."""
+        return self.registry.select(self.available_models, "code")
 
     def _generate_session_id(self) -> str:
         """Generate unique session ID."""
-        return f"claude_{int(time.time())}_{os.getpid()}"
+        return f"claude_{int(time.time())}_{uuid4().hex[:8]}"
+
+    async def _generate(self, model: str, system_prompt: str, prompt: str) -> tuple:
+        """One completion on the shared client → (text, total_tokens or 0)."""
+        agent = AgentConfig(name="offline-claude", role="offline", model=model, system_prompt=system_prompt)
+        result = await self.ollama.achat(agent, prompt)
+        return result["content"], result["usage"]["total_tokens"]
 
     async def think(
         self,
@@ -159,7 +149,8 @@ class OfflineClaude:
                 "session_id": "session identifier"
             }
         """
-        if not self.model:
+        models = await self.registry.aavailable()
+        if not models:
             return {
                 "error": "No Ollama models available",
                 "fix": "Run: ollama pull qwen2.5-coder:14b",
@@ -167,7 +158,7 @@ class OfflineClaude:
 
         try:
             # Select model based on task type
-            model = self._select_model(task_type)
+            model = self._select_model(task_type, models)
 
             # Build prompt
             prompt = ClaudePrompt(
@@ -182,15 +173,10 @@ class OfflineClaude:
             # Get response
             print(f"\n🤔 Thinking with {model}...\n")
 
-            response = await self.ollama.generate(
-                model=model,
-                prompt=task,
-                system=system_prompt,
-                stream=True,  # Stream for faster perceived response
-            )
+            response, total_tokens = await self._generate(model, system_prompt, task)
 
-            # Estimate tokens (rough: ~4 chars per token)
-            estimated_tokens = len(task) // 4 + len(response) // 4
+            # Reported usage, else estimate (rough: ~4 chars per token)
+            estimated_tokens = total_tokens or len(task) // 4 + len(response) // 4
 
             # Save to conversation history
             self.conversation_history.append({
@@ -229,7 +215,8 @@ class OfflineClaude:
 
         Maintains conversation history for context.
         """
-        if not self.model:
+        models = await self.registry.aavailable()
+        if not models:
             return "❌ No models available. Run: ollama pull qwen2.5-coder:14b"
 
         # Build conversation context
@@ -250,10 +237,8 @@ Suggest alternatives when appropriate.{messages_context}"""
             system_prompt += f"\n\nContext:\n{system_context}"
 
         try:
-            response = await self.ollama.generate(
-                model=self.model,
-                prompt=user_message,
-                system=system_prompt,
+            response, _ = await self._generate(
+                self._select_model("general", models), system_prompt, user_message
             )
 
             # Add to history
@@ -269,25 +254,20 @@ Suggest alternatives when appropriate.{messages_context}"""
         except Exception as e:
             return f"Error: {e}"
 
-    def _select_model(self, task_type: str) -> str:
+    def _select_model(self, task_type: str, models: Optional[list] = None) -> Optional[str]:
         """Select best model for task type."""
-        models = self.MODEL_RANKING.get(task_type, self.MODEL_RANKING["general"])
-
-        for preferred in models:
-            if any(preferred in m for m in self.available_models):
-                return preferred
-
-        return self.model
+        return self.registry.select(self.available_models if models is None else models, task_type)
 
     def get_status(self) -> dict:
         """Get offline Claude status."""
+        model = self.model
         return {
-            "model": self.model,
+            "model": model,
             "available_models": self.available_models,
             "session_id": self.session_id,
             "tokens_used_this_session": self.used_tokens,
             "conversation_length": len(self.conversation_history),
-            "status": "✓ READY" if self.model else "❌ NO MODELS",
+            "status": "✓ READY" if model else "❌ NO MODELS",
         }
 
     def save_session(self) -> str:
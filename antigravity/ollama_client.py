@@ -3,11 +3,17 @@ Ollama Client
 =============
 Thin wrapper around Ollama's OpenAI-compatible API.
 Used by all 4 Godmode Programmer agents to communicate with local models.
+
+Two transports, one request/response format:
+- achat / achat_stream / ahealth_check → native async (shared httpx.AsyncClient),
+  so hundreds of calls can be in flight on one event loop without threads
+- chat / chat_stream / health_check    → sync API for CLI callers
 """
 
 import json
 from antigravity.config import OLLAMA_API_V1, AgentConfig
-from typing import Optional
+from antigravity.http_pool import get_async_client, get_http_client
+from typing import AsyncIterator, Iterator, Optional
 
 import httpx
 
@@ -19,23 +25,14 @@ class OllamaClient:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
 
-    def chat(
+    # ─── Request / Response (shared by sync + async) ─────────────────
+    def _build_payload(
         self,
         agent: AgentConfig,
         user_message: str,
         context: Optional[str] = None,
+        stream: bool = False,
     ) -> dict:
-        """
-        Send a chat completion request to Ollama.
-
-        Args:
-            agent: The agent configuration (model, system prompt, etc.)
-            user_message: The user/task message
-            context: Optional additional context (file contents, error logs, etc.)
-
-        Returns:
-            dict with keys: content, model, usage, raw_response
-        """
         messages = [
             {"role": "system", "content": agent.system_prompt},
         ]
@@ -45,34 +42,31 @@ class OllamaClient:
 
         messages.append({"role": "user", "content": user_message})
 
-        payload = {
+        return {
             "model": agent.model,
             "messages": messages,
             "temperature": agent.temperature,
             "max_tokens": agent.max_tokens,
-            "stream": False,
+            "stream": stream,
         }
 
-        try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(
-                    f"{self.base_url}/chat/completions",
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
-        except httpx.ConnectError:
-            raise ConnectionError(
+    def _translate_error(self, exc: httpx.HTTPError, agent: AgentConfig) -> Exception:
+        """Map httpx errors to the builtin exceptions the router fails over on."""
+        if isinstance(exc, httpx.ConnectError):
+            return ConnectionError(
                 f"Cannot connect to Ollama at {self.base_url}. Is Ollama running? Start with: ollama serve"
             )
-        except httpx.TimeoutException:
-            raise TimeoutError(
+        if isinstance(exc, httpx.TimeoutException):
+            return TimeoutError(
                 f"Ollama request timed out after {self.timeout}s for model {agent.model}. "
                 "Try increasing timeout or using a smaller model."
             )
-        except httpx.HTTPStatusError as e:
-            raise RuntimeError(f"Ollama API error {e.response.status_code}: {e.response.text[:200]}")
+        if isinstance(exc, httpx.HTTPStatusError):
+            return RuntimeError(f"Ollama API error {exc.response.status_code}: {exc.response.text[:200]}")
+        return ConnectionError(f"Ollama request failed: {exc}")
 
+    @staticmethod
+    def _parse_response(data: dict, agent: AgentConfig) -> dict:
         try:
             content = data["choices"][0]["message"]["content"]
         except (KeyError, IndexError) as e:
@@ -92,65 +86,158 @@ class OllamaClient:
             "raw_response": data,
         }
 
-    def chat_stream(
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[str]:
+        """Content of one SSE line, "" to skip, None at [DONE]."""
+        if not line or line.startswith(":"):
+            return ""
+        if line.startswith("data: "):
+            line = line[6:]
+        if line.strip() == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(line)
+            delta = chunk["choices"][0].get("delta", {})
+            return delta.get("content", "") or ""
+        except (json.JSONDecodeError, KeyError, IndexError):
+            return ""
+
+    # ─── Async API ──────────────────────────────────────────────────
+    async def achat(
         self,
         agent: AgentConfig,
         user_message: str,
         context: Optional[str] = None,
-    ):
+    ) -> dict:
         """
-        Stream a chat completion from Ollama (yields chunks).
+        Send a chat completion request to Ollama (native async).
 
-        Yields:
-            str: Content chunks as they arrive
-        """
-        messages = [
-            {"role": "system", "content": agent.system_prompt},
-        ]
+        Args:
+            agent: The agent configuration (model, system prompt, etc.)
+            user_message: The user/task message
+            context: Optional additional context (file contents, error logs, etc.)
 
-        if context:
-            messages.append({"role": "user", "content": f"KONTEXT:\n```\n{context}\n```"})
+        Returns:
+            dict with keys: content, model, usage, raw_response
+        """
+        payload = self._build_payload(agent, user_message, context)
+        try:
+            response = await get_async_client().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            raise self._translate_error(e, agent) from e
 
-        messages.append({"role": "user", "content": user_message})
+        return self._parse_response(data, agent)
 
-        payload = {
-            "model": agent.model,
-            "messages": messages,
-            "temperature": agent.temperature,
-            "max_tokens": agent.max_tokens,
-            "stream": True,
-        }
+    async def achat_stream(
+        self,
+        agent: AgentConfig,
+        user_message: str,
+        context: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from Ollama (async generator).
 
-        with httpx.Client(timeout=self.timeout) as client:
-            with client.stream(
+        Yields:
+            str: Content chunks as they arrive
+        """
+        payload = self._build_payload(agent, user_message, context, stream=True)
+        try:
+            async with get_async_client().stream(
                 "POST",
                 f"{self.base_url}/chat/completions",
                 json=payload,
+                timeout=self.timeout,
             ) as response:
                 response.raise_for_status()
-                for line in response.iter_lines():
-                    if not line or line.startswith(":"):
-                        continue
-                    if line.startswith("data: "):
-                        line = line[6:]
-                    if line.strip() == "[DONE]":
+                async for line in response.aiter_lines():
+                    content = self._parse_stream_line(line)
+                    if content is None:
                         break
-                    try:
-                        chunk = json.loads(line)
-                        delta = chunk["choices"][0].get("delta", {})
-                        content = delta.get("content", "")
-                        if content:
-                            yield content
-                    except (json.JSONDecodeError, KeyError, IndexError):
-                        continue
+                    if content:
+                        yield content
+        except httpx.HTTPError as e:
+            raise self._translate_error(e, agent) from e
+
+    async def ahealth_check(self) -> bool:
+        """Check if Ollama is running and responsive (async)."""
+        try:
+            response = await get_async_client().get(f"{self.base_url}/models", timeout=5.0)
+            return response.status_code == 200
+        except (httpx.ConnectError, httpx.TimeoutException):
+            return False
+
+    # ─── Sync API (CLI callers) ─────────────────────────────────────
+    def chat(
+        self,
+        agent: AgentConfig,
+        user_message: str,
+        context: Optional[str] = None,
+    ) -> dict:
+        """
+        Send a chat completion request to Ollama.
+
+        Args:
+            agent: The agent configuration (model, system prompt, etc.)
+            user_message: The user/task message
+            context: Optional additional context (file contents, error logs, etc.)
+
+        Returns:
+            dict with keys: content, model, usage, raw_response
+        """
+        payload = self._build_payload(agent, user_message, context)
+        try:
+            response = get_http_client().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            raise self._translate_error(e, agent) from e
+
+        return self._parse_response(data, agent)
+
+    def chat_stream(
+        self,
+        agent: AgentConfig,
+        user_message: str,
+        context: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion from Ollama (yields chunks).
+
+        Yields:
+            str: Content chunks as they arrive
+        """
+        payload = self._build_payload(agent, user_message, context, stream=True)
+
+        with get_http_client().stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json=payload,
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                content = self._parse_stream_line(line)
+                if content is None:
+                    break
+                if content:
+                    yield content
 
     def list_models(self) -> list[dict]:
         """List all available models from Ollama."""
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(f"{self.base_url}/models")
-                response.raise_for_status()
-                return response.json().get("data", [])
+            response = get_http_client().get(f"{self.base_url}/models", timeout=10.0)
+            response.raise_for_status()
+            return response.json().get("data", [])
         except (httpx.ConnectError, httpx.TimeoutException):
             return []
         except httpx.HTTPStatusError:
@@ -159,9 +246,8 @@ class OllamaClient:
     def health_check(self) -> bool:
         """Check if Ollama is running and responsive."""
         try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{self.base_url}/models")
-                return response.status_code == 200
+            response = get_http_client().get(f"{self.base_url}/models", timeout=5.0)
+            return response.status_code == 200
         except (httpx.ConnectError, httpx.TimeoutException):
             return False
 
@@ -15,14 +15,19 @@ Resource Tiers:
   HEALTHY   (50-75%): Use Gemini Flash + 3 concurrent agents
   TIGHT     (25-50%): Use Ollama only + 1 concurrent agent
   CRITICAL  (<25%): Pause all, emergency shutdown
+
+Metrics come from the background ResourceSampler (resource_sampler.py):
+get_system_resources() reads the latest snapshot instead of measuring,
+so admission checks cost microseconds, not a 100 ms CPU sample.
 """
 
 import json
-import psutil
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, List, Dict, Any
 
+from antigravity.resource_sampler import get_sampler
+
 
 # ─── Resource Tiers ─────────────────────────────────────────────────────────
 
@@ -116,18 +121,25 @@ class ResourceAwareExecutor:
         self.active_tasks: Dict[str, ResourceProfile] = {}
         self.resource_history: List[SystemResources] = []
         self.throttle_threshold = 0.85  # Throttle at 85% RAM used
+        self._last_snapshot = None
+        self._last_resources: Optional[SystemResources] = None
 
     def get_system_resources(self) -> SystemResources:
-        """Snapshot current system resources."""
+        """Current system resources (latest sampler snapshot, no measuring here)."""
         try:
+            snap = get_sampler().latest()
+            if snap is self._last_snapshot and self._last_resources is not None:
+                return self._last_resources  # nothing new since the last check
+
             # Memory
-            mem = psutil.virtual_memory()
-            free_percent = mem.available / mem.total * 100
-            free_mb = mem.available // (1024 * 1024)
-            total_mb = mem.total // (1024 * 1024)
+            if not snap.ram_total_mb:
+                raise RuntimeError("no memory metrics available")
+            free_percent = snap.ram_available_mb / snap.ram_total_mb * 100
+            free_mb = snap.ram_available_mb
+            total_mb = snap.ram_total_mb
 
             # CPU
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            cpu_percent = snap.cpu_percent
 
             # Determine tier
             if free_percent > 75:
@@ -143,7 +155,7 @@ class ResourceAwareExecutor:
             recommended = self.TIER_MODELS[tier]["primary"]
 
             # Determine if throttled
-            throttled = (mem.available / mem.total) < self.throttle_threshold
+            throttled = (free_percent / 100) < self.throttle_threshold
 
             resources = SystemResources(
                 tier=tier,
@@ -163,6 +175,8 @@ class ResourceAwareExecutor:
             if len(self.resource_history) > 1000:
                 self.resource_history = self.resource_history[-1000:]
 
+            self._last_snapshot = snap
+            self._last_resources = resources
             return resources
 
         except Exception as e:
@@ -0,0 +1,293 @@
+"""
+Resource Sampler — One Background Thread for CPU/RAM/Disk Metrics
+===================================================================
+Admission checks used to measure the machine themselves, on the hot path:
+  - resource_guard._get_cpu_percent slept 100 ms for its first CPU delta
+    (inside `async with guard.check()`, i.e. on the event loop)
+  - ResourceAwareExecutor called psutil.cpu_percent(interval=0.1) on
+    every can_execute_task / select_model
+  - system_guardian shelled out to vm_stat / top / sysctl per check
+
+Now one daemon thread samples at a fixed cadence and publishes an
+immutable ResourceSnapshot. Readers just take the latest reference
+(an attribute read — no lock, no I/O, no sleep).
+
+Per sample:
+  - CPU %   from the /proc/stat delta since the previous tick
+  - RAM     from /proc/meminfo (MemAvailable); vm_stat on macOS
+  - disk %  via statvfs, load average via os.getloadavg()
+  - EWMA of CPU and RAM, plus their trend in %-points per minute
+The last HISTORY_SIZE snapshots are kept in a ring buffer.
+
+Stdlib only, so standalone scripts (system_guardian) can use it too.
+
+Usage:
+    from antigravity.resource_sampler import get_sampler
+    snap = get_sampler().latest()
+    if snap.ram_percent > 85: ...
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+HAS_PROC = os.path.exists("/proc/stat")
+# Without /proc (macOS) every RAM sample runs vm_stat, so sample less often there
+SAMPLE_INTERVAL_SEC = float(os.getenv("RESOURCE_SAMPLE_INTERVAL", "1.0" if HAS_PROC else "5.0"))
+HISTORY_SIZE = 300  # 5 min at the default cadence
+EWMA_ALPHA = 0.3
+TREND_WINDOW_SEC = 30.0
+TREND_MIN_SPAN_SEC = 5.0  # no trend from samples closer together than this
+DISK_EVERY_N = 10  # statvfs every N samples (disk usage moves slowly)
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """One published sample. Immutable — safe to share between threads."""
+
+    timestamp: float
+    cpu_percent: float
+    ram_percent: float
+    ram_available_mb: int
+    ram_total_mb: int
+    disk_percent: float
+    load_avg: float
+    cpu_ewma: float
+    ram_ewma: float
+    cpu_trend: float  # %-points per minute (EWMA), + = rising
+    ram_trend: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def direction(trend: float, threshold: float = 5.0) -> str:
+    """rising | falling | stable for a trend in %-points per minute."""
+    if trend > threshold:
+        return "rising"
+    if trend < -threshold:
+        return "falling"
+    return "stable"
+
+
+# ─── Readers ────────────────────────────────────────────────────────
+def _read_cpu_times() -> Optional[Tuple[int, int]]:
+    """(idle, total) jiffies from /proc/stat, None without /proc."""
+    try:
+        with open("/proc/stat", "rb") as f:
+            parts = f.readline().split()
+        values = [int(p) for p in parts[1:]]
+        return values[3] + (values[4] if len(values) > 4 else 0), sum(values)  # idle + iowait
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _read_memory() -> Optional[Tuple[int, int]]:
+    """(total_mb, available_mb) from /proc/meminfo, or vm_stat/sysctl on macOS."""
+    try:
+        info = {}
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                key, _, rest = line.partition(b":")
+                if key in (b"MemTotal", b"MemAvailable", b"MemFree"):
+                    info[key] = int(rest.split()[0])
+                    if len(info) == 3:
+                        break
+        total = info[b"MemTotal"]
+        available = info.get(b"MemAvailable", info.get(b"MemFree", 0))
+        return total // 1024, available // 1024
+    except (OSError, KeyError, IndexError, ValueError):
+        pass
+    if sys.platform == "darwin":
+        return _read_memory_darwin()
+    return None
+
+
+_darwin_memsize: Optional[int] = None
+
+
+def _read_memory_darwin() -> Optional[Tuple[int, int]]:
+    """macOS: free + inactive pages (inactive can be reclaimed). Runs in the sampler thread only."""
+    global _darwin_memsize
+    try:
+        if _darwin_memsize is None:
+            _darwin_memsize = int(subprocess.run(
+                ["sysctl", "-n", "hw.memsize"], capture_output=True, text=True, timeout=5
+            ).stdout.strip())
+        output = subprocess.run(["vm_stat"], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+    total = _darwin_memsize
+    page_size = 16384  # Apple Silicon default
+    pages = {"Pages free": 0, "Pages inactive": 0}
+    for line in output.splitlines():
+        if "page size of" in line:
+            try:
+                page_size = int(line.split()[-2])
+            except (ValueError, IndexError):
+                pass
+        key, _, value = line.partition(":")
+        if key in pages:
+            try:
+                pages[key] = int(value.strip().rstrip("."))
+            except ValueError:
+                pass
+    available = (pages["Pages free"] + pages["Pages inactive"]) * page_size
+    return total // (1024 * 1024), available // (1024 * 1024)
+
+
+def _read_disk_percent(path: str) -> float:
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return 0.0
+    total = st.f_blocks * st.f_frsize
+    if total == 0:
+        return 0.0
+    return (1.0 - st.f_bavail * st.f_frsize / total) * 100.0
+
+
+def _load_avg() -> float:
+    try:
+        return os.getloadavg()[0]
+    except OSError:
+        return 0.0
+
+
+# ─── Sampler ────────────────────────────────────────────────────────
+class ResourceSampler:
+    """Background thread publishing ResourceSnapshots into a ring buffer."""
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL_SEC,
+        history_size: int = HISTORY_SIZE,
+        alpha: float = EWMA_ALPHA,
+        disk_path: str = "/",
+    ):
+        self.interval = interval
+        self.alpha = alpha
+        self.disk_path = disk_path
+        self._history: deque = deque(maxlen=history_size)
+        self._latest: Optional[ResourceSnapshot] = None
+        self._prev_cpu: Optional[Tuple[int, int]] = None
+        self._disk = 0.0
+        self._ticks = 0
+        self._write_lock = threading.Lock()  # writers only (thread tick vs. first-use sample)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ─── Lifecycle ──────────────────────────────────────────────────
+    def start(self) -> "ResourceSampler":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="resource-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:  # never let the sampler thread die
+                print(f"⚠️  Resource sampler error: {e}")
+
+    # ─── Sampling ───────────────────────────────────────────────────
+    def _cpu_percent(self) -> float:
+        now = _read_cpu_times()
+        if now is None:
+            # No /proc (macOS): load average per core as rough CPU estimate
+            return min(_load_avg() / (os.cpu_count() or 1) * 100.0, 100.0)
+        prev, self._prev_cpu = self._prev_cpu, now
+        if prev is None:
+            prev = (0, 0)  # first sample: average since boot instead of sleeping for a delta
+        d_idle, d_total = now[0] - prev[0], now[1] - prev[1]
+        if d_total <= 0:
+            return self._latest.cpu_percent if self._latest else 0.0
+        return max(0.0, min(100.0, (1.0 - d_idle / d_total) * 100.0))
+
+    def _trend(self, field: str, value: float, now: float) -> float:
+        """Slope of the EWMA against the oldest sample within TREND_WINDOW_SEC (%-points/min)."""
+        oldest = None
+        for snap in reversed(self._history):
+            if now - snap.timestamp > TREND_WINDOW_SEC:
+                break
+            oldest = snap
+        if oldest is None or now - oldest.timestamp < TREND_MIN_SPAN_SEC:
+            return 0.0
+        return (value - getattr(oldest, field)) / (now - oldest.timestamp) * 60.0
+
+    def sample(self) -> ResourceSnapshot:
+        """Take one sample now and publish it (called by the thread)."""
+        with self._write_lock:
+            now = time.time()
+            cpu = self._cpu_percent()
+            memory = _read_memory()
+            total_mb, available_mb = memory if memory else (0, 0)
+            ram = (1.0 - available_mb / total_mb) * 100.0 if total_mb else 0.0
+            if self._ticks % DISK_EVERY_N == 0:
+                self._disk = _read_disk_percent(self.disk_path)
+            self._ticks += 1
+
+            prev = self._latest
+            cpu_ewma = cpu if prev is None else self.alpha * cpu + (1 - self.alpha) * prev.cpu_ewma
+            ram_ewma = ram if prev is None else self.alpha * ram + (1 - self.alpha) * prev.ram_ewma
+            snap = ResourceSnapshot(
+                timestamp=now,
+                cpu_percent=round(cpu, 1),
+                ram_percent=round(ram, 1),
+                ram_available_mb=available_mb,
+                ram_total_mb=total_mb,
+                disk_percent=round(self._disk, 1),
+                load_avg=_load_avg(),
+                cpu_ewma=cpu_ewma,
+                ram_ewma=ram_ewma,
+                cpu_trend=self._trend("cpu_ewma", cpu_ewma, now),
+                ram_trend=self._trend("ram_ewma", ram_ewma, now),
+            )
+            self._history.append(snap)
+            self._latest = snap  # single reference swap = publish
+            return snap
+
+    # ─── Readers (lock-free) ────────────────────────────────────────
+    def latest(self) -> ResourceSnapshot:
+        """Most recent snapshot. Samples once synchronously before the first tick."""
+        snap = self._latest
+        if snap is None:
+            snap = self.sample()
+        return snap
+
+    def history(self, seconds: Optional[float] = None) -> List[ResourceSnapshot]:
+        """Snapshots from the ring buffer, oldest first (optionally only the last N seconds)."""
+        snaps = list(self._history)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            snaps = [s for s in snaps if s.timestamp >= cutoff]
+        return snaps
+
+
+# ─── Global Sampler ─────────────────────────────────────────────────
+_sampler: Optional[ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> ResourceSampler:
+    """Process-wide sampler (thread started on first use)."""
+    global _sampler
+    sampler = _sampler
+    if sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = ResourceSampler().start()
+            sampler = _sampler
+    return sampler
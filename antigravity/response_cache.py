@@ -0,0 +1,265 @@
+"""
+Response Cache — Content-Addressed LLM Response Cache
+======================================================
+Shared SQLite cache for deterministic / near-duplicate LLM calls.
+The same static prompts (swarm TASK_TYPES, atomic_reactor tasks,
+workflow steps, godmode role prompts) are sent again and again —
+low-temperature calls should only cost tokens once.
+
+Key   = sha256(provider, model, messages, temperature, max_tokens)
+        Line endings and leading/trailing whitespace of each message
+        are normalized so trivially different prompts (CRLF, trailing
+        newlines) share one entry. Inner whitespace is kept — in code
+        or tables it changes the meaning.
+Value = the provider response (content, model, usage).
+
+Features:
+- SQLite WAL backend (safe for several processes)
+- TTL expiry + LRU eviction once the cache exceeds its size budget
+- Only calls with temperature <= CACHE_MAX_TEMPERATURE are cached
+- Hit/miss counters for status reports
+- aget()/aput() run the SQLite work in a worker thread for async callers;
+  hit bookkeeping (last_access, hits) is buffered and written in batches
+
+Usage:
+    from antigravity.response_cache import get_response_cache, make_key
+    cache = get_response_cache()
+    key = make_key("ollama", model, messages, 0.1, 4096)
+    cached = cache.get(key)            # await cache.aget(key) on the event loop
+    if cached is None:
+        result = call_provider(...)
+        cache.put(key, result, provider="ollama", model=model)
+
+Environment:
+    RESPONSE_CACHE=0              → disable caching
+    RESPONSE_CACHE_TTL=604800     → entry lifetime in seconds
+    RESPONSE_CACHE_MAX_MB=256     → size budget before LRU eviction
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# ─── Config ─────────────────────────────────────────────────────────
+CACHE_DB = Path(__file__).parent / "_state" / "response_cache.db"
+CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "1").lower() not in ("0", "false", "no")
+CACHE_TTL_SEC = float(os.getenv("RESPONSE_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_BYTES = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", 256)) * 1024 * 1024)
+CACHE_MAX_TEMPERATURE = 0.3  # Higher temperatures are meant to vary — never cached
+EVICT_EVERY_PUTS = 200  # Amortize eviction: check size budget every N writes
+HIT_FLUSH_EVERY = 64  # Buffered hit updates are written once this many keys are pending
+
+# Keys that are worth caching from a provider response
+_CACHED_FIELDS = ("content", "model", "usage", "source", "tokens_in", "tokens_out")
+
+
+def _normalize(text: str) -> str:
+    return str(text).replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def make_key(
+    provider: str,
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Content address for an LLM call."""
+    canonical = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "messages": [
+                {"role": m.get("role", "user"), "content": _normalize(m.get("content", ""))}
+                for m in messages
+            ],
+            "temperature": round(float(temperature), 3),
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and LRU size eviction."""
+
+    def __init__(
+        self,
+        path: Path = CACHE_DB,
+        ttl_sec: float = CACHE_TTL_SEC,
+        max_bytes: int = CACHE_MAX_BYTES,
+        enabled: bool = CACHE_ENABLED,
+    ):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._pending_hits: dict[str, list] = {}  # key → [last_access, hits]
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def cacheable(temperature: Optional[float]) -> bool:
+        """Only (near-)deterministic calls are worth caching."""
+        return temperature is not None and temperature <= CACHE_MAX_TEMPERATURE
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached response or None. Expired entries count as misses."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None or now - row[1] > self.ttl_sec:
+                    if row is not None:
+                        db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        db.commit()
+                    self.stats["misses"] += 1
+                    return None
+                pending = self._pending_hits.setdefault(key, [now, 0])
+                pending[0] = now
+                pending[1] += 1
+                if len(self._pending_hits) >= HIT_FLUSH_EVERY:
+                    self._flush_hits_locked()
+                self.stats["hits"] += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, json.JSONDecodeError):
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, response: dict[str, Any], provider: str = "", model: str = "") -> bool:
+        """Store a provider response (only the portable fields)."""
+        if not self.enabled:
+            return False
+        value = json.dumps({k: response[k] for k in _CACHED_FIELDS if k in response}, ensure_ascii=False)
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                self._pending_hits.pop(key, None)
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, provider, model, value, size, created, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, value, len(value), now, now),
+                )
+                db.commit()
+                self.stats["stores"] += 1
+                self._puts += 1
+                if self._puts % EVICT_EVERY_PUTS == 0:
+                    self._evict_locked()
+            return True
+        except sqlite3.Error:
+            return False
+
+    async def aget(self, key: str) -> Optional[dict[str, Any]]:
+        """get() without blocking the event loop."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, response: dict[str, Any], provider: str = "", model: str = "") -> bool:
+        """put() without blocking the event loop."""
+        if not self.enabled:
+            return False
+        return await asyncio.to_thread(self.put, key, response, provider, model)
+
+    def flush_hits(self) -> None:
+        """Write buffered hit bookkeeping (last_access, hit counts)."""
+        with self._lock:
+            self._flush_hits_locked()
+
+    def _flush_hits_locked(self) -> None:
+        if not self._pending_hits:
+            return
+        rows = [(last_access, hits, key) for key, (last_access, hits) in self._pending_hits.items()]
+        self._pending_hits.clear()
+        db = self._db()
+        db.executemany("UPDATE responses SET last_access = ?, hits = hits + ? WHERE key = ?", rows)
+        db.commit()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least-recently-used ones above the size budget."""
+        with self._lock:
+            return self._evict_locked()
+
+    def _evict_locked(self) -> int:
+        self._flush_hits_locked()  # LRU order needs the latest access times
+        db = self._db()
+        removed = db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_sec,)).rowcount
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            stale_keys = []
+            for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+                stale_keys.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            db.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+            removed += len(stale_keys)
+        db.commit()
+        self.stats["evictions"] += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._pending_hits.clear()
+            self._db().execute("DELETE FROM responses")
+            self._db().commit()
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"hits {self.stats['hits']} | misses {self.stats['misses']} | "
+            f"hit rate {self.hit_rate():.0%} | evictions {self.stats['evictions']}"
+        )
+
+
+# ─── Module-level singleton ─────────────────────────────────────────
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide ResponseCache instance."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
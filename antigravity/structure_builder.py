@@ -17,26 +17,16 @@ from antigravity.config import (
     STRUCTURE_MAP_HTML,
     STRUCTURE_MAP_JSON,
 )
+from antigravity.file_index import get_file_index
 
 
 def get_python_files():
-    files = []
-    for f in Path(PROJECT_ROOT).rglob("*.py"):
-        if ".venv" in str(f) or "__pycache__" in str(f) or ".ruff_cache" in str(f):
-            continue
-        rel = str(f.relative_to(PROJECT_ROOT))
-        try:
-            lines = len(f.read_text(encoding="utf-8", errors="replace").split("\n"))
-        except (OSError, UnicodeDecodeError):
-            lines = 0
-        files.append(
-            {
-                "path": rel,
-                "lines": lines,
-                "dir": str(f.parent.relative_to(PROJECT_ROOT)),
-            }
-        )
-    return sorted(files, key=lambda x: x["path"])
+    index = get_file_index()
+    index.refresh()
+    return [
+        {"path": f["path"], "lines": f["lines"], "dir": f["dir"]}
+        for f in index.files(ext=".py")
+    ]
 
 
 def get_imports(filepath):
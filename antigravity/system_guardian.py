@@ -4,6 +4,7 @@ System Guardian — Prevents Mac from ever becoming unstable.
 Monitors RAM/CPU and auto-kills heavy processes before the system hangs.
 
 Runs as a LaunchAgent every 30 seconds.
+RAM/load come from the shared ResourceSampler (no vm_stat/top/sysctl per check).
 """
 
 import json
@@ -13,6 +14,9 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from antigravity.resource_sampler import get_sampler
+
 # ═══════════════════════════════════════════════════════════
 # CONFIGURATION — Hard limits for 16GB Mac
 # ═══════════════════════════════════════════════════════════
@@ -68,68 +72,19 @@ def run(cmd: str, timeout: int = 10) -> str:
 
 
 def get_free_ram_mb() -> int:
-    """Get free RAM in MB using vm_stat."""
-    output = run("vm_stat")
-    if not output:
-        return 0
-
-    page_size = 16384  # Apple Silicon default
-    free_pages = 0
-    inactive_pages = 0
-
-    for line in output.splitlines():
-        if "page size of" in line:
-            try:
-                page_size = int(line.split()[-2])
-            except (ValueError, IndexError):
-                pass
-        if "Pages free:" in line:
-            try:
-                free_pages = int(line.split()[-1].rstrip("."))
-            except (ValueError, IndexError):
-                pass
-        if "Pages inactive:" in line:
-            try:
-                inactive_pages = int(line.split()[-1].rstrip("."))
-            except (ValueError, IndexError):
-                pass
-
-    # Free = free + inactive (inactive can be reclaimed)
-    free_bytes = (free_pages + inactive_pages) * page_size
-    return int(free_bytes / 1024 / 1024)
+    """Free RAM in MB (macOS: free + inactive pages, Linux: MemAvailable)."""
+    return get_sampler().latest().ram_available_mb
 
 
 def get_used_ram_gb() -> float:
-    """Get used RAM from top."""
-    output = run("top -l 1 -s 0 | grep PhysMem")
-    if not output:
-        return 0.0
-    try:
-        # "PhysMem: 15G used (7732M wired, 6318M compressor), 117M unused."
-        parts = output.split()
-        for i, p in enumerate(parts):
-            if p == "used":
-                val = parts[i - 1]
-                if val.endswith("G"):
-                    return float(val[:-1])
-                elif val.endswith("M"):
-                    return float(val[:-1]) / 1024
-    except Exception:
-        pass
-    return 0.0
+    """Used RAM in GB."""
+    snap = get_sampler().latest()
+    return (snap.ram_total_mb - snap.ram_available_mb) / 1024
 
 
 def get_load_avg() -> float:
     """Get 1-minute load average."""
-    output = run("sysctl -n vm.loadavg")
-    if not output:
-        return 0.0
-    try:
-        # "{ 10.84 11.30 11.08 }"
-        parts = output.strip("{ }").split()
-        return float(parts[0])
-    except (ValueError, IndexError):
-        return 0.0
+    return get_sampler().latest().load_avg
 
 
 def get_ollama_models() -> list[dict]:
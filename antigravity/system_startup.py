@@ -175,11 +175,7 @@ class SystemStartup:
             from antigravity.knowledge_store import KnowledgeStore
 
             ks = KnowledgeStore()
-            # Check if we can access the store
-            if hasattr(ks, 'list_all'):
-                item_count = len(ks.list_all())
-            else:
-                item_count = 0
+            item_count = ks.count()
             self.pass_check(f"Knowledge store: Ready ({item_count} items)")
         except Exception as e:
             self.warn(f"Knowledge store: {e} (will initialize on first use)")
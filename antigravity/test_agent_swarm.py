@@ -0,0 +1,88 @@
+"""Tests for the AgentSwarm dependency scheduler."""
+
+import asyncio
+
+import pytest
+
+from antigravity import agent_swarm
+from antigravity.agent_swarm import AgentRole, AgentSwarm, TaskStatus
+
+
+class FakeClaude:
+    """Stands in for OfflineClaude: echoes the prompt, 'fail' in the prompt → error."""
+
+    running = 0
+    peak = 0
+
+    async def think(self, task, role):
+        FakeClaude.running += 1
+        FakeClaude.peak = max(FakeClaude.peak, FakeClaude.running)
+        await asyncio.sleep(0.01)
+        FakeClaude.running -= 1
+        if "fail" in task:
+            return {"error": "boom"}
+        return {"response": task.upper()}
+
+
+@pytest.fixture
+def swarm(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_swarm, "OfflineClaude", FakeClaude)
+    monkeypatch.setattr(AgentSwarm, "SWARM_DIR", tmp_path)
+    monkeypatch.setattr(AgentSwarm, "RESULTS_LOG", tmp_path / "results.jsonl")
+    monkeypatch.setattr(AgentSwarm, "AGENTS_LOG", tmp_path / "agents.json")
+    FakeClaude.running = FakeClaude.peak = 0
+    return AgentSwarm(num_agents=4)
+
+
+def test_dependents_run_after_their_dependencies(swarm):
+    async def scenario():
+        # Forward reference: the writer is added before the outline it waits for
+        write = await swarm.add_task(AgentRole.CONTENT_WRITER, "write", "write", dependencies=["outline"])
+        await swarm.add_task(AgentRole.ARCHITECT, "outline", "outline", task_id="outline")
+        review = await swarm.add_task(AgentRole.REVIEWER, "review", "review", dependencies=[write])
+        assert swarm.critical_path()[1] == ["outline", write, review]
+        return await swarm.run(max_concurrent=2)
+
+    results = asyncio.run(scenario())
+    assert [r["status"] for r in results] == [TaskStatus.COMPLETED] * 3
+    tasks = swarm.tasks
+    assert tasks["outline"].completed_at <= tasks[results[0]["task_id"]].started_at
+    assert swarm.pending_tasks == []
+
+
+def test_failure_propagates_and_concurrency_is_capped(swarm):
+    async def scenario():
+        bad = await swarm.add_task(AgentRole.CODER, "bad", "fail")
+        child = await swarm.add_task(AgentRole.CODER, "child", "child", dependencies=[bad])
+        for i in range(6):
+            await swarm.add_task(AgentRole.ANALYST, f"free {i}", f"free {i}")
+        await swarm.run(max_concurrent=3)
+        return bad, child
+
+    bad, child = asyncio.run(scenario())
+    assert swarm.tasks[bad].status == TaskStatus.FAILED
+    assert swarm.tasks[child].status == TaskStatus.FAILED
+    assert swarm.tasks[child].error == f"Dependency {bad} failed"
+    assert FakeClaude.peak == 3
+    assert all(agent.active_tasks == 0 for agent in swarm.agents.values())
+
+
+def test_cycle_rejected_at_add_time(swarm):
+    async def scenario():
+        await swarm.add_task(AgentRole.CODER, "a", "a", task_id="a", dependencies=["b"])
+        with pytest.raises(ValueError, match="cycle"):
+            await swarm.add_task(AgentRole.CODER, "b", "b", task_id="b", dependencies=["a"])
+        with pytest.raises(ValueError, match="cycle"):
+            await swarm.add_task(AgentRole.CODER, "c", "c", task_id="c", dependencies=["c"])
+
+    asyncio.run(scenario())
+    assert list(swarm.tasks) == ["a"]
+
+
+def test_free_list_prefers_role_and_falls_back(swarm):
+    coder = next(a for a in swarm.agents.values() if a.role == AgentRole.CODER)
+    taken = [swarm._find_available_agent(AgentRole.CODER) for _ in range(coder.capacity + 1)]
+    assert taken[:-1] == [coder] * coder.capacity
+    assert taken[-1].role != AgentRole.CODER  # 4 agents: only one coder, now full
+    swarm._release_agent(coder)
+    assert swarm._find_available_agent(AgentRole.CODER) is coder
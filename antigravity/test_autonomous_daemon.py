@@ -0,0 +1,160 @@
+"""Tests for the autonomous daemon's task journal and worker loop."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from antigravity import autonomous_daemon
+from antigravity.autonomous_daemon import AutonomousDaemon, AutonomousTask, TaskPriority, TaskStatus
+
+
+class FakeClaude:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.fail_once = set()
+        self.on_done = None
+
+    async def think(self, task, role, task_type):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if task in self.fail_once:
+            self.fail_once.discard(task)
+            return {"error": "flaky"}
+        if self.on_done:
+            self.on_done()
+        return {"response": f"done: {task}", "tokens_used": 3}
+
+
+class FakeCheckpoint:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def save(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def daemon_cls(tmp_path, monkeypatch):
+    monkeypatch.setattr(autonomous_daemon, "OfflineClaude", FakeClaude)
+    monkeypatch.setattr(autonomous_daemon, "StateCheckpoint", FakeCheckpoint)
+    resources = SimpleNamespace(available_concurrency=4)
+    monkeypatch.setattr(
+        autonomous_daemon, "get_executor", lambda: SimpleNamespace(get_system_resources=lambda: resources)
+    )
+
+    class TmpDaemon(AutonomousDaemon):
+        TASK_QUEUE_FILE = tmp_path / "queue.jsonl"
+        WORK_LOG_FILE = tmp_path / "work.jsonl"
+        STATUS_FILE = tmp_path / "status.json"
+
+    return TmpDaemon
+
+
+def _task(task_id, priority=TaskPriority.NORMAL, **fields):
+    return AutonomousTask(task_id, task_id, "", "coder", f"prompt {task_id}", priority=priority, **fields).to_dict()
+
+
+def _write(path, *entries, tail=""):
+    path.write_text("".join(json.dumps(e) + "\n" for e in entries) + tail)
+
+
+def _pop_all(daemon):
+    order = []
+    while (task_id := daemon._get_next_task()) is not None:
+        order.append(task_id)
+    return order
+
+
+def test_replay_resets_running_tasks(daemon_cls):
+    _write(
+        daemon_cls.TASK_QUEUE_FILE,
+        {"op": "enqueue", "task": _task("a")},
+        {"op": "enqueue", "task": _task("b")},
+        {"op": "start", "task_id": "a", "fields": {"status": "running", "started_at": 1.0}},
+        {"op": "start", "task_id": "b", "fields": {"status": "running", "started_at": 1.0}},
+        {"op": "complete", "task_id": "b", "fields": {"status": "completed", "result": "ok", "tokens_used": 1, "completed_at": 2.0}},
+        {"op": "start", "task_id": "gone", "fields": {"status": "running"}},  # unknown task → ignored
+    )
+    daemon = daemon_cls()
+    a, b = daemon.tasks["a"], daemon.tasks["b"]
+    assert a.status == TaskStatus.PENDING and a.started_at is None  # crashed mid-run → again
+    assert b.status == TaskStatus.COMPLETED and b.result == "ok"
+    assert _pop_all(daemon) == ["a"]
+
+
+def test_legacy_lines_and_torn_tail(daemon_cls):
+    _write(
+        daemon_cls.TASK_QUEUE_FILE,
+        _task("old"),  # legacy format: one task dict per line
+        _task("done", status="completed"),
+        {"op": "enqueue", "task": _task("new")},
+        tail='{"op": "start", "task_id": "new", "fie',  # torn by a crash mid-write
+    )
+    daemon = daemon_cls()
+    assert set(daemon.tasks) == {"old", "done", "new"}
+    assert daemon.tasks["new"].status == TaskStatus.PENDING
+    assert _pop_all(daemon) == ["old", "new"]
+
+
+def test_priority_then_fifo(daemon_cls):
+    daemon = daemon_cls()
+
+    async def add_all():
+        for task_id, priority in (("n1", "NORMAL"), ("low", "LOW"), ("crit", "CRITICAL"), ("n2", "NORMAL")):
+            await daemon.add_task(task_id, "", "coder", task_id, priority=TaskPriority[priority], task_id=task_id)
+
+    asyncio.run(add_all())
+    assert _pop_all(daemon) == ["crit", "n1", "n2", "low"]
+    assert [t.task_id for t in daemon_cls().tasks.values()] == ["n1", "low", "crit", "n2"]  # journaled
+
+
+def test_compaction_keeps_only_open_tasks(daemon_cls, monkeypatch):
+    monkeypatch.setattr(autonomous_daemon, "JOURNAL_COMPACT_AFTER", 10)
+    entries = []
+    for i in range(6):
+        entries.append({"op": "enqueue", "task": _task(f"t{i}")})
+        if i < 4:
+            entries.append({"op": "complete", "task_id": f"t{i}", "fields": {"status": "completed"}})
+    entries.append({"op": "start", "task_id": "t4", "fields": {"status": "running", "started_at": 1.0}})
+    _write(daemon_cls.TASK_QUEUE_FILE, *entries)
+
+    daemon = daemon_cls()  # 11 lines, 2 open tasks → compacted on load
+    lines = [json.loads(line) for line in daemon_cls.TASK_QUEUE_FILE.read_text().splitlines()]
+    assert [(e["op"], e["task"]["task_id"], e["task"]["status"]) for e in lines] == [
+        ("enqueue", "t4", "pending"),
+        ("enqueue", "t5", "pending"),
+    ]
+    assert daemon._journal_lines == 2
+    assert _pop_all(daemon_cls()) == ["t4", "t5"]
+
+
+def test_run_uses_workers_retries_and_journals(daemon_cls):
+    daemon = daemon_cls()
+    remaining = {"count": 5}
+
+    def on_done():
+        remaining["count"] -= 1
+        if not remaining["count"]:
+            daemon.is_running = False
+
+    daemon.claude.on_done = on_done
+    daemon.claude.fail_once.add("t0")
+
+    async def main():
+        for i in range(5):
+            await daemon.add_task(f"t{i}", "", "coder", f"t{i}", task_id=f"t{i}")
+        await asyncio.wait_for(daemon.run(max_workers=2), timeout=5)
+
+    asyncio.run(main())
+    assert daemon.claude.peak == 2
+    assert daemon.tasks_completed == 5 and daemon.tasks["t0"].retry_count == 1
+
+    reloaded = daemon_cls()
+    assert all(t.status == TaskStatus.COMPLETED for t in reloaded.tasks.values())
+    assert reloaded.tasks["t3"].result == "done: t3"
+    assert _pop_all(reloaded) == []
@@ -0,0 +1,74 @@
+"""Tests for the incremental file index."""
+
+import os
+
+from antigravity.file_index import FileIndex
+
+
+def _age(path, seconds=60):
+    """Backdate mtime so the directory is not treated as racy."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - int(seconds * 1e9)))
+
+
+def _tree(root):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "a.py").write_text("x = 1\ny = 2\n")
+    (root / "README.md").write_text("# hi")
+    (root / "__pycache__").mkdir()
+    (root / "__pycache__" / "a.cpython.pyc").write_bytes(b"\0")
+    for path in (root / "pkg", root):
+        _age(path)
+
+
+def test_counts_and_excludes(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _tree(root)
+    index = FileIndex(root=root, path=tmp_path / "index.db")
+    stats = index.refresh()
+    assert stats["files_updated"] == 2
+    assert index.totals() == {"files": 2, "lines": 4, "bytes": 16}
+    assert index.files(ext=".py") == [
+        {"path": "pkg/a.py", "dir": "pkg", "ext": ".py", "size": 12, "lines": 3}
+    ]
+    assert index.by_dir() == {".": {"files": 1, "lines": 1}, "pkg": {"files": 1, "lines": 3}}
+
+
+def test_unchanged_dirs_are_skipped_and_changes_picked_up(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _tree(root)
+    index = FileIndex(root=root, path=tmp_path / "index.db")
+    index.refresh()
+
+    again = index.refresh()
+    assert again["dirs_listed"] == 0 and again["files_updated"] == 0
+
+    (root / "pkg" / "b.py").write_text("pass\n")
+    (root / "README.md").unlink()
+    changed = index.refresh()
+    assert changed["files_updated"] == 1 and changed["files_removed"] == 1
+    assert index.counters() == {".py": {"files": 2, "lines": 5, "bytes": 17}}
+
+    # A fresh instance reads the persisted counters without walking
+    reopened = FileIndex(root=root, path=tmp_path / "index.db")
+    assert reopened.totals([".py"])["files"] == 2
+
+
+def test_state_and_own_db_are_not_indexed(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _tree(root)
+    (root / "pkg" / "_state").mkdir()
+    (root / "pkg" / "_state" / "cache.db").write_bytes(b"\0")
+    (root / "data.db-wal").write_bytes(b"\0")
+    index = FileIndex(root=root, path=root / "pkg" / "idx" / "index.db")
+    index.refresh()
+    _age(root / "pkg")
+    _age(root)
+    assert index.totals()["files"] == 2
+
+    again = index.refresh()  # the index's own -wal/-shm writes do not show up
+    assert again["files_updated"] == 0 and again["files_removed"] == 0
+    assert all("_state" not in f["path"] and "idx" not in f["path"] for f in index.files())
@@ -0,0 +1,30 @@
+"""Tests for the shared HTTP connection pools."""
+
+import asyncio
+
+from antigravity import http_pool
+
+
+def test_async_clients_are_per_loop_and_closed_with_it():
+    clients = []
+
+    async def use():
+        client = http_pool.get_async_client()
+        assert http_pool.get_async_client() is client
+        clients.append((client, http_pool.get_aiohttp_session()))
+
+    asyncio.run(use())
+    asyncio.run(use())
+    (first, first_session), (second, _) = clients
+    assert first is not second
+    assert first.is_closed and first_session.closed  # closed at loop shutdown, not leaked
+    assert second.is_closed
+
+
+def test_aclose_all_then_loop_shutdown():
+    async def use():
+        client = http_pool.get_async_client()
+        await http_pool.aclose_all()
+        return client
+
+    assert asyncio.run(use()).is_closed  # the shutdown guard closing it again is harmless
@@ -0,0 +1,102 @@
+"""Tests for the indexed Knowledge Store."""
+
+import pytest
+
+from antigravity.knowledge_store import KnowledgeStore
+
+
+@pytest.fixture
+def store_cls(tmp_path):
+    class TmpStore(KnowledgeStore):
+        STORE_DIR = tmp_path
+        STORE_FILE = tmp_path / "knowledge_items.jsonl"
+        INDEX_FILE = tmp_path / "knowledge_index.json"
+        SEARCH_INDEX_FILE = tmp_path / "knowledge_search_index.json"
+        VECTOR_FILE = tmp_path / "knowledge_vectors.npz"
+
+    return TmpStore
+
+
+def _fill(ks):
+    ks.add("fix", "gemini_client env var crash", "import config, never os.getenv", tags=["bugfix", "Gemini"])
+    ks.add("pattern", "Atomic writes", "tmp file then os.rename", tags=["crash-safety"])
+    ks.add("learning", "Model routing", "ollama for most tasks, gemini for complex ones", tags=["routing"])
+
+
+def test_bm25_search_tags_types_and_get(store_cls):
+    ks = store_cls()
+    _fill(ks)
+    assert ks.search("gemini crash")[0].title == "gemini_client env var crash"
+    assert [ki.title for ki in ks.search("rout")] == ["Model routing"]  # prefix match
+    assert [ki.title for ki in ks.search("client")] == ["gemini_client env var crash"]  # identifier part
+    assert ks.search("gemini_client")[0].title == "gemini_client env var crash"
+    assert [ki.title for ki in ks.search_by_tag("gemini")] == ["gemini_client env var crash"]
+    assert [ki.ki_type for ki in ks.search_by_type("pattern")] == ["pattern"]
+    item = ks.search("atomic")[0]
+    assert ks.get(item.ki_id) is item
+    assert ks.get("ki_missing") is None
+
+
+def test_persisted_index_catches_up_with_tail(store_cls):
+    ks = store_cls()
+    _fill(ks)
+    ks.flush()
+    ks.add("fix", "redis timeout", "raise socket timeout", tags=["redis"])  # not yet in the saved index
+
+    reopened = store_cls()
+    assert reopened.count() == 4
+    assert reopened.search("redis")[0].title == "redis timeout"
+    assert reopened.search("gemini")[0].title == "gemini_client env var crash"
+
+
+def test_lazy_open_counts_stats_and_recent(store_cls):
+    ks = store_cls()
+    _fill(ks)
+    ks.flush()
+
+    reopened = store_cls()
+    assert reopened._index is None  # nothing parsed on open
+    assert reopened.count() == 3
+    assert reopened.stats()["by_type"] == {"fix": 1, "pattern": 1, "learning": 1}
+    assert [ki.title for ki in reopened.recent(2)] == ["Model routing", "Atomic writes"]
+
+
+def test_hybrid_search_persists_vectors(store_cls, monkeypatch):
+    pytest.importorskip("numpy")
+    from antigravity import knowledge_store
+    from antigravity.knowledge_vectors import HashedTfidfEmbedder
+
+    monkeypatch.setattr(knowledge_store, "make_embedder", lambda: HashedTfidfEmbedder())
+    ks = store_cls()
+    _fill(ks)
+    assert ks.search("atomic writes", mode="semantic")[0].title == "Atomic writes"
+    assert ks.search("gemini crash", mode="hybrid")[0].title == "gemini_client env var crash"
+    ks.add("fix", "redis timeout", "raise socket timeout", tags=["redis"])  # embedded incrementally
+    ks.flush()
+
+    reopened = store_cls()
+    assert reopened.search("redis socket", mode="semantic")[0].title == "redis timeout"
+    with pytest.raises(ValueError):
+        reopened.search("redis", mode="fuzzy")
+
+
+def test_embedding_outage_is_retried(store_cls, monkeypatch):
+    pytest.importorskip("numpy")
+    from antigravity import knowledge_store
+    from antigravity.knowledge_vectors import HashedTfidfEmbedder
+
+    def unreachable():
+        raise ConnectionError("ollama down")
+
+    monkeypatch.setattr(knowledge_store, "make_embedder", unreachable)
+    ks = store_cls()
+    _fill(ks)
+    assert "Atomic writes" in ks.export_for_agent("atomic")  # keyword by default, no embedder needed
+    assert ks.search("atomic writes", mode="hybrid")[0].title == "Atomic writes"  # keyword fallback
+    assert ks._vectors is None
+
+    monkeypatch.setattr(knowledge_store, "make_embedder", lambda: HashedTfidfEmbedder())
+    ks.search("atomic writes", mode="semantic")
+    assert ks._vectors is None  # still inside the retry window
+    ks._vectors_retry_at = 0.0
+    assert ks.search("atomic writes", mode="semantic")[0].title == "Atomic writes"
@@ -0,0 +1,49 @@
+"""Tests for the shared Ollama model registry."""
+
+import asyncio
+
+from antigravity import model_registry
+from antigravity.model_registry import ModelRegistry
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"data": [{"id": "llama2"}, {"id": "qwen2.5-coder:14b"}]}
+
+
+class FakeAsyncClient:
+    calls = 0
+
+    async def get(self, url, timeout):
+        FakeAsyncClient.calls += 1
+        await asyncio.sleep(0.01)
+        return FakeResponse()
+
+
+def test_concurrent_sessions_share_one_discovery(monkeypatch):
+    monkeypatch.setattr(model_registry, "get_async_client", FakeAsyncClient)
+    FakeAsyncClient.calls = 0
+    registry = ModelRegistry(ttl_sec=60)
+
+    async def scenario():
+        sessions = [registry.session() for _ in range(50)]
+        return await asyncio.gather(*(s.registry.aavailable() for s in sessions))
+
+    results = asyncio.run(scenario())
+    assert FakeAsyncClient.calls == 1
+    assert all(models == ["llama2", "qwen2.5-coder:14b"] for models in results)
+    assert registry.session().model == "qwen2.5-coder:14b"  # cached: no sync HTTP call
+
+    registry.invalidate()
+    asyncio.run(registry.aavailable())
+    assert FakeAsyncClient.calls == 2
+
+
+def test_select_by_task_type():
+    models = ["llama2", "mistral:latest"]
+    assert ModelRegistry.select(models, "reasoning") == "mistral"
+    assert ModelRegistry.select(["phi3"], "code") == "phi3"
+    assert ModelRegistry.select([], "code") is None
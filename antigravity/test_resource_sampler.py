@@ -0,0 +1,23 @@
+"""Tests for the background resource sampler."""
+
+from antigravity import resource_sampler
+from antigravity.resource_sampler import ResourceSampler, direction
+
+
+def test_ewma_ring_buffer_and_trend(monkeypatch):
+    ram = iter([50.0, 50.0, 80.0, 80.0, 80.0])
+    monkeypatch.setattr(resource_sampler, "_read_memory", lambda: (1000, int(1000 - 10 * next(ram))))
+    clock = iter(range(0, 100, 10))
+    monkeypatch.setattr(resource_sampler.time, "time", lambda: float(next(clock)))
+    sampler = ResourceSampler(history_size=3, alpha=0.5)
+
+    first = sampler.latest()  # no thread running: samples once on demand
+    assert first.ram_percent == 50.0 and first.ram_ewma == 50.0
+    assert sampler.latest() is first  # readers never re-sample
+
+    for _ in range(4):
+        snap = sampler.sample()
+    assert len(sampler.history()) == 3
+    assert snap.ram_percent == 80.0
+    assert 50.0 < snap.ram_ewma < 80.0
+    assert snap.ram_trend > 0 and direction(snap.ram_trend) == "rising"
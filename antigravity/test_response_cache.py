@@ -0,0 +1,65 @@
+"""Tests for the shared LLM response cache."""
+
+import asyncio
+import time
+
+from antigravity.response_cache import ResponseCache, make_key
+
+MESSAGES = [{"role": "system", "content": "Du bist QA."}, {"role": "user", "content": "Review  this\n"}]
+
+
+def test_key_ignores_outer_whitespace_but_not_params():
+    near_duplicate = [{"role": "system", "content": "Du bist QA.\r\n"}, {"role": "user", "content": "  Review  this"}]
+    assert make_key("ollama", "m", MESSAGES, 0.1, 100) == make_key("ollama", "m", near_duplicate, 0.1, 100)
+    reindented = [{"role": "system", "content": "Du bist QA."}, {"role": "user", "content": "Review this"}]
+    assert make_key("ollama", "m", MESSAGES, 0.1, 100) != make_key("ollama", "m", reindented, 0.1, 100)
+    assert make_key("ollama", "m", MESSAGES, 0.1, 100) != make_key("gemini", "m", MESSAGES, 0.1, 100)
+    assert make_key("ollama", "m", MESSAGES, 0.1, 100) != make_key("ollama", "m", MESSAGES, 0.2, 100)
+
+
+def test_hit_miss_and_ttl(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db", ttl_sec=0.2, enabled=True)
+    key = make_key("ollama", "m", MESSAGES, 0.1)
+    assert cache.get(key) is None
+    cache.put(key, {"content": "ok", "model": "m", "raw_response": {"big": "x"}})
+    assert cache.get(key) == {"content": "ok", "model": "m"}
+    time.sleep(0.25)
+    assert cache.get(key) is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db", max_bytes=200, enabled=True)
+    for i in range(5):
+        cache.put(f"k{i}", {"content": "x" * 60})
+    cache.get("k0")  # k0 becomes most recently used
+    cache.evict()
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+
+
+def test_high_temperature_not_cacheable():
+    assert ResponseCache.cacheable(0.1)
+    assert not ResponseCache.cacheable(0.8)
+
+
+def test_hits_are_batched(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db", enabled=True)
+    cache.put("k", {"content": "ok"})
+    for _ in range(3):
+        assert cache.get("k") == {"content": "ok"}
+    query = "SELECT hits FROM responses WHERE key = 'k'"
+    assert cache._db().execute(query).fetchone()[0] == 0  # buffered, no write per hit
+    cache.flush_hits()
+    assert cache._db().execute(query).fetchone()[0] == 3
+
+
+def test_async_wrappers(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db", enabled=True)
+
+    async def roundtrip():
+        assert await cache.aget("k") is None
+        assert await cache.aput("k", {"content": "ok"}, provider="ollama")
+        return await cache.aget("k")
+
+    assert asyncio.run(roundtrip()) == {"content": "ok"}
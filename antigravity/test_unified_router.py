@@ -0,0 +1,97 @@
+"""Tests for the router's provider scoring and circuit breaker."""
+
+import asyncio
+
+from antigravity import unified_router
+from antigravity.response_cache import ResponseCache
+from antigravity.unified_router import UnifiedRouter
+
+
+def _router():
+    router = UnifiedRouter()
+    router.config.offline_mode = False
+    for status in router.providers.values():
+        status.available = True
+    return router
+
+
+def test_task_routing_beats_cost():
+    router = _router()
+    for name in ("gemini", "ollama", "moonshot"):
+        router._record_success(name, 800, 0)
+    assert router._select_provider("code") == "gemini"  # preferred, despite ollama being free
+    assert router._select_provider("chat") == "ollama"  # no preference: cost decides
+
+
+def test_half_open_provider_gets_its_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(unified_router.time, "time", lambda: now[0])
+    router = _router()
+    for name in ("gemini", "ollama", "moonshot"):
+        router._record_success(name, 800, 0)
+    for _ in range(router.config.breaker_failure_threshold):
+        router._record_failure("gemini")
+    assert router.providers["gemini"].circuit == "open"
+    assert router._select_provider("code") != "gemini"
+
+    # After the cooldown the breaker half-opens, and the decayed error rate
+    # lets the preferred provider win its trial request again
+    now[0] += 10 * router.config.error_half_life_sec
+    assert router._select_provider("code") == "gemini"
+    assert router.providers["gemini"].circuit == "half_open"
+    router._record_success("gemini", 800, 0)
+    assert router.providers["gemini"].circuit == "closed"
+
+
+def test_half_open_probe_is_claimed_once_and_status_is_read_only(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(unified_router.time, "time", lambda: now[0])
+    router = _router()
+    router.config.offline_mode = False
+    router.providers["ollama"].available = False
+    router.providers["moonshot"].available = False
+    gemini = router.providers["gemini"]
+    for _ in range(router.config.breaker_failure_threshold):
+        router._record_failure("gemini")
+    now[0] += router.config.breaker_cooldown_sec + 10 * router.config.error_half_life_sec
+
+    router.status_report()
+    router._rank_providers()
+    assert gemini.circuit == "open" and not gemini.probe_in_flight  # reporting changes nothing
+
+    assert router._select_provider("code") == "gemini"
+    assert gemini.circuit == "half_open" and gemini.probe_in_flight
+    # A concurrent execute() must not get a second probe
+    assert router._select_provider("code", exclude=["ollama"]) is None
+    router._release("gemini")
+    assert router._select_provider("code", exclude=["ollama"]) == "gemini"
+
+
+def test_cache_hit_after_hedge_backup_won(tmp_path):
+    router = _router()
+    router.cache = ResponseCache(path=tmp_path / "cache.db", enabled=True)
+    router.config.hedge_min_delay_sec = router.config.hedge_default_delay_sec = 0.01
+    calls = []
+
+    def provider(name, delay):
+        async def call(agent, prompt, context):
+            calls.append(name)
+            await asyncio.sleep(delay)
+            return {"content": f"from {name}", "model": "m", "usage": {"total_tokens": 10}}
+        return call
+
+    router._execute_gemini = provider("gemini", 1.0)
+    router._execute_ollama = provider("ollama", 0.0)
+    router._execute_moonshot = provider("moonshot", 0.0)
+    router.config.cost_per_1k_tokens = {"gemini": 0.0, "ollama": 0.0, "moonshot": 0.0}
+
+    async def twice():
+        first = await router.execute("hi", agent_key="qa", task_type="code", hedge=True)
+        second = await router.execute("hi", agent_key="qa", task_type="code", hedge=True)
+        return first, second
+
+    first, second = asyncio.run(twice())
+    assert first["provider"] != "gemini" and not first.get("cached")  # the backup won
+    assert second["cached"] and second["content"] == first["content"]
+    assert second["provider"] == first["provider"]
+    assert len(calls) == 2  # primary + backup, nothing for the second call
@@ -0,0 +1,97 @@
+"""
+Token Stream — Relay LLM tokens to HTTP/WebSocket clients
+==========================================================
+UnifiedRouter.execute_stream() yields events as tokens arrive:
+
+    {"type": "meta",  "provider": "ollama", "model": "...", "agent": "coder"}
+    {"type": "token", "content": "Hel"}
+    {"type": "done",  "provider": "ollama", "ttft_ms": 310.2, "latency_ms": 4200.0}
+    {"type": "error", "errors": ["gemini: ...", ...]}
+
+This module relays them to slow consumers without stalling the provider:
+coalesced() reads the provider stream in a background task and hands the
+consumer everything that piled up since its last send, merged into one
+token event. A phone on a bad connection gets fewer, larger chunks; the
+provider connection never blocks on the client and no token is dropped.
+
+Usage:
+    events = coalesced(router.execute_stream(prompt, agent_key="coder"))
+    return StreamingResponse(sse_events(events), media_type="text/event-stream")
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator
+
+# Upper bound for one merged token event (keeps single messages small)
+MAX_BATCH_CHARS = 4096
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # disable proxy buffering (nginx)
+}
+
+
+async def coalesced(
+    events: AsyncIterator[dict[str, Any]],
+    max_batch_chars: int = MAX_BATCH_CHARS,
+) -> AsyncIterator[dict[str, Any]]:
+    """Decouple a fast event producer from a slow consumer by merging pending tokens."""
+    pending: list[dict[str, Any]] = []
+    ready = asyncio.Event()
+    finished = False
+
+    async def pump():
+        nonlocal finished
+        try:
+            async for event in events:
+                pending.append(event)
+                ready.set()
+        except Exception as exc:
+            pending.append({"type": "error", "errors": [f"{type(exc).__name__}: {exc}"]})
+        finally:
+            finished = True
+            ready.set()
+
+    producer = asyncio.create_task(pump())
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            batch, pending[:] = list(pending), []
+            for event in _merge_tokens(batch, max_batch_chars):
+                yield event
+            if finished and not pending:
+                break
+    finally:
+        # Consumer went away (client disconnect) → stop pulling from the provider
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+
+def _merge_tokens(batch: list[dict[str, Any]], max_chars: int) -> list[dict[str, Any]]:
+    merged: list[dict[str, Any]] = []
+    for event in batch:
+        last = merged[-1] if merged else None
+        if (
+            event.get("type") == "token"
+            and last is not None
+            and last.get("type") == "token"
+            and len(last["content"]) + len(event["content"]) <= max_chars
+        ):
+            last["content"] += event["content"]
+        else:
+            merged.append(dict(event))
+    return merged
+
+
+def sse_format(event: dict[str, Any]) -> str:
+    """One Server-Sent Events frame."""
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+async def sse_events(events: AsyncIterator[dict[str, Any]]) -> AsyncIterator[str]:
+    """Event stream → SSE text frames (for StreamingResponse)."""
+    async for event in events:
+        yield sse_format(event)
@@ -8,6 +8,18 @@ Routes tasks to the best available provider:
 
 Implements automatic failover: if Gemini is down or rate-limited,
 falls back to Ollama. If Ollama is offline, tries Moonshot.
+
+Provider selection is score-based: an EWMA of latency and error rate,
+token cost and remaining budget decide which backend is best right now.
+Failing providers trip a circuit breaker that half-opens after a
+cooldown instead of being disabled for the rest of the process.
+
+Opt-in hedging (execute(..., hedge=True)) fires a backup request to the
+next-best provider once the primary exceeds its p95 latency, returns the
+first success and cancels the loser — bounded by a per-call cost cap.
+
+execute_stream() relays tokens as they arrive (SSE / WebSocket), failing
+over to the next provider only while no token has been sent yet.
 """
 
 import asyncio
@@ -15,10 +27,17 @@ import json
 import os
 import sys
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from antigravity.config import AGENTS, AgentConfig
+from antigravity.http_pool import aclose_all, get_async_client
+from antigravity.response_cache import get_response_cache, make_key
+
+
+LATENCY_SAMPLES = 100  # per provider, for p95
+HEDGE_MIN_SAMPLES = 10  # below this the configured default hedge delay is used
 
 
 # ─── Provider Status ────────────────────────────────────────────────
@@ -32,6 +51,18 @@ class ProviderStatus:
     avg_latency_ms: float = 0.0
     total_requests: int = 0
     total_tokens: int = 0
+    # Live scheduling signals
+    ewma_latency_ms: float = 0.0
+    ewma_error_rate: float = 0.0
+    error_updated_at: float = 0.0
+    cost_usd: float = 0.0
+    # Circuit breaker: closed → open (after failures) → half_open (after cooldown)
+    circuit: str = "closed"
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    # Recent latencies (ms) for the hedging delay
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
 
 
 @dataclass
@@ -61,6 +92,30 @@ class RouterConfig:
     max_retries: int = 2
     # Health check interval (seconds)
     health_check_interval: float = 300.0
+    # Scoring: USD per 1K tokens and optional per-provider budget (USD, None = unlimited)
+    cost_per_1k_tokens: dict[str, float] = field(
+        default_factory=lambda: {"gemini": 0.0004, "ollama": 0.0, "moonshot": 0.0005}
+    )
+    budget_usd: dict[str, Optional[float]] = field(default_factory=dict)
+    ewma_alpha: float = 0.3
+    # The error EWMA halves every N seconds without new results, so a provider
+    # that was failing drifts back into the ranking and gets its half-open probe
+    error_half_life_sec: float = 120.0
+    # Score weights: seconds of latency vs. error rate vs. cost. Cost is scaled
+    # to the most expensive provider, so cost_weight is what the priciest one pays.
+    latency_weight: float = 1.0
+    error_weight: float = 20.0
+    cost_weight: float = 0.5
+    # Bonus for the task-specific preferred provider; larger than cost_weight,
+    # so configured routing wins unless latency/errors are clearly worse
+    preference_bonus: float = 1.0
+    # Circuit breaker
+    breaker_failure_threshold: int = 3
+    breaker_cooldown_sec: float = 60.0
+    # Hedging: backup fires after the primary's p95 (clamped), max extra spend per call
+    hedge_default_delay_sec: float = 2.0
+    hedge_min_delay_sec: float = 0.25
+    hedge_max_cost_usd: float = 0.01
 
 
 class UnifiedRouter:
@@ -82,6 +137,8 @@ class UnifiedRouter:
         }
         self._gemini_client = None
         self._ollama_client = None
+        self.cache = get_response_cache()
+        self.hedge_stats = {"fired": 0, "backup_wins": 0, "cancelled": 0, "skipped_cost": 0}
 
         # Check for offline mode env var
         if os.getenv("OFFLINE_MODE", "").lower() in ("1", "true", "yes"):
@@ -110,7 +167,7 @@ class UnifiedRouter:
         if not self.config.offline_mode:
             try:
                 client = self._get_gemini_client()
-                available = await asyncio.to_thread(client.health_check)
+                available = await client.ahealth_check()
                 self.providers["gemini"].available = available
                 self.providers["gemini"].last_check = time.time()
                 results["gemini"] = available
@@ -121,7 +178,7 @@ class UnifiedRouter:
         # Check Ollama
         try:
             client = self._get_ollama_client()
-            available = await asyncio.to_thread(client.health_check)
+            available = await client.ahealth_check()
             self.providers["ollama"].available = available
             self.providers["ollama"].last_check = time.time()
             results["ollama"] = available
@@ -137,24 +194,138 @@ class UnifiedRouter:
 
         return results
 
-    def _select_provider(self, task_type: str = "code") -> str:
-        """Select the best available provider for a task."""
+    # ─── Scoring & Circuit Breaker ──────────────────────────────────
+    def _circuit_state(self, status: ProviderStatus) -> str:
+        """Breaker state as of now: an open circuit past its cooldown counts as half-open."""
+        if status.circuit == "open" and time.time() - status.opened_at >= self.config.breaker_cooldown_sec:
+            return "half_open"
+        return status.circuit
+
+    def _allow(self, provider: str) -> bool:
+        """Can this provider take a request right now (availability + breaker)? No side effects."""
+        status = self.providers.get(provider)
+        if status is None or not status.available:
+            return False
+        state = self._circuit_state(status)
+        if state == "open":
+            return False
+        if state == "half_open":
+            # Exactly one trial request while half-open
+            return not status.probe_in_flight
+        return True
+
+    def _claim(self, provider: str) -> bool:
+        """Reserve a provider for one call; a half-open one hands out its single probe.
+
+        Runs synchronously right after ranking, so no other execute() can
+        claim the same probe in between.
+        """
+        if not self._allow(provider):
+            return False
+        status = self.providers[provider]
+        if self._circuit_state(status) == "half_open":
+            status.circuit = "half_open"
+            status.probe_in_flight = True
+        return True
+
+    def _release(self, provider: str):
+        """Hand back a claimed probe that was not used (cancelled or abandoned call)."""
+        status = self.providers[provider]
+        if status.circuit == "half_open":
+            status.probe_in_flight = False
+
+    def _score(self, provider: str, task_type: Optional[str] = None) -> float:
+        """Lower is better. inf when the provider's budget is exhausted."""
+        cfg = self.config
+        status = self.providers[provider]
+        max_cost = max(cfg.cost_per_1k_tokens.values(), default=0.0)
+        relative_cost = cfg.cost_per_1k_tokens.get(provider, 0.0) / max_cost if max_cost else 0.0
+
+        budget = cfg.budget_usd.get(provider)
+        budget_factor = 1.0
+        if budget is not None:
+            remaining = budget - status.cost_usd
+            if remaining <= 0:
+                return float("inf")
+            # Cost matters more the closer we get to the limit
+            budget_factor = 1.0 / max(remaining / budget, 0.05)
+
+        score = (
+            cfg.latency_weight * status.ewma_latency_ms / 1000.0
+            + cfg.error_weight * self._error_rate(status)
+            + cfg.cost_weight * relative_cost * budget_factor
+        )
+        # Tie-breaker for unmeasured providers: static priority order
+        if provider in cfg.provider_priority:
+            score += 0.001 * cfg.provider_priority.index(provider)
+        if task_type and cfg.task_routing.get(task_type) == provider:
+            score -= cfg.preference_bonus
+        return score
+
+    def _error_rate(self, status: ProviderStatus, now: Optional[float] = None) -> float:
+        """Error EWMA, decayed by the time since the last recorded result."""
+        if not status.ewma_error_rate:
+            return 0.0
+        elapsed = (now or time.time()) - status.error_updated_at
+        return status.ewma_error_rate * 0.5 ** (max(elapsed, 0.0) / self.config.error_half_life_sec)
+
+    def _rank_providers(self, task_type: Optional[str] = None, exclude: Optional[list[str]] = None) -> list[str]:
+        """Allowed providers, best score first."""
+        exclude = exclude or []
+        candidates = [
+            name for name in self.providers
+            if name not in exclude and self._allow(name)
+        ]
+        scored = [(self._score(name, task_type), name) for name in candidates]
+        return [name for score, name in sorted(scored) if score != float("inf")]
+
+    def _record_success(self, provider: str, latency_ms: float, tokens: int):
+        cfg = self.config
+        status = self.providers[provider]
+        alpha = cfg.ewma_alpha
+        status.ewma_latency_ms = (
+            latency_ms if status.ewma_latency_ms == 0.0
+            else alpha * latency_ms + (1 - alpha) * status.ewma_latency_ms
+        )
+        now = time.time()
+        status.ewma_error_rate = (1 - alpha) * self._error_rate(status, now)
+        status.error_updated_at = now
+        status.cost_usd += tokens / 1000 * cfg.cost_per_1k_tokens.get(provider, 0.0)
+        status.consecutive_failures = 0
+        status.circuit = "closed"
+        status.probe_in_flight = False
+
+    def _record_failure(self, provider: str):
+        cfg = self.config
+        status = self.providers[provider]
+        status.error_count += 1
+        now = time.time()
+        status.ewma_error_rate = cfg.ewma_alpha + (1 - cfg.ewma_alpha) * self._error_rate(status, now)
+        status.error_updated_at = now
+        status.consecutive_failures += 1
+        status.probe_in_flight = False
+        if status.circuit == "half_open" or status.consecutive_failures >= cfg.breaker_failure_threshold:
+            status.circuit = "open"
+            status.opened_at = time.time()
+
+    def _select_provider(self, task_type: str = "code", exclude: Optional[list[str]] = None) -> Optional[str]:
+        """Select and claim the best-scoring available provider for a task.
+
+        The first pick falls back to Ollama; failover picks (exclude given)
+        return None once no untried provider is left.
+        """
         if self.config.offline_mode:
+            if exclude:
+                return None
+            self._claim("ollama")
             return "ollama"
 
-        # Check task-specific preference
-        preferred = self.config.task_routing.get(task_type)
-
-        if preferred and self.providers.get(preferred, ProviderStatus(name="")).available:
-            return preferred
-
-        # Fall through priority list
-        for provider in self.config.provider_priority:
-            if self.providers.get(provider, ProviderStatus(name="")).available:
-                return provider
+        for name in self._rank_providers(task_type, exclude=exclude):
+            if self._claim(name):
+                return name
 
         # Last resort
-        return "ollama"
+        return None if exclude else "ollama"
 
     def _route_to_agent(self, task: dict[str, Any]) -> str:
         """Route task to the appropriate agent role."""
@@ -179,6 +350,9 @@ class UnifiedRouter:
         agent_key: str = "coder",
         context: Optional[str] = None,
         task_type: Optional[str] = None,
+        use_cache: bool = True,
+        hedge: bool = False,
+        hedge_max_cost_usd: Optional[float] = None,
     ) -> dict[str, Any]:
         """
         Execute a task using the best available provider.
@@ -188,6 +362,11 @@ class UnifiedRouter:
             agent_key: Agent role (architect, fixer, coder, qa)
             context: Optional context (file contents, errors, etc.)
             task_type: Optional task type for routing (overrides agent_key)
+            use_cache: Serve/store low-temperature calls from the response cache
+            hedge: Fire a backup request if the primary is slower than its p95
+                (for latency-critical interactive calls)
+            hedge_max_cost_usd: Max estimated spend of the backup request
+                (default: config.hedge_max_cost_usd)
 
         Returns:
             dict with: content, model, provider, usage, success
@@ -197,8 +376,26 @@ class UnifiedRouter:
             raise ValueError(f"Unknown agent: {agent_key}. Available: {list(AGENTS.keys())}")
 
         effective_type = task_type or agent.role
-        provider = self._select_provider(effective_type)
 
+        # One provider-independent key: whichever provider (or hedge backup)
+        # answered, the next identical request is served from the cache
+        messages = self._build_messages(agent, prompt, context)
+        cache_enabled = use_cache and self.cache.cacheable(agent.temperature)
+        cache_key = None
+        if cache_enabled:
+            cache_key = make_key("router", agent.model, messages, agent.temperature, agent.max_tokens)
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return {
+                    **cached,
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    "provider": cached.get("source", "cache"),
+                    "latency_ms": 0.0,
+                    "success": True,
+                    "cached": True,
+                }
+
+        provider = self._select_provider(effective_type)
         print(f"🔀 Router → {provider.upper()} | Agent: {agent.name} | Task: {effective_type}")
 
         # Try with retries and failover
@@ -207,48 +404,39 @@ class UnifiedRouter:
 
         for attempt in range(self.config.max_retries + 1):
             if provider in tried_providers and attempt > 0:
-                # Find next available provider
-                for next_p in self.config.provider_priority:
-                    if next_p not in tried_providers and self.providers.get(next_p, ProviderStatus(name="")).available:
-                        provider = next_p
-                        break
-                else:
+                # Next-best provider that has not been tried yet
+                provider = self._select_provider(effective_type, exclude=tried_providers)
+                if provider is None:
                     break  # No more providers
 
             tried_providers.append(provider)
 
-            try:
-                start = time.time()
-
-                if provider == "gemini":
-                    result = await self._execute_gemini(agent, prompt, context)
-                elif provider == "ollama":
-                    result = await self._execute_ollama(agent, prompt, context)
-                elif provider == "moonshot":
-                    result = await self._execute_moonshot(agent, prompt, context)
-                else:
-                    raise ValueError(f"Unknown provider: {provider}")
-
-                elapsed = (time.time() - start) * 1000
-                status = self.providers[provider]
-                status.total_requests += 1
-                status.total_tokens += result.get("usage", {}).get("total_tokens", 0)
-                status.avg_latency_ms = (
-                    (status.avg_latency_ms * (status.total_requests - 1) + elapsed)
-                    / status.total_requests
+            backup = None
+            if hedge:
+                backup = self._hedge_partner(
+                    provider, effective_type, tried_providers, agent, prompt, context,
+                    self.config.hedge_max_cost_usd if hedge_max_cost_usd is None else hedge_max_cost_usd,
                 )
 
-                result["provider"] = provider
-                result["latency_ms"] = round(elapsed, 1)
-                result["success"] = True
+            try:
+                if backup:
+                    result = await self._execute_hedged(provider, backup, agent, prompt, context)
+                else:
+                    result = await self._call_provider(provider, agent, prompt, context)
+
+                if cache_key and result.get("content"):
+                    await self.cache.aput(
+                        cache_key,
+                        {**result, "source": result["provider"]},
+                        provider=result["provider"],
+                        model=result.get("model", ""),
+                    )
                 return result
 
             except (ConnectionError, TimeoutError, PermissionError) as exc:
                 error_msg = f"{provider}: {exc}"
                 errors.append(error_msg)
                 print(f"⚠️  {error_msg}")
-                self.providers[provider].error_count += 1
-                self.providers[provider].available = False
                 continue
 
             except Exception as exc:
@@ -266,36 +454,253 @@ class UnifiedRouter:
             "errors": errors,
         }
 
+    async def execute_stream(
+        self,
+        prompt: str,
+        agent_key: str = "coder",
+        context: Optional[str] = None,
+        task_type: Optional[str] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream a task token by token from the best available provider.
+
+        Yields event dicts (see antigravity/token_stream.py): one "meta", then
+        "token" events, then "done" — or "error" when every provider failed.
+        Failover happens only before the first token; after that an error
+        ends the stream.
+        """
+        agent = AGENTS.get(agent_key)
+        if not agent:
+            raise ValueError(f"Unknown agent: {agent_key}. Available: {list(AGENTS.keys())}")
+
+        effective_type = task_type or agent.role
+        errors: list[str] = []
+        tried_providers: list[str] = []
+        provider = self._select_provider(effective_type)
+
+        for _ in range(self.config.max_retries + 1):
+            if provider in tried_providers:
+                provider = self._select_provider(effective_type, exclude=tried_providers)
+                if provider is None:
+                    break
+            tried_providers.append(provider)
+
+            status = self.providers[provider]
+
+            start = time.time()
+            ttft_ms = None
+            chars = 0
+            try:
+                async for chunk in self._stream_provider(provider, agent, prompt, context):
+                    if ttft_ms is None:
+                        ttft_ms = (time.time() - start) * 1000
+                        yield {"type": "meta", "provider": provider, "model": self._model_for(provider, agent), "agent": agent_key}
+                    chars += len(chunk)
+                    yield {"type": "token", "content": chunk}
+            except (asyncio.CancelledError, GeneratorExit):
+                # Cancelled, or the consumer stopped reading — not the provider's fault
+                self._release(provider)
+                raise
+            except Exception as exc:
+                self._record_failure(provider)
+                errors.append(f"{provider}: {exc}")
+                if ttft_ms is not None:
+                    # Tokens already reached the client — cannot switch providers mid-answer
+                    yield {"type": "error", "provider": provider, "errors": errors}
+                    return
+                continue
+
+            elapsed = (time.time() - start) * 1000
+            tokens = chars // 4  # Streams carry no usage block — rough estimate
+            status.total_requests += 1
+            status.total_tokens += tokens
+            status.avg_latency_ms = (
+                (status.avg_latency_ms * (status.total_requests - 1) + elapsed)
+                / status.total_requests
+            )
+            status.latencies.append(elapsed)
+            self._record_success(provider, elapsed, tokens)
+            if ttft_ms is None:
+                yield {"type": "meta", "provider": provider, "model": self._model_for(provider, agent), "agent": agent_key}
+            yield {
+                "type": "done",
+                "provider": provider,
+                "ttft_ms": round(ttft_ms or elapsed, 1),
+                "latency_ms": round(elapsed, 1),
+            }
+            return
+
+        yield {"type": "error", "errors": errors or ["No provider available"]}
+
+    def _model_for(self, provider: str, agent: AgentConfig) -> str:
+        if provider == "gemini":
+            return self._get_gemini_client()._get_model_name(agent)
+        if provider == "moonshot":
+            return "kimi-k2.5"
+        return agent.model
+
+    def _stream_provider(
+        self, provider: str, agent: AgentConfig, prompt: str, context: Optional[str]
+    ) -> AsyncIterator[str]:
+        if provider == "gemini":
+            return self._get_gemini_client().achat_stream(agent, prompt, context)
+        if provider == "ollama":
+            return self._get_ollama_client().achat_stream(agent, prompt, context)
+        if provider == "moonshot":
+            return self._stream_moonshot(agent, prompt, context)
+        raise ValueError(f"Unknown provider: {provider}")
+
+    async def _call_provider(
+        self, provider: str, agent: AgentConfig, prompt: str, context: Optional[str]
+    ) -> dict[str, Any]:
+        """Run one provider call and update its stats / breaker. Raises on failure.
+
+        The caller has claimed the provider (_select_provider), so a
+        half-open provider's probe is already marked in flight.
+        """
+        status = self.providers[provider]
+
+        start = time.time()
+        try:
+            if provider == "gemini":
+                result = await self._execute_gemini(agent, prompt, context)
+            elif provider == "ollama":
+                result = await self._execute_ollama(agent, prompt, context)
+            elif provider == "moonshot":
+                result = await self._execute_moonshot(agent, prompt, context)
+            else:
+                raise ValueError(f"Unknown provider: {provider}")
+        except asyncio.CancelledError:
+            # Lost a hedge race — not the provider's fault
+            self._release(provider)
+            raise
+        except Exception:
+            self._record_failure(provider)
+            raise
+
+        elapsed = (time.time() - start) * 1000
+        tokens = result.get("usage", {}).get("total_tokens", 0)
+        status.total_requests += 1
+        status.total_tokens += tokens
+        status.avg_latency_ms = (
+            (status.avg_latency_ms * (status.total_requests - 1) + elapsed)
+            / status.total_requests
+        )
+        status.latencies.append(elapsed)
+        self._record_success(provider, elapsed, tokens)
+
+        result["provider"] = provider
+        result["latency_ms"] = round(elapsed, 1)
+        result["success"] = True
+        return result
+
+    # ─── Hedging ────────────────────────────────────────────────────
+    def _hedge_delay(self, provider: str) -> float:
+        """Seconds to wait for the primary before firing the backup (its p95)."""
+        cfg = self.config
+        samples = self.providers[provider].latencies
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return cfg.hedge_default_delay_sec
+        ordered = sorted(samples)
+        p95_sec = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] / 1000
+        return max(cfg.hedge_min_delay_sec, p95_sec)
+
+    def _hedge_partner(
+        self,
+        primary: str,
+        task_type: str,
+        tried: list[str],
+        agent: AgentConfig,
+        prompt: str,
+        context: Optional[str],
+        max_cost_usd: float,
+    ) -> Optional[str]:
+        """Best other provider whose estimated cost for this call fits the cap."""
+        if self.config.offline_mode:
+            return None
+        # Rough token estimate: ~4 chars per token in, max_tokens out
+        est_tokens = (len(prompt) + len(context or "") + len(agent.system_prompt)) / 4 + agent.max_tokens
+        for candidate in self._rank_providers(task_type, exclude=tried + [primary]):
+            if self._circuit_state(self.providers[candidate]) != "closed":
+                continue  # half-open: its single probe is not spent on a backup request
+            est_cost = est_tokens / 1000 * self.config.cost_per_1k_tokens.get(candidate, 0.0)
+            if est_cost <= max_cost_usd:
+                return candidate
+            self.hedge_stats["skipped_cost"] += 1
+        return None
+
+    async def _execute_hedged(
+        self, primary: str, backup: str, agent: AgentConfig, prompt: str, context: Optional[str]
+    ) -> dict[str, Any]:
+        """
+        Race primary against a delayed backup; first success wins, the loser is cancelled.
+        """
+        primary_task = asyncio.create_task(self._call_provider(primary, agent, prompt, context))
+        tasks = {primary_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary))
+            if done:
+                # Primary finished (or failed fast) before the hedge delay — normal path
+                return primary_task.result()
+
+            self.hedge_stats["fired"] += 1
+            print(f"🪁 Hedge → {backup.upper()} ({primary} slower than p95)")
+            backup_task = asyncio.create_task(self._call_provider(backup, agent, prompt, context))
+            tasks.add(backup_task)
+
+            pending = set(tasks)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup_task:
+                            self.hedge_stats["backup_wins"] += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            losers = [t for t in tasks if not t.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                self.hedge_stats["cancelled"] += len(losers)
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    @staticmethod
+    def _build_messages(agent: AgentConfig, prompt: str, context: Optional[str]) -> list[dict[str, str]]:
+        """OpenAI-style message list shared by all providers (and the cache key)."""
+        messages = [
+            {"role": "system", "content": agent.system_prompt},
+        ]
+        if context:
+            messages.append({"role": "user", "content": f"KONTEXT:\n```\n{context}\n```"})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
     async def _execute_gemini(
         self, agent: AgentConfig, prompt: str, context: Optional[str]
     ) -> dict[str, Any]:
         """Execute via Gemini API."""
         client = self._get_gemini_client()
-        return await asyncio.to_thread(client.chat, agent, prompt, context)
+        return await client.achat(agent, prompt, context)
 
     async def _execute_ollama(
         self, agent: AgentConfig, prompt: str, context: Optional[str]
     ) -> dict[str, Any]:
         """Execute via local Ollama."""
         client = self._get_ollama_client()
-        return await asyncio.to_thread(client.chat, agent, prompt, context)
+        return await client.achat(agent, prompt, context)
 
     async def _execute_moonshot(
         self, agent: AgentConfig, prompt: str, context: Optional[str]
     ) -> dict[str, Any]:
         """Execute via Moonshot/Kimi API (OpenAI-compatible)."""
-        import httpx
-
         api_key = os.getenv("MOONSHOT_API_KEY", "")
         if not api_key:
             raise ConnectionError("MOONSHOT_API_KEY not set")
 
-        messages = [
-            {"role": "system", "content": agent.system_prompt},
-        ]
-        if context:
-            messages.append({"role": "user", "content": f"KONTEXT:\n```\n{context}\n```"})
-        messages.append({"role": "user", "content": prompt})
+        messages = self._build_messages(agent, prompt, context)
 
         payload = {
             "model": "kimi-k2.5",
@@ -304,17 +709,17 @@ class UnifiedRouter:
             "max_tokens": agent.max_tokens,
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                "https://api.moonshot.ai/v1/chat/completions",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await get_async_client().post(
+            "https://api.moonshot.ai/v1/chat/completions",
+            json=payload,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=120.0,
+        )
+        response.raise_for_status()
+        data = response.json()
 
         content = data["choices"][0]["message"]["content"]
         usage = data.get("usage", {})
@@ -330,6 +735,43 @@ class UnifiedRouter:
             "raw_response": data,
         }
 
+    async def _stream_moonshot(
+        self, agent: AgentConfig, prompt: str, context: Optional[str]
+    ) -> AsyncIterator[str]:
+        """Stream via Moonshot/Kimi API (OpenAI-compatible SSE)."""
+        from antigravity.ollama_client import OllamaClient
+
+        api_key = os.getenv("MOONSHOT_API_KEY", "")
+        if not api_key:
+            raise ConnectionError("MOONSHOT_API_KEY not set")
+
+        payload = {
+            "model": "kimi-k2.5",
+            "messages": self._build_messages(agent, prompt, context),
+            "temperature": agent.temperature,
+            "max_tokens": agent.max_tokens,
+            "stream": True,
+        }
+
+        async with get_async_client().stream(
+            "POST",
+            "https://api.moonshot.ai/v1/chat/completions",
+            json=payload,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=120.0,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # Same OpenAI chunk format as Ollama's /v1 endpoint
+                content = OllamaClient._parse_stream_line(line)
+                if content is None:
+                    break
+                if content:
+                    yield content
+
     async def run_swarm(self, tasks: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Run multiple tasks in parallel across providers."""
         print(f"\n🚀 Unified Swarm: {len(tasks)} tasks across all providers...")
@@ -360,7 +802,11 @@ class UnifiedRouter:
         """Get a formatted status report of all providers."""
         lines = ["═" * 50, "🔀 UNIFIED ROUTER STATUS", "═" * 50]
         for name, status in self.providers.items():
-            icon = "🟢" if status.available else "🔴"
+            circuit = self._circuit_state(status)
+            icon = "🟢" if status.available and circuit == "closed" else (
+                "🟡" if status.available and circuit == "half_open" else "🔴"
+            )
+            score = self._score(name)
             lines.append(
                 f"  {icon} {name:12s} | "
                 f"Requests: {status.total_requests:4d} | "
@@ -368,9 +814,25 @@ class UnifiedRouter:
                 f"Avg: {status.avg_latency_ms:.0f}ms | "
                 f"Tokens: {status.total_tokens:,}"
             )
+            lines.append(
+                f"     {'':12s} | "
+                f"Score: {score:.3f} | "
+                f"EWMA: {status.ewma_latency_ms:.0f}ms | "
+                f"Err: {self._error_rate(status):.0%} | "
+                f"Cost: ${status.cost_usd:.4f} | "
+                f"Circuit: {circuit}"
+            )
         mode = "🔒 OFFLINE" if self.config.offline_mode else "🌐 ONLINE"
         lines.append(f"\n  Mode: {mode}")
-        lines.append(f"  Priority: {' → '.join(self.config.provider_priority)}")
+        lines.append(f"  Priority: {' → '.join(self.config.provider_priority)} (tie-breaker)")
+        ranked = self._rank_providers()
+        lines.append(f"  Ranking: {' → '.join(ranked) if ranked else 'none available'}")
+        lines.append(f"  Cache: {self.cache.summary()}")
+        hs = self.hedge_stats
+        lines.append(
+            f"  Hedging: fired {hs['fired']} | backup wins {hs['backup_wins']} | "
+            f"cancelled {hs['cancelled']} | over cost cap {hs['skipped_cost']}"
+        )
         lines.append("═" * 50)
         return "\n".join(lines)
 
@@ -380,6 +842,13 @@ class UnifiedRouter:
 # ═══════════════════════════════════════════════════════════════════
 
 async def main() -> None:
+    try:
+        await _run_cli()
+    finally:
+        await aclose_all()
+
+
+async def _run_cli() -> None:
     router = UnifiedRouter()
 
     if len(sys.argv) < 2:
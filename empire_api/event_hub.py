@@ -0,0 +1,189 @@
+"""
+EVENT HUB — pub/sub fan-out for the Empire API WebSocket clients.
+
+Broadcasts used to await ws.send_json() for every client in turn inside the
+request handler, so one slow phone connection stalled the HTTP response for
+everyone, and sockets that died without a clean close were never removed.
+
+Now:
+  - publish() is sync and O(1): it appends to the hub inbox and returns
+  - one dispatcher task serializes each event once and hands it to the
+    subscribers of its topic
+  - every client has a bounded queue and its own writer task; a full
+    queue drops the oldest event (counted per client)
+  - a failed or timed-out send closes that client and unsubscribes it
+  - the writer task is the only sender on its socket: per-client frames
+    (token streams, control replies) go through Subscriber.send(), which
+    waits for queue room instead of dropping
+
+Topics: actions, health, swarm, logs, echo. Clients subscribe to all of
+them on connect and narrow it down with
+    {"type": "subscribe", "topics": ["health"]}  /  {"type": "unsubscribe", ...}
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+TOPICS = ("actions", "health", "swarm", "logs", "echo")
+CLIENT_QUEUE_SIZE = 256
+INBOX_SIZE = 4096
+SEND_TIMEOUT_SEC = 10.0
+
+
+class Subscriber:
+    """One WebSocket client: topic set, bounded queue, writer task."""
+
+    def __init__(self, websocket: WebSocket, topics: Iterable[str], queue_size: int):
+        self.websocket = websocket
+        self.topics: Set[str] = set(topics)
+        self.queue: Deque[str] = deque(maxlen=queue_size)
+        self.dropped = 0
+        self.sent = 0
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._room = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def put(self, text: str) -> None:
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1  # deque(maxlen) drops the oldest on append
+        self.queue.append(text)
+        self._wakeup.set()
+
+    async def send(self, message) -> bool:
+        """Queue a frame for this client only. Waits for room (never drops); False once closed."""
+        text = message if isinstance(message, str) else json.dumps(message, default=str)
+        while len(self.queue) >= self.queue.maxlen and not self.closed:
+            self._room.clear()
+            await self._room.wait()
+        if self.closed:
+            return False
+        self.put(text)
+        return True
+
+    async def _write(self, hub: "EventHub") -> None:
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self.queue:
+                    text = self.queue.popleft()
+                    self._room.set()
+                    await asyncio.wait_for(self.websocket.send_text(text), timeout=SEND_TIMEOUT_SEC)
+                    self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            hub.unsubscribe(self)  # dead or stalled connection
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+
+
+class EventHub:
+    """Topic-indexed subscribers, fed by one dispatcher task."""
+
+    def __init__(self, queue_size: int = CLIENT_QUEUE_SIZE, inbox_size: int = INBOX_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscriber] = set()
+        self._by_topic: Dict[str, Set[Subscriber]] = {topic: set() for topic in TOPICS}
+        self._inbox: Deque[Tuple[str, object]] = deque(maxlen=inbox_size)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.published = 0
+        self.inbox_dropped = 0
+
+    # ── Subscriptions ──
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str] = TOPICS) -> Subscriber:
+        sub = Subscriber(websocket, (), self.queue_size)
+        self.subscribers.add(sub)
+        self.set_topics(sub, topics, add=True)
+        sub._writer = asyncio.create_task(sub._write(self))
+        return sub
+
+    def set_topics(self, sub: Subscriber, topics: Iterable[str], add: bool) -> None:
+        """Add (add=True) or remove topics for one client; unknown topics are ignored."""
+        for topic in topics:
+            members = self._by_topic.get(topic)
+            if members is None:
+                continue
+            if add:
+                sub.topics.add(topic)
+                members.add(sub)
+            else:
+                sub.topics.discard(topic)
+                members.discard(sub)
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        if sub.closed:
+            return
+        sub.closed = True
+        sub._room.set()  # wake send() waiters
+        self.subscribers.discard(sub)
+        for members in self._by_topic.values():
+            members.discard(sub)
+        current = asyncio.current_task()
+        if sub._writer is not None and sub._writer is not current:
+            sub._writer.cancel()
+
+    # ── Publishing ──
+    def publish(self, topic: str, message) -> None:
+        """Queue a dict (sent as JSON) or str for all subscribers of `topic`. Never blocks."""
+        if topic not in self._by_topic:
+            raise ValueError(f"Unknown topic: {topic}")
+        if len(self._inbox) == self._inbox.maxlen:
+            self.inbox_dropped += 1
+        self._inbox.append((topic, message))
+        self.published += 1
+        self._ensure_dispatcher()
+        self._wakeup.set()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._inbox:
+                topic, message = self._inbox.popleft()
+                members = self._by_topic[topic]
+                if not members:
+                    continue
+                text = message if isinstance(message, str) else json.dumps(message, default=str)
+                for sub in members:
+                    sub.put(text)
+
+    # ── Lifecycle ──
+    def start(self) -> None:
+        self._ensure_dispatcher()
+
+    async def stop(self) -> None:
+        tasks = [sub._writer for sub in self.subscribers if sub._writer is not None]
+        for sub in list(self.subscribers):
+            self.unsubscribe(sub)
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            tasks.append(self._dispatcher)
+            self._dispatcher = None
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self.subscribers),
+            "published": self.published,
+            "inbox_pending": len(self._inbox),
+            "inbox_dropped": self.inbox_dropped,
+            "topics": {topic: len(members) for topic, members in self._by_topic.items()},
+            "per_client": [
+                {"topics": sorted(sub.topics), "queued": len(sub.queue), "sent": sub.sent, "dropped": sub.dropped}
+                for sub in self.subscribers
+            ],
+        }
@@ -0,0 +1,228 @@
+"""
+HEALTH MONITOR — background service probes for the Empire API.
+
+/api/health used to probe every service one after another on each request,
+so a dashboard refresh waited for the sum of all probe timeouts. The
+monitor probes all services concurrently on a schedule and keeps the
+result in memory; endpoints read the prebuilt snapshot.
+
+Per service: status, latency, last check, last status change (+ details).
+Status changes are reported to on_change listeners (server → /ws push).
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from antigravity.http_pool import get_async_client
+
+PROBE_INTERVAL_SEC = float(os.environ.get("HEALTH_PROBE_INTERVAL", "15"))
+GITHUB_PROBE_INTERVAL_SEC = 120.0  # API rate limit: 60 req/h unauthenticated, 5000 with token
+PROBE_TIMEOUT_SEC = 3.0
+
+
+@dataclass
+class ServiceHealth:
+    status: str = "unknown"  # active | offline | unknown | no_token
+    latency_ms: Optional[float] = None
+    checked_at: Optional[float] = None
+    changed_at: Optional[float] = None
+    details: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        data = {k: v for k, v in asdict(self).items() if k != "details"}
+        data.update(self.details)
+        return data
+
+
+# (status, details) for one service
+ProbeFn = Callable[[], Awaitable[tuple]]
+ChangeListener = Callable[[str, ServiceHealth, str], Awaitable[None]]
+
+
+# ── Probes ──
+async def _http_json(url: str, timeout: float = PROBE_TIMEOUT_SEC, headers: Optional[dict] = None):
+    r = await get_async_client().get(url, timeout=timeout, headers=headers)
+    r.raise_for_status()
+    return r.json()
+
+
+async def _command_ok(*cmd: str, expect: Optional[str] = None) -> bool:
+    """Run a CLI probe (redis-cli, pg_isready) without blocking the event loop."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=PROBE_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return False
+    if expect is not None:
+        return stdout.decode().strip() == expect
+    return proc.returncode == 0
+
+
+async def probe_ollama():
+    data = await _http_json("http://localhost:11434/api/tags")
+    return "active", {"models": [m["name"] for m in data.get("models", [])]}
+
+
+async def probe_crm():
+    return "active", {"data": await _http_json("http://localhost:3500/api/stats")}
+
+
+async def probe_redis():
+    return ("active" if await _command_ok("redis-cli", "ping", expect="PONG") else "offline"), {}
+
+
+async def probe_postgresql():
+    return ("active" if await _command_ok("pg_isready") else "offline"), {}
+
+
+async def probe_openclaw():
+    await get_async_client().get("http://localhost:18789/health", timeout=PROBE_TIMEOUT_SEC)
+    return "active", {}
+
+
+def github_probe(owner: str, repo: str, token: str) -> ProbeFn:
+    async def probe():
+        if not token:
+            return "no_token", {}
+        data = await _http_json(
+            f"https://api.github.com/repos/{owner}/{repo}/actions/runs?per_page=5",
+            timeout=5.0,
+            headers={"Authorization": f"token {token}"},
+        )
+        runs = [
+            {"name": r["name"], "status": r["status"], "conclusion": r.get("conclusion")}
+            for r in data.get("workflow_runs", [])
+        ]
+        return "active", {"recent_runs": runs}
+
+    return probe
+
+
+def brain_probe(brain_dir: Path) -> ProbeFn:
+    async def probe():
+        brains = list(brain_dir.glob("*.md")) if brain_dir.exists() else []
+        return "active", {"brains": len(brains)}
+
+    return probe
+
+
+# ── Monitor ──
+@dataclass
+class _Service:
+    probe: ProbeFn
+    interval: float
+    offline_status: str = "offline"  # status when the probe raises
+    offline_details: dict = field(default_factory=dict)
+    next_due: float = 0.0
+
+
+class HealthMonitor:
+    """Concurrent scheduled probes → in-memory snapshot + change events."""
+
+    def __init__(self, interval: float = PROBE_INTERVAL_SEC):
+        self.interval = interval
+        self.services: Dict[str, _Service] = {}
+        self.health: Dict[str, ServiceHealth] = {}
+        self._listeners: List[ChangeListener] = []
+        self._snapshot: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._round: Optional[asyncio.Task] = None
+
+    def add(self, name: str, probe: ProbeFn, interval: Optional[float] = None, **offline) -> None:
+        """Register a service. offline_status/offline_details: reported when the probe fails."""
+        self.services[name] = _Service(probe, interval or self.interval, **offline)
+        self.health[name] = ServiceHealth()
+
+    def on_change(self, listener: ChangeListener) -> None:
+        """listener(name, health, previous_status) — awaited on every status change."""
+        self._listeners.append(listener)
+
+    # ── Probing ──
+    async def _probe(self, name: str, service: _Service) -> None:
+        started = time.monotonic()
+        try:
+            status, details = await asyncio.wait_for(service.probe(), timeout=PROBE_TIMEOUT_SEC + 3)
+        except Exception:
+            status, details = service.offline_status, dict(service.offline_details)
+        now = time.time()
+        health = self.health[name]
+        previous = health.status
+        health.latency_ms = round((time.monotonic() - started) * 1000, 1)
+        health.checked_at = now
+        health.details = details
+        if status != previous:
+            health.status = status
+            health.changed_at = now
+            for listener in self._listeners:
+                try:
+                    await listener(name, health, previous)
+                except Exception as e:
+                    print(f"Health listener error: {e}")
+
+    async def probe_all(self, only_due: bool = False) -> dict:
+        """Run (due) probes concurrently; concurrent callers share one round."""
+        if self._round is not None and not self._round.done():
+            await asyncio.shield(self._round)
+            return self.snapshot()
+        now = time.monotonic()
+        due = {
+            name: service for name, service in self.services.items()
+            if not only_due or service.next_due <= now
+        }
+        for service in due.values():
+            service.next_due = now + service.interval
+        self._round = asyncio.ensure_future(
+            asyncio.gather(*(self._probe(name, service) for name, service in due.items()))
+        )
+        await asyncio.shield(self._round)
+        self._snapshot = None
+        return self.snapshot()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.probe_all(only_due=True)
+            except Exception as e:
+                print(f"Health monitor error: {e}")
+            next_due = min((s.next_due for s in self.services.values()), default=time.monotonic() + self.interval)
+            await asyncio.sleep(max(0.5, next_due - time.monotonic()))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # ── Reading ──
+    @property
+    def ready(self) -> bool:
+        return all(h.checked_at is not None for h in self.health.values())
+
+    def snapshot(self) -> dict:
+        """Health report in the /api/health format (cached until the next probe round)."""
+        if self._snapshot is None:
+            services = {name: health.to_dict() for name, health in self.health.items()}
+            active = sum(1 for h in self.health.values() if h.status == "active")
+            checked = [h.checked_at for h in self.health.values() if h.checked_at]
+            self._snapshot = {
+                "timestamp": datetime.now().isoformat(),
+                "checked_at": datetime.fromtimestamp(min(checked)).isoformat() if checked else None,
+                "overall": "healthy" if active >= 4 else "degraded" if active >= 2 else "critical",
+                "active_services": active,
+                "total_services": len(services),
+                "services": services,
+            }
+        return self._snapshot
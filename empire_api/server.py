@@ -4,9 +4,12 @@ Central nervous system connecting all Empire subsystems.
 Runs on your Mac, accessible from iPhone over local network.
 """
 
+import asyncio
 import json
 import os
 import subprocess
+import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -15,10 +18,29 @@ import httpx
 import uvicorn
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from antigravity.file_index import get_file_index
+from antigravity.http_pool import aclose_all
+from antigravity.token_stream import SSE_HEADERS, coalesced, sse_events
+from antigravity.unified_router import UnifiedRouter
+from empire_api.event_hub import TOPICS, EventHub, Subscriber
+from empire_api.health_monitor import (
+    GITHUB_PROBE_INTERVAL_SEC,
+    HealthMonitor,
+    ServiceHealth,
+    brain_probe,
+    github_probe,
+    probe_crm,
+    probe_ollama,
+    probe_openclaw,
+    probe_postgresql,
+    probe_redis,
+)
+
 app = FastAPI(title="AI Empire Control API", version="1.0.0")
 
 # CORS — allow iPhone + any local device
@@ -43,8 +65,31 @@ GITHUB_OWNER = "mauricepfeifer-ctrl"
 GITHUB_REPO = "AIEmpire-Core"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
 
-# ── WebSocket connections ──
-active_connections: list[WebSocket] = []
+# ── WebSocket fan-out (per-client queues + writer tasks) ──
+event_hub = EventHub()
+
+
+# ── Health Monitor (probes all services concurrently in the background) ──
+health_monitor = HealthMonitor()
+health_monitor.add("ollama", probe_ollama, offline_details={"models": []})
+health_monitor.add("crm", probe_crm)
+health_monitor.add("redis", probe_redis)
+health_monitor.add("postgresql", probe_postgresql)
+health_monitor.add("openclaw", probe_openclaw)
+health_monitor.add(
+    "github_actions",
+    github_probe(GITHUB_OWNER, GITHUB_REPO, GITHUB_TOKEN),
+    interval=GITHUB_PROBE_INTERVAL_SEC,
+    offline_status="unknown",
+)
+health_monitor.add("brain_system", brain_probe(BRAIN_DIR))
+
+
+async def _push_health_change(name: str, health: ServiceHealth, previous: str):
+    event_hub.publish("health", {"type": "health_change", "service": name, "previous": previous, "data": health.to_dict()})
+
+
+health_monitor.on_change(_push_health_change)
 
 
 # ── Models ──
@@ -64,6 +109,46 @@ class NoteCreate(BaseModel):
     category: str = "general"
 
 
+class EventPublish(BaseModel):
+    topic: str
+    data: dict = {}
+
+
+class StreamRequest(BaseModel):
+    prompt: str
+    agent: str = "coder"
+    context: Optional[str] = None
+    task_type: Optional[str] = None
+
+
+# ── LLM Router (shared, health re-checked every health_check_interval) ──
+_router: Optional[UnifiedRouter] = None
+_router_checked_at = 0.0
+
+
+async def get_router() -> UnifiedRouter:
+    global _router, _router_checked_at
+    if _router is None:
+        _router = UnifiedRouter()
+    if time.time() - _router_checked_at > _router.config.health_check_interval:
+        await _router.check_providers()
+        _router_checked_at = time.time()
+    return _router
+
+
+@app.on_event("startup")
+async def start_health_monitor():
+    event_hub.start()
+    health_monitor.start()
+
+
+@app.on_event("shutdown")
+async def close_http_pools():
+    await health_monitor.stop()
+    await event_hub.stop()
+    await aclose_all()
+
+
 # ── Serve Mobile App ──
 if MOBILE_DIR.exists():
     app.mount("/app", StaticFiles(directory=str(MOBILE_DIR), html=True), name="mobile")
@@ -80,91 +165,11 @@ async def root():
 # SYSTEM STATUS
 # ══════════════════════════════════════
 @app.get("/api/health")
-async def health_check():
-    """Full system health check"""
-    checks = {}
-
-    # Ollama
-    try:
-        async with httpx.AsyncClient(timeout=3) as c:
-            r = await c.get("http://localhost:11434/api/tags")
-            models = r.json().get("models", [])
-            checks["ollama"] = {
-                "status": "active",
-                "models": [m["name"] for m in models],
-            }
-    except Exception:
-        checks["ollama"] = {"status": "offline", "models": []}
-
-    # CRM
-    try:
-        async with httpx.AsyncClient(timeout=3) as c:
-            r = await c.get("http://localhost:3500/api/stats")
-            checks["crm"] = {"status": "active", "data": r.json()}
-    except Exception:
-        checks["crm"] = {"status": "offline"}
-
-    # Redis
-    try:
-        result = subprocess.run(["redis-cli", "ping"], capture_output=True, text=True, timeout=3)
-        checks["redis"] = {"status": "active" if result.stdout.strip() == "PONG" else "offline"}
-    except Exception:
-        checks["redis"] = {"status": "offline"}
-
-    # PostgreSQL
-    try:
-        result = subprocess.run(["pg_isready"], capture_output=True, text=True, timeout=3)
-        checks["postgresql"] = {"status": "active" if result.returncode == 0 else "offline"}
-    except Exception:
-        checks["postgresql"] = {"status": "offline"}
-
-    # OpenClaw
-    try:
-        async with httpx.AsyncClient(timeout=3) as c:
-            r = await c.get("http://localhost:18789/health")
-            checks["openclaw"] = {"status": "active"}
-    except Exception:
-        checks["openclaw"] = {"status": "offline"}
-
-    # GitHub Actions
-    if GITHUB_TOKEN:
-        try:
-            async with httpx.AsyncClient(timeout=5) as c:
-                r = await c.get(
-                    f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/actions/runs?per_page=5",
-                    headers={"Authorization": f"token {GITHUB_TOKEN}"},
-                )
-                runs = r.json().get("workflow_runs", [])
-                checks["github_actions"] = {
-                    "status": "active",
-                    "recent_runs": [
-                        {
-                            "name": r["name"],
-                            "status": r["status"],
-                            "conclusion": r.get("conclusion"),
-                        }
-                        for r in runs
-                    ],
-                }
-        except Exception:
-            checks["github_actions"] = {"status": "unknown"}
-    else:
-        checks["github_actions"] = {"status": "no_token"}
-
-    # Brain System files
-    brains = list(BRAIN_DIR.glob("*.md")) if BRAIN_DIR.exists() else []
-    checks["brain_system"] = {"status": "active", "brains": len(brains)}
-
-    active = sum(1 for v in checks.values() if v.get("status") == "active")
-    total = len(checks)
-
-    return {
-        "timestamp": datetime.now().isoformat(),
-        "overall": "healthy" if active >= 4 else "degraded" if active >= 2 else "critical",
-        "active_services": active,
-        "total_services": total,
-        "services": checks,
-    }
+async def health_check(refresh: bool = False):
+    """Full system health check (snapshot of the background probes; refresh=true probes now)"""
+    if refresh or not health_monitor.ready:
+        return await health_monitor.probe_all()
+    return health_monitor.snapshot()
 
 
 # ══════════════════════════════════════
@@ -295,7 +300,7 @@ async def trigger_action(req: ActionRequest):
     result = {"action": action, "timestamp": datetime.now().isoformat()}
 
     if action == "health_check":
-        return await health_check()
+        return await health_check(refresh=bool((req.params or {}).get("refresh")))
 
     elif action == "generate_content":
         # Trigger content generation via Ollama
@@ -441,16 +446,49 @@ async def trigger_action(req: ActionRequest):
     else:
         result["status"] = "unknown_action"
 
-    # Notify all WebSocket clients
-    for ws in active_connections:
-        try:
-            await ws.send_json({"type": "action_result", "data": result})
-        except Exception:
-            pass
+    # Notify all WebSocket clients (queued — never waits for slow sockets)
+    event_hub.publish("actions", {"type": "action_result", "data": result})
 
     return result
 
 
+# ══════════════════════════════════════
+# STREAMING — tokens as they arrive
+# ══════════════════════════════════════
+@app.post("/api/stream")
+async def stream_completion(req: StreamRequest):
+    """Relay LLM tokens via Server-Sent Events (meta → token… → done | error)"""
+    router = await get_router()
+    events = router.execute_stream(req.prompt, agent_key=req.agent, context=req.context, task_type=req.task_type)
+    return StreamingResponse(sse_events(coalesced(events)), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def _stream_to_websocket(subscriber: Subscriber, request: dict):
+    """Answer a {"type": "stream", "prompt": ...} WebSocket message token by token.
+
+    Frames go through the client's hub queue (its writer is the only sender on
+    the socket); while the client is slow, coalesced() merges pending tokens.
+    """
+    stream_id = request.get("id")
+    router = await get_router()
+    events = coalesced(
+        router.execute_stream(
+            str(request.get("prompt", "")),
+            agent_key=request.get("agent", "coder"),
+            context=request.get("context"),
+            task_type=request.get("task_type"),
+        )
+    )
+    try:
+        async for event in events:
+            if not await subscriber.send({"type": "stream", "id": stream_id, "event": event}):
+                break  # client gone
+    except ValueError as e:
+        await subscriber.send({"type": "stream", "id": stream_id, "event": {"type": "error", "errors": [str(e)]}})
+    finally:
+        await events.aclose()  # stops the provider stream
+
+
 # ══════════════════════════════════════
 # GITHUB ISSUES (as tasks)
 # ══════════════════════════════════════
@@ -576,21 +614,52 @@ async def create_note(note: NoteCreate):
 # ══════════════════════════════════════
 # WEBSOCKET — real-time updates
 # ══════════════════════════════════════
+@app.post("/api/events")
+async def publish_event(req: EventPublish):
+    """Publish to WebSocket subscribers (e.g. swarm progress, log lines from other processes)"""
+    if req.topic not in TOPICS:
+        raise HTTPException(400, f"Unknown topic {req.topic!r} (one of {', '.join(TOPICS)})")
+    event_hub.publish(req.topic, {"type": req.topic, "data": req.data})
+    return {"status": "queued", "topic": req.topic}
+
+
+@app.get("/api/events/stats")
+async def event_stats():
+    """Connected clients, queue depths and dropped events"""
+    return event_hub.stats()
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    active_connections.append(websocket)
+    subscriber = event_hub.subscribe(websocket)
+    streams: set[asyncio.Task] = set()
     try:
         while True:
             data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                message = None
+            if isinstance(message, dict) and message.get("type") == "stream":
+                # Token stream only to the requesting client; keep reading meanwhile
+                task = asyncio.create_task(_stream_to_websocket(subscriber, message))
+                streams.add(task)
+                task.add_done_callback(streams.discard)
+                continue
+            if isinstance(message, dict) and message.get("type") in ("subscribe", "unsubscribe"):
+                topics = message.get("topics") or []
+                event_hub.set_topics(subscriber, topics, add=message["type"] == "subscribe")
+                await subscriber.send({"type": "subscribed", "topics": sorted(subscriber.topics)})
+                continue
             # Echo back + broadcast
-            for ws in active_connections:
-                try:
-                    await ws.send_text(data)
-                except Exception:
-                    pass
+            event_hub.publish("echo", data)
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
+    finally:
+        event_hub.unsubscribe(subscriber)
+        for task in list(streams):
+            task.cancel()
 
 
 # ══════════════════════════════════════
@@ -599,11 +668,12 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.get("/api/system")
 async def system_info():
     """Get comprehensive system info"""
-    # Count files
-    total_files = sum(1 for _ in EMPIRE_ROOT.rglob("*") if _.is_file() and ".git" not in str(_))
-    total_py = sum(1 for _ in EMPIRE_ROOT.rglob("*.py") if ".git" not in str(_))
-    total_md = sum(1 for _ in EMPIRE_ROOT.rglob("*.md") if ".git" not in str(_))
-    total_js = sum(1 for _ in EMPIRE_ROOT.rglob("*.js") if ".git" not in str(_))
+    # Count files (incremental index: unchanged directories are not re-listed)
+    index = get_file_index()
+    await asyncio.to_thread(index.refresh_if_stale, 30, False)
+    counts = index.counters()
+    total_files = index.totals()["files"]
+    total_py, total_md, total_js = (counts.get(ext, {}).get("files", 0) for ext in (".py", ".md", ".js"))
 
     # Git info
     try:
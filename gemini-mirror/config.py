@@ -16,7 +16,8 @@ MEMORY_DIR = MIRROR_DIR / "memory"
 PROJECT_ROOT = MIRROR_DIR.parent
 
 # State-Dateien
-MIRROR_STATE_FILE = STATE_DIR / "mirror_state.json"
+MIRROR_STATE_FILE = STATE_DIR / "mirror_state.json"  # Legacy, wird beim ersten Start migriert
+MIRROR_STATE_DB = STATE_DIR / "mirror_state.db"
 VISION_STATE_FILE = STATE_DIR / "vision_state.json"
 SYNC_STATE_FILE = STATE_DIR / "sync_state.json"
 DUAL_BRAIN_STATE_FILE = STATE_DIR / "dual_brain_state.json"
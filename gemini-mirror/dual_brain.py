@@ -32,12 +32,22 @@ sys.path.insert(0, str(MIRROR_DIR))
 from config import (
     DUAL_BRAIN_STATE_FILE,
     DUAL_BRAIN_CONFIG,
+    MIRROR_STATE_DB,
+    MIRROR_STATE_FILE,
     PROJECT_ROOT,
-    STATE_DIR,
     OUTPUT_DIR,
 )
 from gemini_client import GeminiClient
 
+sys.path.append(str(PROJECT_ROOT))
+from workflow_system.state.store import (
+    COWORK_STATE_DB,
+    COWORK_STATE_JSON,
+    WORKFLOW_STATE_DB,
+    WORKFLOW_STATE_JSON,
+    load_snapshot,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [DUAL-BRAIN] %(levelname)s %(message)s",
@@ -349,13 +359,7 @@ class DualBrain:
         main_cowork = self._load_main_cowork()
 
         # Mirror Stats
-        mirror_state_file = STATE_DIR / "mirror_state.json"
-        mirror_state = {}
-        if mirror_state_file.exists():
-            try:
-                mirror_state = json.loads(mirror_state_file.read_text())
-            except json.JSONDecodeError:
-                pass
+        mirror_state = load_snapshot(MIRROR_STATE_DB, MIRROR_STATE_FILE)
 
         prompt = COMPETITIVE_PROMPT.format(
             main_cycles=main_state.get("cycle", 0),
@@ -437,22 +441,10 @@ class DualBrain:
             return None
 
     def _load_main_state(self) -> Dict:
-        main_file = PROJECT_ROOT / "workflow_system" / "state" / "current_state.json"
-        if main_file.exists():
-            try:
-                return json.loads(main_file.read_text())
-            except json.JSONDecodeError:
-                pass
-        return {}
+        return load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
 
     def _load_main_cowork(self) -> Dict:
-        cowork_file = PROJECT_ROOT / "workflow_system" / "state" / "cowork_state.json"
-        if cowork_file.exists():
-            try:
-                return json.loads(cowork_file.read_text())
-            except json.JSONDecodeError:
-                pass
-        return {}
+        return load_snapshot(COWORK_STATE_DB, COWORK_STATE_JSON)
 
     def _load_vision_context(self) -> str:
         from config import VISION_MEMORY_FILE
@@ -11,8 +11,10 @@ Fallback-Kette:
 import asyncio
 import json
 import logging
+import sys
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import aiohttp
@@ -24,6 +26,10 @@ from config import (
     RESOURCE_LIMITS,
 )
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from antigravity.http_pool import pooled_session
+from antigravity.response_cache import get_response_cache, make_key
+
 logger = logging.getLogger("gemini-client")
 
 
@@ -95,6 +101,7 @@ class GeminiClient:
         self.semaphore = asyncio.Semaphore(
             RESOURCE_LIMITS["max_concurrent_gemini_calls"]
         )
+        self.cache = get_response_cache()
 
     async def chat(
         self,
@@ -129,6 +136,38 @@ class GeminiClient:
         """
         start_time = time.time()
 
+        # Response-Cache fuer (nahezu) deterministische Calls
+        cache_key = None
+        if self.cache.cacheable(temperature):
+            provider = force_provider or ("auto_local" if use_local else "gemini")
+            cache_key = make_key(provider, model, messages, temperature, max_tokens)
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return {
+                    **cached,
+                    "cost_usd": 0.0,
+                    "latency_ms": int((time.time() - start_time) * 1000),
+                    "cached": True,
+                }
+
+        result = await self._route(
+            messages, model, temperature, max_tokens, use_local, force_provider, start_time
+        )
+        if cache_key and result.get("content"):
+            await self.cache.aput(cache_key, result, provider=result["source"], model=result["model"])
+        return result
+
+    async def _route(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        use_local: bool,
+        force_provider: Optional[str],
+        start_time: float,
+    ) -> Dict[str, Any]:
+        """Provider-Auswahl hinter chat()."""
         # Forced Provider
         if force_provider == "ollama":
             return await self._try_ollama(messages, temperature, start_time)
@@ -165,7 +204,7 @@ class GeminiClient:
             "stream": False,
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.ollama_url}/api/chat",
                     json=payload,
@@ -246,7 +285,7 @@ class GeminiClient:
             }
 
         async with self.semaphore:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     url,
                     json=payload,
@@ -30,13 +30,18 @@ sys.path.insert(0, str(MIRROR_DIR))
 from config import (
     STATE_DIR,
     OUTPUT_DIR,
+    MIRROR_STATE_DB,
     MIRROR_STATE_FILE,
+    PROJECT_ROOT,
     VISION_STATE_FILE,
     SYNC_STATE_FILE,
     DUAL_BRAIN_STATE_FILE,
     PERSONALITY_FILE,
 )
 
+sys.path.append(str(PROJECT_ROOT))
+from workflow_system.state.store import load_snapshot
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [GEMINI-EMPIRE] %(levelname)s %(message)s",
@@ -61,8 +66,8 @@ def show_full_status():
 
     # 1. Mirror Orchestrator
     print("┌─── MIRROR ORCHESTRATOR ───────────────────────────────────┐")
-    if MIRROR_STATE_FILE.exists():
-        state = json.loads(MIRROR_STATE_FILE.read_text())
+    state = load_snapshot(MIRROR_STATE_DB, MIRROR_STATE_FILE)
+    if state:
         print(f"│  Zyklus:       {state.get('cycle', 0):>5}                                │")
         print(f"│  Schritte:     {len(state.get('steps_completed', [])):>5}                                │")
         print(f"│  Patterns:     {len(state.get('patterns', [])):>5}                                │")
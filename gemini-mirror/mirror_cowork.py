@@ -31,12 +31,23 @@ from config import (
     STATE_DIR,
     OUTPUT_DIR,
     MEMORY_DIR,
+    MIRROR_STATE_DB,
+    MIRROR_STATE_FILE,
     PROJECT_ROOT,
     MODEL_ROUTING,
     VISION_MEMORY_FILE,
 )
 from gemini_client import GeminiClient
 
+sys.path.append(str(PROJECT_ROOT))
+from workflow_system.state.store import (
+    COWORK_STATE_DB,
+    COWORK_STATE_JSON,
+    WORKFLOW_STATE_DB,
+    WORKFLOW_STATE_JSON,
+    load_snapshot,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [MIRROR-COWORK] %(levelname)s %(message)s",
@@ -260,24 +271,16 @@ class MirrorCowork:
                 observations["files"][name] = {"count": 0, "recent": [], "newest_age_hours": 999}
 
         # System Health
-        main_state_file = PROJECT_ROOT / "workflow_system" / "state" / "current_state.json"
-        if main_state_file.exists():
-            try:
-                main_state = json.loads(main_state_file.read_text())
-                observations["system_health"]["main_cycle"] = main_state.get("cycle", 0)
-                observations["system_health"]["main_steps"] = len(main_state.get("steps_completed", []))
-                observations["system_health"]["main_patterns"] = len(main_state.get("patterns", []))
-            except json.JSONDecodeError:
-                observations["blockers"].append("Main-State nicht lesbar")
+        main_state = load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
+        if main_state:
+            observations["system_health"]["main_cycle"] = main_state.get("cycle", 0)
+            observations["system_health"]["main_steps"] = len(main_state.get("steps_completed", []))
+            observations["system_health"]["main_patterns"] = len(main_state.get("patterns", []))
 
-        mirror_state_file = STATE_DIR / "mirror_state.json"
-        if mirror_state_file.exists():
-            try:
-                mirror_state = json.loads(mirror_state_file.read_text())
-                observations["system_health"]["mirror_cycle"] = mirror_state.get("cycle", 0)
-                observations["system_health"]["mirror_steps"] = len(mirror_state.get("steps_completed", []))
-            except json.JSONDecodeError:
-                observations["blockers"].append("Mirror-State nicht lesbar")
+        mirror_state = load_snapshot(MIRROR_STATE_DB, MIRROR_STATE_FILE)
+        if mirror_state:
+            observations["system_health"]["mirror_cycle"] = mirror_state.get("cycle", 0)
+            observations["system_health"]["mirror_steps"] = len(mirror_state.get("steps_completed", []))
 
         # Blocker erkennen
         for name, info in observations["files"].items():
@@ -303,18 +306,14 @@ class MirrorCowork:
         vision_context = self._load_vision_context()
 
         # Main Status
-        main_cowork_file = PROJECT_ROOT / "workflow_system" / "state" / "cowork_state.json"
         main_status = "{}"
-        if main_cowork_file.exists():
-            try:
-                main_data = json.loads(main_cowork_file.read_text())
-                main_status = json.dumps({
-                    "focus": main_data.get("active_focus", "unknown"),
-                    "cycles": main_data.get("total_cycles", 0),
-                    "recent": main_data.get("actions_taken", [])[-3:],
-                }, ensure_ascii=False)[:500]
-            except json.JSONDecodeError:
-                pass
+        main_data = load_snapshot(COWORK_STATE_DB, COWORK_STATE_JSON)
+        if main_data:
+            main_status = json.dumps({
+                "focus": main_data.get("active_focus", "unknown"),
+                "cycles": main_data.get("total_cycles", 0),
+                "recent": main_data.get("actions_taken", [])[-3:],
+            }, ensure_ascii=False)[:500]
 
         prompt = PLAN_PROMPT.format(
             observations=json.dumps(observations, ensure_ascii=False)[:2000],
@@ -17,6 +17,7 @@ import argparse
 import asyncio
 import json
 import logging
+import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -27,6 +28,7 @@ MIRROR_DIR = Path(__file__).parent
 sys.path.insert(0, str(MIRROR_DIR))
 
 from config import (
+    MIRROR_STATE_DB,
     MIRROR_STATE_FILE,
     MODEL_ROUTING,
     OUTPUT_DIR,
@@ -36,6 +38,9 @@ from config import (
 )
 from gemini_client import GeminiClient
 
+sys.path.append(str(PROJECT_ROOT))
+from workflow_system.state.store import open_state_backend, workflow_backend
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [MIRROR-ORCH] %(levelname)s %(message)s",
@@ -279,60 +284,43 @@ CONVERGENCE_THRESHOLD = 0.5
 
 
 # === State Management ===
+# Gleiches Backend wie das Hauptsystem (workflow_system/state/store.py):
+# SQLite WAL, jede Aenderung ist ein einzelner Row-Write.
+
+def _state_backend():
+    return open_state_backend(MIRROR_STATE_DB, MIRROR_STATE_FILE, defaults={"cycle": 1})
+
 
 def load_mirror_state() -> Dict:
-    """Laedt Mirror-Zustand oder erstellt Default."""
-    if MIRROR_STATE_FILE.exists():
-        return json.loads(MIRROR_STATE_FILE.read_text())
-    default = {
-        "created": datetime.now().isoformat(),
-        "updated": datetime.now().isoformat(),
-        "cycle": 1,
-        "steps_completed": [],
-        "context": {},
-        "patterns": [],
-        "improvements": [],
-    }
-    save_mirror_state(default)
-    return default
+    """Laedt Mirror-Zustand (Default: Zyklus 1)."""
+    return _state_backend().snapshot()
 
 
 def save_mirror_state(state: Dict):
-    """Speichert Mirror-Zustand."""
-    state["updated"] = datetime.now().isoformat()
-    MIRROR_STATE_FILE.write_text(json.dumps(state, indent=2, ensure_ascii=False))
+    """Speichert kompletten Mirror-Zustand (Vollschreiben — nur fuer Kompatibilitaet)."""
+    _state_backend().replace(state)
 
 
 def append_step_result(step_name: str, result: Dict) -> Dict:
     """Fuegt Schritt-Ergebnis zum Zustand hinzu."""
-    state = load_mirror_state()
-    state["steps_completed"].append({
-        "step": step_name,
-        "timestamp": datetime.now().isoformat(),
-        "summary": json.dumps(result)[:500],
-    })
-    state["context"][step_name] = result
+    _state_backend().append_step(step_name, json.dumps(result)[:500], result)
 
     # Output speichern
     output_file = OUTPUT_DIR / f"{step_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     output_file.write_text(json.dumps(result, indent=2, ensure_ascii=False))
-
-    save_mirror_state(state)
-    return state
+    return result
 
 
 def get_context_for_step(step_name: str) -> Dict:
     """Baut Kontext fuer einen Schritt zusammen."""
-    state = load_mirror_state()
+    context = _state_backend().step_context()
 
     # Main-System Patterns laden (wenn vorhanden)
-    main_patterns = []
-    main_pattern_file = PROJECT_ROOT / "workflow_system" / "state" / "pattern_library.json"
-    if main_pattern_file.exists():
-        try:
-            main_patterns = json.loads(main_pattern_file.read_text())
-        except json.JSONDecodeError:
-            pass
+    try:
+        main_patterns = workflow_backend().pattern_library()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Main-Patterns nicht lesbar: {e}")
+        main_patterns = []
 
     # Vision-Kontext laden
     vision_context = ""
@@ -346,37 +334,22 @@ def get_context_for_step(step_name: str) -> Dict:
             pass
 
     return {
-        "cycle": state.get("cycle", 1),
-        "prior_steps": state.get("context", {}),
-        "patterns": state.get("patterns", []),
+        **context,
         "main_patterns": main_patterns,
-        "improvements": state.get("improvements", []),
         "vision_context": vision_context,
     }
 
 
 def advance_cycle() -> int:
-    """Archiviert aktuellen Zyklus und startet neuen."""
-    state = load_mirror_state()
-    old_cycle = state.get("cycle", 1)
+    """Archiviert aktuellen Zyklus und startet neuen (Patterns und Improvements bleiben)."""
+    state, new_cycle = _state_backend().advance_cycle()
 
     # Archivieren
-    archive_file = HISTORY_DIR / f"mirror_cycle_{old_cycle}_{datetime.now().strftime('%Y%m%d')}.json"
+    archive_file = HISTORY_DIR / f"mirror_cycle_{new_cycle - 1}_{datetime.now().strftime('%Y%m%d')}.json"
     archive_file.write_text(json.dumps(state, indent=2, ensure_ascii=False))
 
-    # Neuen Zyklus starten (Patterns und Improvements mitnehmen)
-    new_state = {
-        "created": datetime.now().isoformat(),
-        "updated": datetime.now().isoformat(),
-        "cycle": old_cycle + 1,
-        "steps_completed": [],
-        "context": {},
-        "patterns": state.get("patterns", []),
-        "improvements": state.get("improvements", []),
-    }
-    save_mirror_state(new_state)
-    logger.info(f"Neuer Zyklus gestartet: {old_cycle + 1}")
-    return old_cycle + 1
+    logger.info(f"Neuer Zyklus gestartet: {new_cycle}")
+    return new_cycle
 
 
 # === Step Execution ===
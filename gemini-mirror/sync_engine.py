@@ -35,11 +35,24 @@ sys.path.insert(0, str(MIRROR_DIR))
 from config import (
     SYNC_STATE_FILE,
     SYNC_CONFIG,
+    MIRROR_STATE_DB,
+    MIRROR_STATE_FILE,
     PROJECT_ROOT,
     STATE_DIR,
     MEMORY_DIR,
 )
 
+sys.path.append(str(PROJECT_ROOT))
+from workflow_system.state.store import (
+    COWORK_STATE_DB,
+    COWORK_STATE_JSON,
+    PATTERN_LIBRARY_JSON,
+    WORKFLOW_STATE_DB,
+    WORKFLOW_STATE_JSON,
+    load_pattern_library,
+    load_snapshot,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [SYNC] %(levelname)s %(message)s",
@@ -54,23 +67,30 @@ class SyncEngine:
         self.state = self._load_sync_state()
         self.project_root = PROJECT_ROOT
 
-        # Pfade die synchronisiert werden
+        # Paare die synchronisiert werden. "main_loader"/"mirror_loader" lesen
+        # Zustaende aus dem State-Backend (SQLite), sonst wird die Datei gelesen.
+        # Das Merge-Ergebnis landet immer in "mirror".
         self.sync_pairs = [
             {
                 "name": "workflow_state",
-                "main": PROJECT_ROOT / "workflow_system" / "state" / "current_state.json",
-                "mirror": STATE_DIR / "mirror_state.json",
+                "main": WORKFLOW_STATE_JSON,
+                "main_loader": lambda: load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON),
+                # Eigene Datei: der Mirror-Zustand selbst wird nicht mehr ueberschrieben
+                "mirror": STATE_DIR / "workflow_sync.json",
+                "mirror_loader": lambda: load_snapshot(MIRROR_STATE_DB, MIRROR_STATE_FILE),
                 "strategy": "merge_context",
             },
             {
                 "name": "pattern_library",
-                "main": PROJECT_ROOT / "workflow_system" / "state" / "pattern_library.json",
+                "main": PATTERN_LIBRARY_JSON,
+                "main_loader": lambda: load_pattern_library(),
                 "mirror": MEMORY_DIR / "cross_patterns.json",
                 "strategy": "merge_append",
             },
             {
                 "name": "cowork_state",
-                "main": PROJECT_ROOT / "workflow_system" / "state" / "cowork_state.json",
+                "main": COWORK_STATE_JSON,
+                "main_loader": lambda: load_snapshot(COWORK_STATE_DB, COWORK_STATE_JSON),
                 "mirror": STATE_DIR / "mirror_cowork_state.json",
                 "strategy": "merge_actions",
             },
@@ -159,8 +179,8 @@ class SyncEngine:
 
         logger.info(f"  Sync: {name} ({strategy})")
 
-        main_data = self._safe_load_json(main_path)
-        mirror_data = self._safe_load_json(mirror_path)
+        main_data = pair["main_loader"]() if "main_loader" in pair else self._safe_load_json(main_path)
+        mirror_data = pair["mirror_loader"]() if "mirror_loader" in pair else self._safe_load_json(mirror_path)
 
         if not main_data and not mirror_data:
             return {"pair": name, "action": "skip", "reason": "both_empty"}
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+ADAPTIVE CONCURRENCY - AIMD Governor for the Kimi Swarms
+Drop-in replacement for a static asyncio.Semaphore(MAX_CONCURRENT).
+
+- Additive increase: window grows by ~1 slot per full window of successes
+- Multiplicative decrease: window shrinks on HTTP 429 or when p95 latency
+  rises well above its uncongested baseline (at most once per cooldown, so
+  a burst of 429s from every in-flight slot counts as ONE congestion signal)
+- Latency is relative: LLM latency mostly tracks answer length, so the
+  baseline is the lowest p95 seen, and latency_target_sec is only a floor
+  below which latency never counts as congestion. A p95 that stays high
+  even at the minimum window becomes the new baseline.
+- Retry-After: all new acquisitions pause until the provider allows traffic again
+
+Usage:
+    limiter = AdaptiveConcurrency(max_limit=500)
+    async with limiter:
+        start = time.monotonic()
+        resp = await session.post(...)
+        if resp.status == 429:
+            limiter.record_rate_limit(resp.headers.get("Retry-After"))
+        else:
+            limiter.record_success(time.monotonic() - start)
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Defaults
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_COOLDOWN_SEC = 2.0  # Minimum time between two decreases
+DEFAULT_LATENCY_SAMPLES = 200  # p95 is computed over the last N successful requests
+MIN_LATENCY_SAMPLES = 20  # p95 is not judged on fewer samples
+DEFAULT_LATENCY_FACTOR = 2.0  # congestion = p95 above this multiple of the baseline p95
+DEFAULT_RETRY_AFTER_SEC = 1.0  # Pause when a 429 carries no Retry-After header
+MAX_RETRY_AFTER_SEC = 60.0
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header (seconds form). Returns None if absent/unparseable."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, min(float(value), MAX_RETRY_AFTER_SEC))
+    except (TypeError, ValueError):
+        # HTTP-date form is rare for LLM APIs - fall back to the default pause
+        return None
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency window driven by 429s and p95 latency."""
+
+    def __init__(
+        self,
+        max_limit: int,
+        initial_limit: Optional[int] = None,
+        min_limit: int = 1,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        latency_target_sec: Optional[float] = None,
+        cooldown_sec: float = DEFAULT_COOLDOWN_SEC,
+        latency_factor: float = DEFAULT_LATENCY_FACTOR,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(min(initial_limit or self.max_limit, self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_target_sec = latency_target_sec
+        self.latency_factor = latency_factor
+        self.cooldown_sec = cooldown_sec
+        self.baseline_p95: Optional[float] = None
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latencies = deque(maxlen=DEFAULT_LATENCY_SAMPLES)
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+        self.stats = {
+            "acquired": 0,
+            "successes": 0,
+            "rate_limited": 0,
+            "latency_backoffs": 0,
+            "timeouts": 0,
+            "decreases": 0,
+        }
+
+    @property
+    def window(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.min_limit, int(self.limit))
+
+    # ─── Slot handling ────────────────────────────────────────────
+    async def acquire(self):
+        async with self._cond:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    # Release the condition while waiting out Retry-After
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=pause)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.window:
+                    break
+                await self._cond.wait()
+            self.in_flight += 1
+            self.stats["acquired"] += 1
+
+    async def release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    # ─── Feedback signals ─────────────────────────────────────────
+    def record_success(self, latency_sec: float):
+        """Successful request: additive increase unless latency rose well above its baseline."""
+        self.stats["successes"] += 1
+        self.latencies.append(latency_sec)
+
+        if self.latency_target_sec and len(self.latencies) >= MIN_LATENCY_SAMPLES:
+            p95 = self.p95_latency()
+            if self.baseline_p95 is None or p95 < self.baseline_p95:
+                self.baseline_p95 = p95
+            if p95 > max(self.latency_target_sec, self.latency_factor * self.baseline_p95):
+                if self.window > self.min_limit:
+                    if self._decrease():
+                        self.stats["latency_backoffs"] += 1
+                        self.latencies.clear()  # judge the smaller window on fresh samples
+                    return
+                # Nothing left to shed — this is the provider's normal latency, not congestion
+                self.baseline_p95 = p95
+
+        # +1 slot per full window of successes (TCP congestion-avoidance style)
+        self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def record_rate_limit(self, retry_after=None):
+        """HTTP 429: multiplicative decrease and pause new requests for Retry-After."""
+        self.stats["rate_limited"] += 1
+        self._decrease()
+        pause = parse_retry_after(retry_after)
+        if pause is None:
+            pause = DEFAULT_RETRY_AFTER_SEC
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def record_timeout(self):
+        """Request timed out: treat as congestion."""
+        self.stats["timeouts"] += 1
+        self._decrease()
+
+    def retry_delay(self, attempt: int) -> float:
+        """Seconds a caller should wait before retrying (honors an active Retry-After)."""
+        pause = self.paused_until - time.monotonic()
+        return pause if pause > 0 else float(2**attempt)
+
+    def _decrease(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_sec:
+            return False
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self.stats["decreases"] += 1
+        return True
+
+    # ─── Reporting ────────────────────────────────────────────────
+    def p95_latency(self) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def snapshot(self) -> Dict:
+        return {
+            "window": self.window,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "p95_latency_sec": round(self.p95_latency(), 3),
+            "baseline_p95_sec": round(self.baseline_p95, 3) if self.baseline_p95 is not None else None,
+            "paused": self.paused_until > time.monotonic(),
+            **self.stats,
+        }
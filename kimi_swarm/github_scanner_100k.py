@@ -7,10 +7,16 @@ Scannt GitHub nach den besten AI-Repos und Gold Nuggets
 import asyncio
 import json
 import os
+import time
 from datetime import datetime
 
 import aiohttp
 
+try:
+    from kimi_swarm.adaptive_concurrency import AdaptiveConcurrency
+except ImportError:
+    from adaptive_concurrency import AdaptiveConcurrency
+
 MOONSHOT_API_KEY = os.getenv("MOONSHOT_API_KEY", "")
 MAX_CONCURRENT = 100
 
@@ -75,11 +81,11 @@ class GitHubScanner:
             "tokens_used": 0,
             "cost_usd": 0.0,
         }
-        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+        self.limiter = AdaptiveConcurrency(max_limit=MAX_CONCURRENT)
 
     async def analyze_repo(self, repo_info: str) -> dict:
         """Use Kimi to analyze a repo for gold nuggets."""
-        async with self.semaphore:
+        async with self.limiter:
             prompt = f"""Analyze this GitHub repo for business value:
 
 {repo_info}
@@ -94,6 +100,7 @@ Questions:
 Return as JSON: {{problem, monetization, readiness, rating, action, reason}}"""
 
             async with aiohttp.ClientSession() as session:
+                started = time.monotonic()
                 try:
                     async with session.post(
                         "https://api.moonshot.ai/v1/chat/completions",
@@ -111,12 +118,19 @@ Return as JSON: {{problem, monetization, readiness, rating, action, reason}}"""
                     ) as resp:
                         if resp.status == 200:
                             data = await resp.json()
+                            self.limiter.record_success(time.monotonic() - started)
                             content = data["choices"][0]["message"]["content"]
                             tokens = data.get("usage", {}).get("total_tokens", 300)
                             self.stats["tokens_used"] += tokens
                             self.stats["cost_usd"] += (tokens / 1000) * 0.0005
                             self.stats["repos_scanned"] += 1
                             return {"status": "success", "analysis": content}
+                        if resp.status == 429:
+                            self.limiter.record_rate_limit(resp.headers.get("Retry-After"))
+                            return {"status": "error", "error": "rate limited"}
+                except asyncio.TimeoutError:
+                    self.limiter.record_timeout()
+                    return {"status": "error", "error": "timeout"}
                 except Exception as e:
                     return {"status": "error", "error": str(e)}
             return {"status": "error", "error": "Unknown"}
@@ -231,6 +245,7 @@ URL: {repo["html_url"]}
         print(f"Gold Nuggets:   {self.stats['nuggets_found']}")
         print(f"Tokens Used:    {self.stats['tokens_used']:,}")
         print(f"Cost:           ${self.stats['cost_usd']:.4f}")
+        print(f"Concurrency:    {self.limiter.window} / {self.limiter.max_limit}")
         print(f"Results:        {output_file}")
 
 
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+PROGRESS JOURNAL - Durable Checkpoint/Resume for long Swarm Runs
+A crash at task 300,000 should not re-pay for 300,000 finished tasks.
+
+Two files next to the swarm output:
+- progress_<name>.jsonl  append-only log, one line per finished task
+- progress_<name>.json   periodic snapshot (atomic_write_json from
+                         antigravity/sync_engine): completed task-id ranges,
+                         token/cost totals and the current task_weights
+
+On resume the snapshot is loaded and the log tail replayed on top of it.
+Each checkpoint folds the log into a new snapshot and truncates the log.
+
+Usage:
+    journal = ProgressJournal(OUTPUT_DIR, "500k")
+    journal.load()                      # --resume
+    if journal.is_done(task_id): skip
+    journal.record(task_id, "leads", tokens=420, cost=0.0002, revenue=500)
+    journal.flush()                     # cheap append, call every ~100 tasks
+    journal.checkpoint(task_weights)    # snapshot + truncate log
+"""
+
+import json
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from antigravity.sync_engine import atomic_write_json
+
+
+class TaskRanges:
+    """Sorted, merged list of inclusive [start, end] task-id ranges."""
+
+    def __init__(self, ranges: Optional[List[List[int]]] = None):
+        # Snapshots store ranges already sorted and merged
+        self.ranges: List[List[int]] = [[int(start), int(end)] for start, end in sorted(ranges or [])]
+
+    def _find(self, task_id: int) -> int:
+        """Index of the last range starting at or before task_id (-1 if none)."""
+        return bisect_right(self.ranges, [task_id, float("inf")]) - 1
+
+    def __contains__(self, task_id: int) -> bool:
+        i = self._find(task_id)
+        return i >= 0 and self.ranges[i][1] >= task_id
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def add(self, task_id: int):
+        i = self._find(task_id)
+        if i >= 0 and self.ranges[i][1] >= task_id:
+            return
+        joins_left = i >= 0 and self.ranges[i][1] == task_id - 1
+        joins_right = i + 1 < len(self.ranges) and self.ranges[i + 1][0] == task_id + 1
+        if joins_left and joins_right:
+            self.ranges[i][1] = self.ranges[i + 1][1]
+            del self.ranges[i + 1]
+        elif joins_left:
+            self.ranges[i][1] = task_id
+        elif joins_right:
+            self.ranges[i + 1][0] = task_id
+        else:
+            self.ranges.insert(i + 1, [task_id, task_id])
+
+
+class ProgressJournal:
+    """Incremental progress ledger for KimiSwarm runs."""
+
+    def __init__(self, directory: Path, name: str):
+        self.snapshot_file = Path(directory) / f"progress_{name}.json"
+        self.log_file = Path(directory) / f"progress_{name}.jsonl"
+        self.done = TaskRanges()
+        self.totals = self._empty_totals()
+        self.task_weights: Optional[List[float]] = None
+        self._pending: List[str] = []
+
+    @staticmethod
+    def _empty_totals() -> Dict:
+        return {"completed": 0, "tokens_used": 0, "cost_usd": 0.0, "estimated_revenue": 0.0, "by_type": {}}
+
+    # ─── Recording ────────────────────────────────────────────────
+    def is_done(self, task_id: int) -> bool:
+        return task_id in self.done
+
+    def record(self, task_id: int, task_type: str, tokens: int, cost: float, revenue: float = 0.0):
+        """Mark a task finished. Buffered in memory until flush()."""
+        entry = {"id": task_id, "type": task_type, "tokens": tokens, "cost": cost, "revenue": revenue}
+        self._apply(entry)
+        self._pending.append(json.dumps(entry))
+
+    def _apply(self, entry: Dict):
+        if entry["id"] in self.done:
+            return
+        self.done.add(entry["id"])
+        self.totals["completed"] += 1
+        self.totals["tokens_used"] += entry.get("tokens", 0)
+        self.totals["cost_usd"] += entry.get("cost", 0.0)
+        self.totals["estimated_revenue"] += entry.get("revenue", 0.0)
+        by_type = self.totals["by_type"]
+        by_type[entry["type"]] = by_type.get(entry["type"], 0) + 1
+
+    def flush(self):
+        """Append buffered entries to the log (single small write)."""
+        if not self._pending:
+            return
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_file, "a") as f:
+            f.write("\n".join(self._pending) + "\n")
+        self._pending.clear()
+
+    def checkpoint(self, task_weights: Optional[List[float]] = None) -> bool:
+        """Write an atomic snapshot, then truncate the log it now contains."""
+        self.flush()
+        if task_weights is not None:
+            self.task_weights = list(task_weights)
+        ok = atomic_write_json(
+            self.snapshot_file,
+            {
+                "updated": datetime.now().isoformat(),
+                "completed_ranges": self.done.ranges,
+                "totals": self.totals,
+                "task_weights": self.task_weights,
+            },
+        )
+        if ok:
+            self.log_file.write_text("")
+        return ok
+
+    # ─── Resume ───────────────────────────────────────────────────
+    def load(self) -> bool:
+        """Load snapshot + replay log. Returns True if there was anything to resume."""
+        found = False
+        if self.snapshot_file.exists():
+            try:
+                snapshot = json.loads(self.snapshot_file.read_text())
+                self.done = TaskRanges(snapshot.get("completed_ranges", []))
+                self.totals = {**self._empty_totals(), **snapshot.get("totals", {})}
+                self.task_weights = snapshot.get("task_weights")
+                found = True
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️  Could not read progress snapshot {self.snapshot_file}: {e}")
+
+        if self.log_file.exists():
+            for line in self.log_file.read_text().splitlines():
+                try:
+                    self._apply(json.loads(line))
+                    found = True
+                except (json.JSONDecodeError, KeyError):
+                    # Torn last line from a crash mid-append
+                    continue
+        return found
+
+    def reset(self):
+        """Start a fresh ledger (new run without --resume)."""
+        self.done = TaskRanges()
+        self.totals = self._empty_totals()
+        self.task_weights = None
+        self._pending.clear()
+        for path in (self.snapshot_file, self.log_file):
+            path.unlink(missing_ok=True)
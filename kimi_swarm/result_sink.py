@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+RESULT SINK - Buffered JSONL Shard Writer for Swarm Outputs
+Replaces "one JSON file per task" with a few large, append-only shards.
+
+- add() is O(1) and never touches the disk on the event loop
+- Buffered records are written off-loop (asyncio.to_thread) by a single writer
+- Shards rotate per task type once they reach MAX_SHARD_BYTES
+- Optional gzip or zstd compression (zstd needs the 'zstandard' package)
+- results_index.json lists every shard so consumers read sequentially
+  instead of walking a directory of 500,000 files
+- on_flush() listeners learn which records are on disk (e.g. so a
+  progress journal only marks tasks done whose results were written)
+
+Usage:
+    sink = ResultSink(OUTPUT_DIR, compression="gzip")
+    await sink.start()
+    sink.add("viral_content_idea", CONTENT_DIR, {"task_id": 1, ...})
+    await sink.close()   # final flush + index
+
+    for record in iter_results(OUTPUT_DIR):
+        ...
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import os
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_FILE = "results_index.json"
+MAX_SHARD_BYTES = 64 * 1024 * 1024  # 64 MB per shard before rotating
+FLUSH_EVERY = 500  # Flush once this many records are buffered
+FLUSH_INTERVAL_SEC = 2.0  # ...or at least this often
+
+SUFFIXES = {None: ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _open_shard(path: Path, compression: Optional[str], mode: str):
+    """Open a shard for binary append/read. gzip/zstd members concatenate cleanly."""
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "zstd":
+        raw = open(path, mode)
+        if "a" in mode or "w" in mode:
+            return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, mode)
+
+
+class ResultSink:
+    """Async buffered writer producing rotating JSONL shards per task type."""
+
+    def __init__(
+        self,
+        root: Path,
+        compression: Optional[str] = None,
+        max_shard_bytes: int = MAX_SHARD_BYTES,
+        flush_every: int = FLUSH_EVERY,
+        flush_interval: float = FLUSH_INTERVAL_SEC,
+    ):
+        if compression not in SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression} (use gzip, zstd or None)")
+        if compression == "zstd" and zstandard is None:
+            print("⚠️  zstandard not installed - falling back to gzip shards")
+            compression = "gzip"
+
+        self.root = Path(root)
+        self.compression = compression
+        self.max_shard_bytes = max_shard_bytes
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self.buffer: Dict[str, List] = defaultdict(list)  # task_type -> [(output_dir, record)]
+        self.buffered = 0
+        self.written = 0
+        self.index = self._load_index()
+        self._lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._pending: Optional[asyncio.Task] = None
+        self._flush_listeners: List[Callable[[List[Dict]], None]] = []
+
+    # ─── Index ────────────────────────────────────────────────────
+    def _load_index(self) -> Dict:
+        path = self.root / INDEX_FILE
+        if path.exists():
+            try:
+                return json.loads(path.read_text())
+            except (json.JSONDecodeError, OSError):
+                pass
+        return {"created": datetime.now().isoformat(), "task_types": {}}
+
+    def _write_index(self):
+        """Atomic write (tmp + rename) so readers never see a half-written index."""
+        self.index["updated"] = datetime.now().isoformat()
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.root), suffix=".tmp", prefix=".index_")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.root / INDEX_FILE)
+
+    # ─── Public API ───────────────────────────────────────────────
+    def add(self, task_type: str, output_dir: Path, record: Dict):
+        """Buffer one result. Never blocks on disk I/O."""
+        self.buffer[task_type].append((Path(output_dir), record))
+        self.buffered += 1
+        if self.buffered >= self.flush_every and (self._pending is None or self._pending.done()):
+            try:
+                self._pending = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                # No running loop (sync caller) - flush happens on close()
+                pass
+
+    def on_flush(self, listener: Callable[[List[Dict]], None]):
+        """listener(records) runs on the event loop after each batch has been written."""
+        self._flush_listeners.append(listener)
+
+    async def start(self):
+        """Start the periodic background flusher."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def flush(self):
+        """Hand the current buffer to the writer thread."""
+        async with self._lock:
+            if not self.buffered:
+                return
+            batch, self.buffer = self.buffer, defaultdict(list)
+            self.buffered = 0
+            await asyncio.to_thread(self._write_batch, batch)
+            if self._flush_listeners:
+                records = [record for items in batch.values() for _, record in items]
+                for listener in self._flush_listeners:
+                    listener(records)
+
+    async def close(self):
+        """Stop the flusher and write everything that is still buffered."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        if self._pending is not None:
+            await self._pending
+        await self.flush()
+
+    # ─── Writer (runs in a worker thread) ─────────────────────────
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"  ⚠️  Result sink flush failed: {type(e).__name__}: {str(e)[:100]}")
+
+    def _write_batch(self, batch: Dict[str, List]):
+        for task_type, items in batch.items():
+            entry = self.index["task_types"].setdefault(task_type, {"shards": []})
+            output_dir = items[0][0]
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            shard = self._current_shard(entry, task_type, output_dir)
+            path = self.root / shard["file"]
+            payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for _, record in items)
+
+            with _open_shard(path, self.compression, "ab") as f:
+                f.write(payload.encode("utf-8"))
+
+            shard["records"] += len(items)
+            shard["bytes"] = path.stat().st_size
+            task_ids = [r["task_id"] for _, r in items if isinstance(r.get("task_id"), int)]
+            if task_ids:
+                shard["first_task_id"] = min(task_ids + [shard.get("first_task_id", task_ids[0])])
+                shard["last_task_id"] = max(task_ids + [shard.get("last_task_id", task_ids[0])])
+            self.written += len(items)
+
+        self._write_index()
+
+    def _current_shard(self, entry: Dict, task_type: str, output_dir: Path) -> Dict:
+        shards = entry["shards"]
+        if shards and shards[-1]["bytes"] < self.max_shard_bytes and shards[-1].get("compression") == self.compression:
+            return shards[-1]
+        filename = f"{task_type}_{len(shards):05d}{SUFFIXES[self.compression]}"
+        try:
+            rel = (output_dir / filename).relative_to(self.root)
+        except ValueError:
+            rel = output_dir / filename
+        shard = {"file": str(rel), "compression": self.compression, "records": 0, "bytes": 0}
+        shards.append(shard)
+        return shard
+
+
+def iter_results(root: Path, task_type: Optional[str] = None) -> Iterator[Dict]:
+    """Sequentially read all records listed in the shard index."""
+    root = Path(root)
+    index_path = root / INDEX_FILE
+    if not index_path.exists():
+        return
+    index = json.loads(index_path.read_text())
+    for name, entry in index.get("task_types", {}).items():
+        if task_type and name != task_type:
+            continue
+        for shard in entry.get("shards", []):
+            path = root / shard["file"]
+            if not path.exists():
+                continue
+            with _open_shard(path, shard.get("compression"), "rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
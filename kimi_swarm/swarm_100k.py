@@ -15,11 +15,17 @@ from typing import Dict, List
 
 import aiohttp
 
+try:
+    from kimi_swarm.adaptive_concurrency import AdaptiveConcurrency
+except ImportError:
+    from adaptive_concurrency import AdaptiveConcurrency
+
 MOONSHOT_API_KEY = os.getenv("MOONSHOT_API_KEY", "")
 MAX_CONCURRENT = 50  # Reduced to avoid rate limits
 TOTAL_AGENTS = 100000
 BUDGET_USD = 15.0
 BATCH_DELAY = 0.5  # Delay between batches in seconds
+LATENCY_TARGET_SEC = 20.0  # p95 below this never shrinks the window (above: compared to the baseline)
 
 # Validation and estimation constants
 ESTIMATED_SECONDS_PER_TASK = 0.5  # Average time per task for capacity estimation
@@ -127,7 +133,7 @@ class KimiSwarm:
         }
         self.running = True
         self.max_concurrent = MAX_CONCURRENT  # Store for validation
-        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+        self.limiter = AdaptiveConcurrency(max_limit=MAX_CONCURRENT, latency_target_sec=LATENCY_TARGET_SEC)
         self.session = None
         self.task_counter = 0
 
@@ -164,12 +170,12 @@ class KimiSwarm:
         else:
             print("  ✅ API key configured")
 
-        # Check semaphore capacity matches configuration
+        # Check limiter capacity matches configuration
         if self.max_concurrent != MAX_CONCURRENT:
-            print("  ❌ Semaphore capacity mismatch")
+            print("  ❌ Concurrency limiter capacity mismatch")
             validation_passed = False
         else:
-            print("  ✅ Semaphore initialized correctly")
+            print("  ✅ Concurrency limiter initialized correctly")
 
         # Check output directories exist
         for dir_path in [
@@ -242,8 +248,12 @@ class KimiSwarm:
 
     async def execute_task(self, task_id: int, task_type: Dict, retries: int = 3) -> Dict:
         """Execute single task with rate limiting."""
-        async with self.semaphore:
-            for attempt in range(retries):
+        for attempt in range(retries):
+            backoff = 0.0
+            # Slot held only for the request: back off outside it, re-acquire per attempt
+            # (so the retry also waits for the window shrunk by record_rate_limit)
+            async with self.limiter:
+                started = time.monotonic()
                 try:
                     async with self.session.post(
                         "https://api.moonshot.ai/v1/chat/completions",
@@ -266,6 +276,7 @@ class KimiSwarm:
                     ) as resp:
                         if resp.status == 200:
                             data = await resp.json()
+                            self.limiter.record_success(time.monotonic() - started)
                             content = data["choices"][0]["message"]["content"]
                             tokens = data.get("usage", {}).get("total_tokens", 300)
 
@@ -285,10 +296,9 @@ class KimiSwarm:
                                 "tokens": tokens,
                             }
                         elif resp.status == 429:
-                            # Rate limited - longer exponential backoff
-                            wait = (3**attempt) + 2
-                            await asyncio.sleep(wait)
-                            continue
+                            # Rate limited - shrink the window, honor Retry-After, longer backoff
+                            self.limiter.record_rate_limit(resp.headers.get("Retry-After"))
+                            backoff = max(self.limiter.retry_delay(attempt), (3**attempt) + 2)
                         else:
                             text = await resp.text()
                             if attempt == retries - 1:
@@ -299,6 +309,7 @@ class KimiSwarm:
                                     "error": f"HTTP {resp.status}: {text[:100]}",
                                 }
                 except asyncio.TimeoutError:
+                    self.limiter.record_timeout()
                     if attempt == retries - 1:
                         self.stats["failed"] += 1
                         return {
@@ -306,15 +317,17 @@ class KimiSwarm:
                             "status": "error",
                             "error": "timeout",
                         }
-                    await asyncio.sleep(1)
+                    backoff = 1.0
                 except Exception as e:
                     if attempt == retries - 1:
                         self.stats["failed"] += 1
                         return {"task_id": task_id, "status": "error", "error": str(e)}
-                    await asyncio.sleep(1)
+                    backoff = 1.0
+            if backoff:
+                await asyncio.sleep(backoff)
 
-            self.stats["failed"] += 1
-            return {"task_id": task_id, "status": "error", "error": "max retries"}
+        self.stats["failed"] += 1
+        return {"task_id": task_id, "status": "error", "error": "max retries"}
 
     async def run_batch(self, start_id: int, count: int) -> List[Dict]:
         """Run a batch of tasks."""
@@ -343,6 +356,8 @@ class KimiSwarm:
         print(f"Cost:           ${self.stats['cost_usd']:.4f} / ${BUDGET_USD:.2f}")
         print(f"Rate:           {rate:.1f} tasks/sec")
         print(f"Elapsed:        {elapsed:.1f}s | ETA: {eta:.0f}s")
+        limiter = self.limiter.snapshot()
+        print(f"Concurrency:    {limiter['window']} / {limiter['max_limit']} (429s: {limiter['rate_limited']})")
         print("---")
         print(f"Leads:          {self.stats['by_type']['lead_research']:,}")
         print(f"Content:        {self.stats['by_type']['content_idea']:,}")
@@ -11,6 +11,7 @@ import json
 import os
 import random
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
@@ -18,6 +19,15 @@ from typing import Dict, List
 import aiohttp
 from antigravity.config import ANTHROPIC_API_KEY, MOONSHOT_API_KEY
 
+try:
+    from kimi_swarm.adaptive_concurrency import AdaptiveConcurrency
+    from kimi_swarm.progress_journal import ProgressJournal
+    from kimi_swarm.result_sink import ResultSink
+except ImportError:
+    from adaptive_concurrency import AdaptiveConcurrency
+    from progress_journal import ProgressJournal
+    from result_sink import ResultSink
+
 # API Keys - MUST be set as environment variables
 if not MOONSHOT_API_KEY:
     raise ValueError("MOONSHOT_API_KEY environment variable must be set")
@@ -28,6 +38,11 @@ TOTAL_AGENTS = 500000
 BUDGET_USD = 75.0  # 5x budget for 5x agents
 BATCH_DELAY = 0.1  # Faster batches with better concurrency
 CLAUDE_ORCHESTRATION_INTERVAL = 1000  # Claude reviews every 1000 tasks
+QUEUE_SIZE = MAX_CONCURRENT * 2  # Bounded work queue: producer stays just ahead of the workers
+STATS_INTERVAL = 5000  # Print progress every 5000 finished tasks
+RATE_WINDOW = 1000  # Sustained tasks/sec is measured over the last 1000 finished tasks
+LATENCY_TARGET_SEC = 20.0  # p95 below this never shrinks the window (above: compared to the baseline)
+RESULT_COMPRESSION = os.getenv("SWARM_RESULT_COMPRESSION") or None  # gzip / zstd / unset = plain JSONL
 
 # Validation and estimation constants
 ESTIMATED_SECONDS_PER_TASK = 0.5  # Average time per task for capacity estimation
@@ -346,12 +361,21 @@ class KimiSwarm500K:
         }
         self.running = True
         self.max_concurrent = MAX_CONCURRENT  # Store for validation
-        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+        self.limiter = AdaptiveConcurrency(max_limit=MAX_CONCURRENT, latency_target_sec=LATENCY_TARGET_SEC)
         self.session = None
         self.task_counter = 0
         self.recent_results = []
         self.claude = ClaudeOrchestrator(ANTHROPIC_API_KEY)
         self.task_weights = [1.0] * len(TASK_TYPES)  # Dynamic task prioritization
+        self.finished = 0  # completed + failed, drives checkpoints in the work-queue engine
+        self.finish_times = deque(maxlen=RATE_WINDOW)
+        self.checkpoint_task = None
+        self.sink = ResultSink(OUTPUT_DIR, compression=RESULT_COMPRESSION)
+        self.journal = ProgressJournal(OUTPUT_DIR, "500k")
+        # Finished tasks whose results are still in the sink buffer. They enter the
+        # journal only once the sink has written them, so --resume never skips a lost result.
+        self.unjournaled: Dict[int, tuple] = {}
+        self.sink.on_flush(self._journal_written)
 
     def validate_max_agent_capacity(self) -> bool:
         """Validate that system is configured to spawn max agents."""
@@ -386,12 +410,12 @@ class KimiSwarm500K:
         else:
             print("  ✅ API key configured")
 
-        # Check semaphore capacity matches configuration
+        # Check limiter capacity matches configuration
         if self.max_concurrent != MAX_CONCURRENT:
-            print("  ❌ Semaphore capacity mismatch")
+            print("  ❌ Concurrency limiter capacity mismatch")
             validation_passed = False
         else:
-            print("  ✅ Semaphore initialized correctly")
+            print("  ✅ Concurrency limiter initialized correctly")
 
         # Check output directories exist
         for dir_path in [
@@ -436,9 +460,8 @@ class KimiSwarm500K:
             await self.session.close()
 
     def save_result(self, task_id: int, task_type: Dict, content: str):
-        """Save individual result to file."""
+        """Buffer result for the JSONL shard writer (no disk I/O on the event loop)."""
         output_dir = task_type.get("output_dir", OUTPUT_DIR)
-        filename = output_dir / f"{task_type['type']}_{task_id:06d}.json"
 
         try:
             # Try to parse JSON from content
@@ -465,8 +488,7 @@ class KimiSwarm500K:
                 "parse_error": str(e),
             }
 
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self.sink.add(task_type["type"], output_dir, data)
 
         # Track for Claude analysis
         self.recent_results.append(data)
@@ -475,8 +497,12 @@ class KimiSwarm500K:
 
     async def execute_task(self, task_id: int, task_type: Dict, retries: int = 3) -> Dict:
         """Execute single task with rate limiting."""
-        async with self.semaphore:
-            for attempt in range(retries):
+        for attempt in range(retries):
+            backoff = 0.0
+            # Slot held only for the request: back off outside it, re-acquire per attempt
+            # (so the retry also waits for the window shrunk by record_rate_limit)
+            async with self.limiter:
+                started = time.monotonic()
                 try:
                     async with self.session.post(
                         "https://api.moonshot.ai/v1/chat/completions",
@@ -499,17 +525,19 @@ class KimiSwarm500K:
                     ) as resp:
                         if resp.status == 200:
                             data = await resp.json()
+                            self.limiter.record_success(time.monotonic() - started)
                             content = data["choices"][0]["message"]["content"]
                             tokens = data.get("usage", {}).get("total_tokens", 400)
+                            # Kimi moonshot-v1-8k: $0.0005 per 1K tokens
+                            cost = (tokens / 1000) * 0.0005
+                            revenue = task_type.get("revenue_potential", 0) * 0.1  # 10% conversion rate assumption
 
                             self.stats["completed"] += 1
                             self.stats["tokens_used"] += tokens
                             self.stats["by_type"][task_type["type"]] += 1
-                            # Kimi moonshot-v1-8k: $0.0005 per 1K tokens
-                            self.stats["cost_usd"] += (tokens / 1000) * 0.0005
-                            self.stats["estimated_revenue"] += (
-                                task_type.get("revenue_potential", 0) * 0.1
-                            )  # 10% conversion rate assumption
+                            self.stats["cost_usd"] += cost
+                            self.stats["estimated_revenue"] += revenue
+                            self.unjournaled[task_id] = (task_type["type"], tokens, cost, revenue)
 
                             # Save to file
                             self.save_result(task_id, task_type, content)
@@ -522,10 +550,9 @@ class KimiSwarm500K:
                                 "revenue_potential": task_type.get("revenue_potential", 0),
                             }
                         elif resp.status == 429:
-                            # Rate limited
-                            wait = (2**attempt) + random.uniform(0, 1)
-                            await asyncio.sleep(wait)
-                            continue
+                            # Rate limited - shrink the window and honor Retry-After
+                            self.limiter.record_rate_limit(resp.headers.get("Retry-After"))
+                            backoff = self.limiter.retry_delay(attempt) + random.uniform(0, 1)
                         else:
                             text = await resp.text()
                             if attempt == retries - 1:
@@ -536,6 +563,7 @@ class KimiSwarm500K:
                                     "error": f"HTTP {resp.status}: {text[:100]}",
                                 }
                 except asyncio.TimeoutError:
+                    self.limiter.record_timeout()
                     if attempt == retries - 1:
                         self.stats["failed"] += 1
                         return {
@@ -543,15 +571,17 @@ class KimiSwarm500K:
                             "status": "error",
                             "error": "timeout",
                         }
-                    await asyncio.sleep(1)
+                    backoff = 1.0
                 except Exception as e:
                     if attempt == retries - 1:
                         self.stats["failed"] += 1
                         return {"task_id": task_id, "status": "error", "error": str(e)}
-                    await asyncio.sleep(1)
+                    backoff = 1.0
+            if backoff:
+                await asyncio.sleep(backoff)
 
-            self.stats["failed"] += 1
-            return {"task_id": task_id, "status": "error", "error": "max retries"}
+        self.stats["failed"] += 1
+        return {"task_id": task_id, "status": "error", "error": "max retries"}
 
     def select_task_type(self, task_id: int) -> Dict:
         """Intelligently select task type based on weights."""
@@ -580,6 +610,99 @@ class KimiSwarm500K:
         results = await asyncio.gather(*tasks, return_exceptions=True)
         return results
 
+    def budget_exhausted(self) -> bool:
+        """True once 95% of the budget has been spent."""
+        return self.stats["cost_usd"] >= BUDGET_USD * 0.95
+
+    def sustained_rate(self) -> float:
+        """Tasks/sec over the last RATE_WINDOW finished tasks."""
+        if len(self.finish_times) < 2:
+            return 0.0
+        span = self.finish_times[-1] - self.finish_times[0]
+        return (len(self.finish_times) - 1) / span if span > 0 else 0.0
+
+    async def _produce(self, queue: asyncio.Queue, total_tasks: int, num_workers: int):
+        """Feed task ids into the bounded queue until done or out of budget."""
+        try:
+            for task_id in range(total_tasks):
+                if self.journal.is_done(task_id):
+                    continue
+                if self.budget_exhausted():
+                    print("💰 Budget limit reached! Stopping gracefully...")
+                    break
+                if not self.running:
+                    break
+                await queue.put((task_id, self.select_task_type(task_id)))
+                self.stats["total_tasks"] += 1
+        finally:
+            # One sentinel per worker so every consumer shuts down
+            for _ in range(num_workers):
+                await queue.put(None)
+
+    async def _consume(self, queue: asyncio.Queue):
+        """Long-lived worker: pull the next task as soon as the previous one is done."""
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                task_id, task_type = item
+                if self.budget_exhausted():
+                    # Drain tasks queued before the budget ran out
+                    self.stats["total_tasks"] -= 1
+                    continue
+                try:
+                    await self.execute_task(task_id, task_type)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    print(f"  ⚠️  Task {task_id} crashed: {type(e).__name__}: {str(e)[:100]}")
+                self._on_task_finished()
+            finally:
+                queue.task_done()
+
+    def _journal_written(self, records: List[Dict]):
+        """Sink flush listener: journal the tasks whose results just reached disk."""
+        for record in records:
+            entry = self.unjournaled.pop(record.get("task_id"), None)
+            if entry is not None:
+                self.journal.record(record["task_id"], *entry)
+        self.journal.flush()
+
+    def _on_task_finished(self):
+        """Progress bookkeeping; checkpoints run in the background, never blocking workers."""
+        self.finished += 1
+        self.finish_times.append(time.time())
+
+        if self.finished % CLAUDE_ORCHESTRATION_INTERVAL == 0:
+            if self.checkpoint_task is None or self.checkpoint_task.done():
+                self.checkpoint_task = asyncio.create_task(self.claude_orchestration_checkpoint())
+
+        if self.finished % STATS_INTERVAL == 0:
+            self.print_stats()
+
+    def resume_from_journal(self) -> bool:
+        """Restore ledger, budget accounting and task weights from the progress journal."""
+        if not self.journal.load():
+            print("ℹ️  No progress journal found - starting a fresh run")
+            return False
+
+        totals = self.journal.totals
+        self.stats["completed"] = totals["completed"]
+        self.stats["total_tasks"] = totals["completed"]
+        self.stats["tokens_used"] = totals["tokens_used"]
+        self.stats["cost_usd"] = totals["cost_usd"]
+        self.stats["estimated_revenue"] = totals["estimated_revenue"]
+        for name, count in totals["by_type"].items():
+            self.stats["by_type"][name] = count
+        if self.journal.task_weights and len(self.journal.task_weights) == len(TASK_TYPES):
+            self.task_weights = list(self.journal.task_weights)
+
+        print(
+            f"♻️  Resuming: {totals['completed']:,} tasks already done "
+            f"(${totals['cost_usd']:.4f} spent, ranges: {len(self.journal.done.ranges)})"
+        )
+        return True
+
     async def claude_orchestration_checkpoint(self):
         """Let Claude analyze and adjust strategy."""
         self.stats["claude_orchestrations"] += 1
@@ -612,6 +735,9 @@ class KimiSwarm500K:
                 self.task_weights[3] = 2.0  # Gold nuggets
                 self.task_weights[4] = 1.5  # Revenue ops
 
+        # Durable snapshot of progress + current weights
+        self.journal.checkpoint(self.task_weights)
+
         print(f"{'=' * 60}\n")
 
     def print_stats(self):
@@ -629,24 +755,34 @@ class KimiSwarm500K:
         print(f"Cost:           ${self.stats['cost_usd']:.4f} / ${BUDGET_USD:.2f}")
         print(f"Est. Revenue:   €{self.stats['estimated_revenue']:,.0f}")
         print(f"ROI:            {(self.stats['estimated_revenue'] / max(self.stats['cost_usd'], 0.01)):.1f}x")
-        print(f"Rate:           {rate:.1f} tasks/sec")
+        print(f"Rate:           {rate:.1f} tasks/sec (sustained: {self.sustained_rate():.1f})")
         print(f"Elapsed:        {elapsed:.1f}s | ETA: {eta:.0f}s")
         print(f"Claude Checks:  {self.stats['claude_orchestrations']}")
+        limiter = self.limiter.snapshot()
+        print(
+            f"Concurrency:    {limiter['window']} / {limiter['max_limit']} "
+            f"(in flight: {limiter['in_flight']}, 429s: {limiter['rate_limited']}, "
+            f"p95: {limiter['p95_latency_sec']:.1f}s)"
+        )
         print("---")
         for task_type in TASK_TYPES:
             count = self.stats["by_type"].get(task_type["type"], 0)
             print(f"{task_type['type'][:25]:25s}: {count:,}")
         print(f"{'=' * 60}\n")
 
-    async def run_swarm(self, total_tasks: int = 10000):
-        """Run the full 500K swarm."""
+    async def run_swarm(self, total_tasks: int = 10000, resume: bool = False):
+        """Run the full 500K swarm (resume=True skips task ids finished in a previous run)."""
         # Validate system capacity before starting
         if not self.validate_max_agent_capacity():
             print("❌ Validation failed. Aborting swarm run.")
             return None
 
+        if not (resume and self.resume_from_journal()):
+            self.journal.reset()
+
         self.stats["start_time"] = time.time()
         await self.init_session()
+        await self.sink.start()
 
         print(f"""
 {"=" * 60}
@@ -662,35 +798,20 @@ class KimiSwarm500K:
 {"=" * 60}
 """)
 
-        batch_size = min(MAX_CONCURRENT, total_tasks)
-        batches = (total_tasks + batch_size - 1) // batch_size
-        task_id = 0
+        num_workers = min(MAX_CONCURRENT, total_tasks)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
 
+        workers = [asyncio.create_task(self._consume(queue)) for _ in range(num_workers)]
         try:
-            for batch in range(batches):
-                # Budget check
-                if self.stats["cost_usd"] >= BUDGET_USD * 0.95:
-                    print("💰 Budget limit reached! Stopping gracefully...")
-                    break
-
-                remaining = total_tasks - task_id
-                current_batch = min(batch_size, remaining)
-
-                await self.run_batch(task_id, current_batch)
-                task_id += current_batch
-
-                # Claude orchestration checkpoint
-                if task_id % CLAUDE_ORCHESTRATION_INTERVAL == 0:
-                    await self.claude_orchestration_checkpoint()
-
-                # Progress update
-                if (batch + 1) % 10 == 0:
-                    self.print_stats()
-
-                # Small delay between batches
-                await asyncio.sleep(BATCH_DELAY)
-
+            await self._produce(queue, total_tasks, num_workers)
+            await asyncio.gather(*workers)
+            if self.checkpoint_task is not None:
+                await self.checkpoint_task
         finally:
+            for worker in workers:
+                worker.cancel()
+            await self.sink.close()
+            self.journal.checkpoint(self.task_weights)
             await self.close_session()
 
         self.print_stats()
@@ -708,6 +829,7 @@ class KimiSwarm500K:
                     "roi": self.stats["estimated_revenue"] / max(self.stats["cost_usd"], 0.01),
                     "by_type": self.stats["by_type"],
                     "duration_sec": time.time() - self.stats["start_time"],
+                    "tasks_per_sec": self.stats["completed"] / max(time.time() - self.stats["start_time"], 0.001),
                     "claude_orchestrations": self.stats["claude_orchestrations"],
                 },
                 f,
@@ -718,6 +840,7 @@ class KimiSwarm500K:
         print("✅ SWARM COMPLETE - MAURICE'S AI EMPIRE")
         print(f"{'=' * 60}")
         print(f"Stats saved:     {output_file}")
+        print(f"Results:         {self.sink.written:,} records in JSONL shards ({OUTPUT_DIR / 'results_index.json'})")
         print(f"Total Revenue:   €{self.stats['estimated_revenue']:,.0f}")
         print(f"Total Cost:      ${self.stats['cost_usd']:.2f}")
         print(f"ROI:             {(self.stats['estimated_revenue'] / max(self.stats['cost_usd'], 0.01)):.0f}x")
@@ -746,6 +869,7 @@ async def main():
     )
     parser.add_argument("--test", action="store_true", help="Test mode (100 tasks)")
     parser.add_argument("--full", action="store_true", help="Full 500K mode (WARNING: expensive!)")
+    parser.add_argument("--resume", action="store_true", help="Resume from the progress journal of a previous run")
     args = parser.parse_args()
 
     if args.test:
@@ -759,7 +883,7 @@ async def main():
         num_tasks = min(args.tasks, TOTAL_AGENTS)
 
     swarm = KimiSwarm500K()
-    await swarm.run_swarm(total_tasks=num_tasks)
+    await swarm.run_swarm(total_tasks=num_tasks, resume=args.resume)
 
 
 if __name__ == "__main__":
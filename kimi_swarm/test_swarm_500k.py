@@ -91,6 +91,8 @@ def _test_swarm_structure():
             "execute_task",
             "select_task_type",
             "run_batch",
+            "budget_exhausted",
+            "sustained_rate",
             "claude_orchestration_checkpoint",
             "print_stats",
             "run_swarm",
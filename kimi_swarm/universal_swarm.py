@@ -20,7 +20,8 @@ from datetime import datetime
 from pathlib import Path
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from systems.kimi_bridge.kimi_client import KimiClient
+from kimi_swarm.adaptive_concurrency import AdaptiveConcurrency
+from systems.kimi_bridge.kimi_client import KimiAPIError, KimiClient
 
 # Configuration
 MAX_CONCURRENT = int(os.getenv("SWARM_CONCURRENCY", 50))
@@ -33,7 +34,7 @@ class UniversalSwarm:
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.stats = {"total": 0, "success": 0, "failed": 0, "start_time": time.time()}
-        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+        self.limiter = AdaptiveConcurrency(max_limit=MAX_CONCURRENT)
 
     async def worker(
         self,
@@ -43,15 +44,17 @@ class UniversalSwarm:
         model: str = None,
         use_local: bool = True,
     ):
-        async with self.semaphore:
+        async with self.limiter:
             messages = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt},
             ]
 
+            started = time.monotonic()
             try:
                 # Use the Hybrid Client
                 response = await self.client.chat(messages, model=model, use_local=use_local)
+                self.limiter.record_success(time.monotonic() - started)
 
                 # Save result
                 self._save_result(task_id, response)
@@ -60,6 +63,15 @@ class UniversalSwarm:
                 # Feedback (brief)
                 print(f"✅ Task {task_id} completed via {response['source']} ({response['model']})")
 
+            except asyncio.TimeoutError:
+                self.limiter.record_timeout()
+                self.stats["failed"] += 1
+                print(f"❌ Task {task_id} failed: timeout")
+            except KimiAPIError as e:
+                if e.status == 429:
+                    self.limiter.record_rate_limit(e.retry_after)
+                self.stats["failed"] += 1
+                print(f"❌ Task {task_id} failed: {e}")
             except Exception as e:
                 self.stats["failed"] += 1
                 print(f"❌ Task {task_id} failed: {e}")
@@ -99,6 +111,7 @@ class UniversalSwarm:
         print(f"\n🏁 Swarm Finished in {duration:.2f}s")
         print(f"   Success: {self.stats['success']}")
         print(f"   Failed:  {self.stats['failed']}")
+        print(f"   Window:  {self.limiter.window} / {self.limiter.max_limit}")
 
 
 async def main():
@@ -19,6 +19,7 @@ import os
 import re
 import shutil
 import subprocess
+import sys
 import zipfile
 from datetime import datetime
 from pathlib import Path
@@ -31,6 +32,15 @@ CONFIG_DIR = MIRROR_DIR / "config"
 
 EXPORT_DIR.mkdir(parents=True, exist_ok=True)
 
+sys.path.append(str(PROJECT_ROOT))
+from workflow_system.state.store import (
+    COWORK_STATE_DB,
+    COWORK_STATE_JSON,
+    WORKFLOW_STATE_DB,
+    WORKFLOW_STATE_JSON,
+    load_snapshot,
+)
+
 
 def load_privacy_rules() -> dict:
     """Load privacy and redaction rules."""
@@ -144,32 +154,22 @@ def collect_task_log() -> list:
     tasks = []
 
     # Workflow state
-    state_file = PROJECT_ROOT / "workflow_system" / "state" / "current_state.json"
-    if state_file.exists():
-        try:
-            state = json.loads(state_file.read_text())
-            for step in state.get("steps_completed", []):
-                tasks.append({
-                    "source": "workflow",
-                    "step": step.get("step", ""),
-                    "timestamp": step.get("timestamp", ""),
-                    "summary": step.get("summary", "")[:200],
-                })
-        except json.JSONDecodeError:
-            pass
+    state = load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
+    for step in state.get("steps_completed", []):
+        tasks.append({
+            "source": "workflow",
+            "step": step.get("step", ""),
+            "timestamp": step.get("timestamp", ""),
+            "summary": step.get("summary", "")[:200],
+        })
 
     # Cowork state
-    cowork_file = PROJECT_ROOT / "workflow_system" / "state" / "cowork_state.json"
-    if cowork_file.exists():
-        try:
-            cowork = json.loads(cowork_file.read_text())
-            for action in cowork.get("actions_taken", [])[-20:]:
-                tasks.append({
-                    "source": "cowork",
-                    "action": str(action)[:200],
-                })
-        except json.JSONDecodeError:
-            pass
+    cowork = load_snapshot(COWORK_STATE_DB, COWORK_STATE_JSON)
+    for action in cowork.get("actions_taken", [])[-20:]:
+        tasks.append({
+            "source": "cowork",
+            "action": str(action)[:200],
+        })
 
     return tasks
 
@@ -227,14 +227,9 @@ def collect_open_tasks() -> list:
                 tasks.append({"source": "chatgpt_tasks", "task": line.strip()[6:100]})
 
     # Cowork pending recommendations
-    cowork_file = PROJECT_ROOT / "workflow_system" / "state" / "cowork_state.json"
-    if cowork_file.exists():
-        try:
-            cowork = json.loads(cowork_file.read_text())
-            for rec in cowork.get("pending_recommendations", []):
-                tasks.append({"source": "cowork", "task": str(rec)[:200]})
-        except json.JSONDecodeError:
-            pass
+    cowork = load_snapshot(COWORK_STATE_DB, COWORK_STATE_JSON)
+    for rec in cowork.get("pending_recommendations", []):
+        tasks.append({"source": "cowork", "task": str(rec)[:200]})
 
     return tasks
 
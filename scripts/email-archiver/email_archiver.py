@@ -5,16 +5,34 @@ Email Archiver System
 - Kategorisiert Mails (Spam, Business, Personal, Legal)
 - Archiviert pfeifer-sicherheit.de Mails forensisch
 - SHA256 Hashes fuer Beweismittel-Integritaet
+
+Pipeline (--scan):
+  IMAP UID FETCH in Batches (Fetch-Thread, PIPELINE_DEPTH Batches voraus)
+  → Parsen + Hashen im Prozess-Pool
+  → ein SQLite-Commit pro Batch (statt einem pro Mail)
+Pro Ordner werden UIDVALIDITY + hoechste archivierte UID gespeichert;
+ein erneuter Scan holt nur neue Mails. Duplikate: UNIQUE-Index auf sha256.
+
+Volltextsuche (--search): FTS5-Index ueber Betreff, Absender und Text,
+per Trigger synchron mit der emails-Tabelle; Ergebnisse nach bm25
+sortiert, mit Snippet und Datum-/Ordner-/Kategorie-Filtern.
 """
 
 import email
 import hashlib
 import imaplib
+import mailbox
 import os
+import queue
+import re
 import sqlite3
 import sys
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from email.header import decode_header
+from email.utils import parsedate_to_datetime
 
 # ============================================
 # CONFIGURATION (NICHT in Git committen!)
@@ -31,6 +49,13 @@ ARCHIVE_DIR = os.path.expanduser("~/.openclaw/email-archiver/archive")
 LEGAL_DIR = os.path.expanduser("~/.openclaw/email-archiver/legal/pfeifer-sicherheit")
 CHAIN_OF_CUSTODY = os.path.expanduser("~/.openclaw/email-archiver/legal/chain_of_custody.json")
 
+FETCH_BATCH_SIZE = 200  # UIDs pro FETCH-Roundtrip = eine SQLite-Transaktion
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+PIPELINE_DEPTH = 2  # so viele Batches holt der Fetch-Thread im Voraus
+CUSTODY_ACTOR = "email_archiver_v1"
+BODY_INDEX_MAX_CHARS = 100_000  # Text pro Mail im Suchindex (Rest steht in der .eml)
+SEARCH_DEFAULT_LIMIT = 20
+
 
 def load_config():
     """Load IMAP config from .env file"""
@@ -60,6 +85,8 @@ def init_db():
     """Initialize SQLite database"""
     os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
     conn = sqlite3.connect(DB_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     c = conn.cursor()
     c.execute("""CREATE TABLE IF NOT EXISTS emails (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -77,7 +104,9 @@ def init_db():
         size_bytes INTEGER,
         has_attachments INTEGER DEFAULT 0,
         spam_score REAL DEFAULT 0.0,
-        notes TEXT
+        notes TEXT,
+        date_utc TEXT,
+        body_text TEXT
     )""")
 
     c.execute("""CREATE TABLE IF NOT EXISTS chain_of_custody (
@@ -91,6 +120,21 @@ def init_db():
         notes TEXT
     )""")
 
+    # Pro Ordner: ab welcher UID neu gescannt wird (gilt nur solange UIDVALIDITY gleich bleibt)
+    c.execute("""CREATE TABLE IF NOT EXISTS folder_state (
+        folder TEXT PRIMARY KEY,
+        uidvalidity INTEGER,
+        last_uid INTEGER,
+        updated TEXT
+    )""")
+
+    try:
+        c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_emails_sha256 ON emails(sha256_hash)")
+    except sqlite3.IntegrityError:
+        # Alt-Datenbank mit doppelten Hashes: Lookup-Index trotzdem anlegen
+        print("WARNUNG: doppelte SHA256-Hashes in der Datenbank, Index nicht eindeutig")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_emails_sha256_lookup ON emails(sha256_hash)")
+
     c.execute("""CREATE TABLE IF NOT EXISTS categories (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT UNIQUE,
@@ -115,10 +159,59 @@ def init_db():
             (name, desc, color),
         )
 
+    init_search_index(conn)
     conn.commit()
     return conn
 
 
+def init_search_index(conn):
+    """Spalten fuer die Suche + FTS5-Tabelle mit Sync-Triggern (idempotent, migriert Alt-DBs)"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(emails)")}
+    # body_text NULL = noch nicht extrahiert (Alt-Daten, siehe --reindex), "" = kein Text
+    if "body_text" not in columns:
+        conn.execute("ALTER TABLE emails ADD COLUMN body_text TEXT")
+    if "date_utc" not in columns:
+        conn.execute("ALTER TABLE emails ADD COLUMN date_utc TEXT")  # ISO 8601, sortierbar
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emails_date_utc ON emails(date_utc)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emails_folder ON emails(folder)")
+
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'emails_fts'").fetchone()
+    if exists:
+        return True
+    try:
+        # External content: der Index speichert nur Tokens, der Text bleibt in emails
+        conn.execute("""CREATE VIRTUAL TABLE emails_fts USING fts5(
+            subject, from_addr, body_text,
+            content='emails', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )""")
+    except sqlite3.OperationalError as e:
+        print(f"WARNUNG: SQLite ohne FTS5 ({e}), Volltextsuche nicht verfuegbar")
+        return False
+    conn.executescript("""
+        CREATE TRIGGER IF NOT EXISTS emails_fts_insert AFTER INSERT ON emails BEGIN
+            INSERT INTO emails_fts(rowid, subject, from_addr, body_text)
+            VALUES (new.id, new.subject, new.from_addr, new.body_text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS emails_fts_delete AFTER DELETE ON emails BEGIN
+            INSERT INTO emails_fts(emails_fts, rowid, subject, from_addr, body_text)
+            VALUES ('delete', old.id, old.subject, old.from_addr, old.body_text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS emails_fts_update AFTER UPDATE OF subject, from_addr, body_text ON emails BEGIN
+            INSERT INTO emails_fts(emails_fts, rowid, subject, from_addr, body_text)
+            VALUES ('delete', old.id, old.subject, old.from_addr, old.body_text);
+            INSERT INTO emails_fts(rowid, subject, from_addr, body_text)
+            VALUES (new.id, new.subject, new.from_addr, new.body_text);
+        END;
+    """)
+    # Ranking: Betreff > Absender > Text. Als gespeicherter rank (statt bm25() im ORDER BY)
+    # sortiert FTS5 intern und kann bei LIMIT frueh abbrechen
+    conn.execute("INSERT INTO emails_fts(emails_fts, rank) VALUES ('rank', 'bm25(5.0, 3.0, 1.0)')")
+    conn.execute("INSERT INTO emails_fts(emails_fts) VALUES ('rebuild')")  # bereits archivierte Mails
+    return True
+
+
 def compute_hash(raw_email_bytes):
     """SHA256 Hash fuer forensische Integritaet"""
     return hashlib.sha256(raw_email_bytes).hexdigest()
@@ -138,6 +231,46 @@ def decode_header_value(value):
     return " ".join(result)
 
 
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.S | re.I)
+
+
+def extract_body_text(msg):
+    """Lesbarer Text einer Mail fuer den Suchindex (text/plain, sonst HTML ohne Tags)"""
+    plain, html = [], []
+    for part in msg.walk():
+        if part.is_multipart() or part.get_content_disposition() == "attachment":
+            continue
+        content_type = part.get_content_type()
+        if content_type not in ("text/plain", "text/html"):
+            continue
+        payload = part.get_payload(decode=True)
+        if not payload:
+            continue
+        try:
+            text = payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+        except LookupError:
+            text = payload.decode("utf-8", errors="replace")
+        (plain if content_type == "text/plain" else html).append(text)
+    if plain:
+        text = "\n".join(plain)
+    else:
+        text = re.sub(r"\s+", " ", _TAG_RE.sub(" ", "\n".join(html)))
+    return text[:BODY_INDEX_MAX_CHARS]
+
+
+def normalize_date(date_header):
+    """Date-Header → ISO 8601 in UTC ("" wenn nicht lesbar)"""
+    try:
+        dt = parsedate_to_datetime(date_header)
+    except (TypeError, ValueError, IndexError):
+        return ""
+    if dt is None:
+        return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
 def categorize_email(from_addr, to_addr, subject, body_preview=""):
     """Kategorisiere Email basierend auf Absender/Betreff"""
     from_lower = (from_addr or "").lower()
@@ -230,15 +363,19 @@ def categorize_email(from_addr, to_addr, subject, body_preview=""):
     return "business", False
 
 
-def save_email_file(raw_bytes, sha256, category, is_legal):
-    """Save .eml file to appropriate directory"""
+def email_file_path(sha256, category, is_legal):
+    """Target path of the .eml file"""
     if is_legal or category == "pfeifer-sicherheit":
         save_dir = LEGAL_DIR
     else:
         save_dir = os.path.join(ARCHIVE_DIR, category)
+    return os.path.join(save_dir, f"{sha256[:16]}.eml")
 
-    os.makedirs(save_dir, exist_ok=True)
-    file_path = os.path.join(save_dir, f"{sha256[:16]}.eml")
+
+def save_email_file(raw_bytes, sha256, category, is_legal):
+    """Save .eml file to appropriate directory"""
+    file_path = email_file_path(sha256, category, is_legal)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
     with open(file_path, "wb") as f:
         f.write(raw_bytes)
@@ -246,171 +383,440 @@ def save_email_file(raw_bytes, sha256, category, is_legal):
     return file_path
 
 
-def log_chain_of_custody(conn, message_id, action, sha256, notes=""):
-    """Log Chain of Custody entry for legal evidence"""
-    c = conn.cursor()
-    c.execute(
-        """INSERT INTO chain_of_custody
-        (email_message_id, action, timestamp, actor, sha256_before, sha256_after, notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?)""",
-        (
-            message_id,
-            action,
-            datetime.utcnow().isoformat(),
-            "email_archiver_v1",
-            sha256,
-            sha256,
-            notes,
-        ),
-    )
-    conn.commit()
+CUSTODY_INSERT = """INSERT INTO chain_of_custody
+    (email_message_id, action, timestamp, actor, sha256_before, sha256_after, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
 
 
-def scan_mailbox(config, folder="INBOX", limit=None):
-    """Scan IMAP mailbox and archive all emails"""
-    conn = init_db()
+def custody_row(message_id, action, sha256, notes=""):
+    return (message_id, action, datetime.utcnow().isoformat(), CUSTODY_ACTOR, sha256, sha256, notes)
 
-    print(f"Verbinde mit {config['IMAP_SERVER']}...")
-    mail = imaplib.IMAP4_SSL(config["IMAP_SERVER"], int(config.get("IMAP_PORT", 993)))
-    mail.login(config["IMAP_USER"], config["IMAP_PASS"])
 
-    # List all folders
-    print("Verfuegbare Ordner:")
-    status, folders = mail.list()
-    for f in folders:
-        print(f"  {f.decode()}")
+def log_chain_of_custody(conn, message_id, action, sha256, notes=""):
+    """Log Chain of Custody entry for legal evidence"""
+    conn.execute(CUSTODY_INSERT, custody_row(message_id, action, sha256, notes))
+    conn.commit()
 
-    mail.select(folder, readonly=True)  # READONLY fuer forensische Integritaet
 
-    # Search all emails
-    status, messages = mail.search(None, "ALL")
-    if status != "OK":
-        print(f"FEHLER: Kann Ordner {folder} nicht durchsuchen")
-        return
+# ============================================
+# INGEST PIPELINE: fetch → parse → bulk insert
+# ============================================
+def parse_message(item):
+    """Hash + Header + Kategorie einer Mail (laeuft im Worker-Prozess)"""
+    uid, raw_bytes = item
+    try:
+        sha256 = compute_hash(raw_bytes)
+        msg = email.message_from_bytes(raw_bytes)
+        from_addr = decode_header_value(msg.get("From", ""))
+        to_addr = decode_header_value(msg.get("To", ""))
+        subject = decode_header_value(msg.get("Subject", ""))
+        category, is_legal = categorize_email(from_addr, to_addr, subject)
+        has_attachments = any(part.get_content_disposition() == "attachment" for part in msg.walk())
+        return {
+            "uid": uid,
+            "sha256": sha256,
+            "message_id": msg.get("Message-ID", f"unknown-{sha256[:16]}"),
+            "from_addr": from_addr,
+            "to_addr": to_addr,
+            "subject": subject,
+            "date_sent": msg.get("Date", ""),
+            "date_utc": normalize_date(msg.get("Date", "")),
+            "body_text": extract_body_text(msg),
+            "category": category,
+            "is_legal": is_legal or category == "pfeifer-sicherheit",
+            "has_attachments": int(has_attachments),
+        }
+    except Exception as e:
+        return {"uid": uid, "error": str(e)}
+
+
+def _prefetch(batches, depth=PIPELINE_DEPTH):
+    """Run a batch generator in a background thread, `depth` batches ahead"""
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+
+    def produce():
+        try:
+            for batch in batches:
+                buffer.put(batch)
+        except Exception as e:
+            buffer.put(e)
+        finally:
+            buffer.put(done)
+
+    threading.Thread(target=produce, name="imap-fetch", daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def _known_hashes(conn, hashes):
+    known = set()
+    hashes = list(hashes)
+    for i in range(0, len(hashes), 500):  # SQLite variable limit
+        chunk = hashes[i : i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        known.update(
+            row[0] for row in conn.execute(f"SELECT sha256_hash FROM emails WHERE sha256_hash IN ({placeholders})", chunk)
+        )
+    return known
+
+
+def _store_batch(conn, folder, batch, parsed, stats, source):
+    """Insert one parsed batch (no commit — the caller commits once per batch)"""
+    known = _known_hashes(conn, (p["sha256"] for p in parsed if "error" not in p))
+    archived_at = datetime.utcnow().isoformat()
+    custody = []
+    for (_, raw_bytes), p in zip(batch, parsed):
+        if "error" in p:
+            print(f"  FEHLER bei Email {p['uid']}: {p['error']}")
+            stats["errors"] += 1
+            continue
+        if p["sha256"] in known:
+            stats["duplicate"] += 1
+            continue
+        file_path = email_file_path(p["sha256"], p["category"], p["is_legal"])
+        cur = conn.execute(
+            """INSERT OR IGNORE INTO emails
+            (message_id, from_addr, to_addr, subject, date_sent, date_archived,
+             category, is_legal_evidence, sha256_hash, file_path, folder,
+             size_bytes, has_attachments, date_utc, body_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                p["message_id"],
+                p["from_addr"],
+                p["to_addr"],
+                p["subject"],
+                p["date_sent"],
+                archived_at,
+                p["category"],
+                int(p["is_legal"]),
+                p["sha256"],
+                file_path,
+                folder,
+                len(raw_bytes),
+                p["has_attachments"],
+                p["date_utc"],
+                p["body_text"],
+            ),
+        )
+        known.add(p["sha256"])
+        if cur.rowcount == 0:  # Message-ID schon archiviert (andere Bytes, z.B. anderer Ordner)
+            stats["duplicate"] += 1
+            continue
+        save_email_file(raw_bytes, p["sha256"], p["category"], p["is_legal"])
 
-    email_ids = messages[0].split()
-    total = len(email_ids)
-    print(f"\nGefunden: {total} Emails in {folder}")
+        if p["is_legal"]:
+            custody.append(custody_row(p["message_id"], "ARCHIVED", p["sha256"], f"Archived from {folder} via {source}"))
+            stats["legal"] += 1
+            if p["category"] == "pfeifer-sicherheit":
+                stats["pfeifer"] += 1
+        stats["total"] += 1
+        stats["new"] += 1
+        stats["categories"][p["category"]] = stats["categories"].get(p["category"], 0) + 1
+    conn.executemany(CUSTODY_INSERT, custody)
 
-    if limit:
-        email_ids = email_ids[-limit:]  # Neueste zuerst
-        print(f"Verarbeite die letzten {limit} Emails")
 
-    stats = {
+def new_stats():
+    return {
         "total": 0,
         "new": 0,
         "duplicate": 0,
+        "errors": 0,
         "categories": {},
         "legal": 0,
         "pfeifer": 0,
+        "seen": 0,
+        "seconds": 0.0,
+        "per_second": 0.0,
     }
 
-    for i, eid in enumerate(email_ids, 1):
-        try:
-            status, msg_data = mail.fetch(eid, "(RFC822)")
-            if status != "OK":
-                continue
-
-            raw_bytes = msg_data[0][1]
-            sha256 = compute_hash(raw_bytes)
-
-            # Check for duplicate
-            c = conn.cursor()
-            c.execute("SELECT id FROM emails WHERE sha256_hash = ?", (sha256,))
-            if c.fetchone():
-                stats["duplicate"] += 1
-                continue
-
-            msg = email.message_from_bytes(raw_bytes)
-
-            # Extract headers
-            from_addr = decode_header_value(msg.get("From", ""))
-            to_addr = decode_header_value(msg.get("To", ""))
-            subject = decode_header_value(msg.get("Subject", ""))
-            date_sent = msg.get("Date", "")
-            message_id = msg.get("Message-ID", f"unknown-{sha256[:16]}")
-
-            # Check attachments
-            has_attachments = 0
-            for part in msg.walk():
-                if part.get_content_disposition() == "attachment":
-                    has_attachments = 1
-                    break
-
-            # Categorize
-            category, is_legal = categorize_email(from_addr, to_addr, subject)
-
-            # Save .eml file
-            file_path = save_email_file(raw_bytes, sha256, category, is_legal)
-
-            # Insert into DB
-            c.execute(
-                """INSERT OR IGNORE INTO emails
-                (message_id, from_addr, to_addr, subject, date_sent, date_archived,
-                 category, is_legal_evidence, sha256_hash, file_path, folder,
-                 size_bytes, has_attachments)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    message_id,
-                    from_addr,
-                    to_addr,
-                    subject,
-                    date_sent,
-                    datetime.utcnow().isoformat(),
-                    category,
-                    int(is_legal),
-                    sha256,
-                    file_path,
-                    folder,
-                    len(raw_bytes),
-                    has_attachments,
-                ),
-            )
+
+def ingest_batches(conn, folder, batches, total, source, workers=PARSE_WORKERS, on_batch=None):
+    """Parse batches of (uid, raw_bytes) in a process pool and store them, one commit per batch.
+
+    on_batch(conn, batch, parsed) runs inside the batch transaction (e.g. to advance the high-water mark).
+    """
+    stats = new_stats()
+    started = time.monotonic()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for batch in _prefetch(batches):
+            if executor is not None:
+                parsed = list(executor.map(parse_message, batch, chunksize=max(1, len(batch) // (workers * 4))))
+            else:
+                parsed = [parse_message(item) for item in batch]
+            _store_batch(conn, folder, batch, parsed, stats, source)
+            if on_batch is not None:
+                on_batch(conn, batch, parsed)
             conn.commit()
 
-            # Chain of Custody for legal evidence
-            if is_legal or category == "pfeifer-sicherheit":
-                log_chain_of_custody(
-                    conn,
-                    message_id,
-                    "ARCHIVED",
-                    sha256,
-                    f"Archived from {folder} via IMAP (readonly)",
-                )
-                stats["legal"] += 1
-                if category == "pfeifer-sicherheit":
-                    stats["pfeifer"] += 1
-
-            stats["total"] += 1
-            stats["new"] += 1
-            stats["categories"][category] = stats["categories"].get(category, 0) + 1
-
-            # Progress
-            if i % 50 == 0 or i == len(email_ids):
-                print(f"  [{i}/{len(email_ids)}] {category}: {subject[:60]}")
+            stats["seen"] += len(batch)
+            rate = stats["seen"] / max(time.monotonic() - started, 1e-6)
+            print(f"  [{stats['seen']}/{total}] {stats['new']} neu, {stats['duplicate']} Duplikate ({rate:.0f} Mails/s)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.monotonic() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["per_second"] = round(stats["seen"] / max(elapsed, 1e-6), 1)
+    return stats
 
-        except Exception as e:
-            print(f"  FEHLER bei Email {eid}: {e}")
-            continue
 
-    mail.logout()
+# ============================================
+# IMAP
+# ============================================
+def _uid_set(uids):
+    """Sorted UIDs → compact IMAP sequence set ("1:50,52,60:70")"""
+    parts = []
+    start = prev = uids[0]
+    for uid in uids[1:]:
+        if uid != prev + 1:
+            parts.append(f"{start}:{prev}" if start != prev else str(start))
+            start = uid
+        prev = uid
+    parts.append(f"{start}:{prev}" if start != prev else str(start))
+    return ",".join(parts)
+
+
+def _imap_batches(mail, uids, batch_size):
+    """UID FETCH in Batches → [(uid, raw_bytes), ...] pro Batch"""
+    for i in range(0, len(uids), batch_size):
+        chunk = uids[i : i + batch_size]
+        status, data = mail.uid("FETCH", _uid_set(chunk), "(RFC822)")
+        if status != "OK":
+            # Abbrechen statt ueberspringen: die Markierung darf nicht ueber fehlende Mails hinweg wandern
+            print(f"  FEHLER: FETCH fuer UIDs {chunk[0]}-{chunk[-1]} fehlgeschlagen, Scan gestoppt")
+            return
+        batch = []
+        for part in data:
+            if isinstance(part, tuple):
+                match = re.search(rb"UID (\d+)", part[0])
+                if match:
+                    batch.append((int(match.group(1)), part[1]))
+        batch.sort(key=lambda item: item[0])
+        yield batch
+
+
+def _folder_state(conn, folder):
+    row = conn.execute("SELECT uidvalidity, last_uid FROM folder_state WHERE folder = ?", (folder,)).fetchone()
+    return row if row else (None, 0)
+
+
+def _save_folder_state(conn, folder, uidvalidity, last_uid):
+    conn.execute(
+        "INSERT OR REPLACE INTO folder_state (folder, uidvalidity, last_uid, updated) VALUES (?, ?, ?, ?)",
+        (folder, uidvalidity, last_uid, datetime.utcnow().isoformat()),
+    )
 
-    # Print summary
+
+def print_summary(folder, stats):
     print(f"\n{'=' * 60}")
     print(f"SCAN ABGESCHLOSSEN: {folder}")
     print(f"{'=' * 60}")
     print(f"Gesamt verarbeitet:  {stats['total']}")
     print(f"Neu archiviert:      {stats['new']}")
     print(f"Duplikate:           {stats['duplicate']}")
+    print(f"Fehler:              {stats['errors']}")
     print(f"Legal/Beweismittel:  {stats['legal']}")
     print(f"pfeifer-sicherheit:  {stats['pfeifer']}")
+    print(f"Durchsatz:           {stats['per_second']} Mails/s ({stats['seconds']}s)")
     print("\nKategorien:")
     for cat, count in sorted(stats["categories"].items(), key=lambda x: -x[1]):
         print(f"  {cat}: {count}")
 
+
+def scan_mailbox(config, folder="INBOX", limit=None, workers=PARSE_WORKERS, batch_size=FETCH_BATCH_SIZE):
+    """Scan IMAP mailbox and archive new emails (only UIDs above the stored high-water mark)"""
+    conn = init_db()
+
+    print(f"Verbinde mit {config['IMAP_SERVER']}...")
+    mail = imaplib.IMAP4_SSL(config["IMAP_SERVER"], int(config.get("IMAP_PORT", 993)))
+    mail.login(config["IMAP_USER"], config["IMAP_PASS"])
+
+    # List all folders
+    print("Verfuegbare Ordner:")
+    status, folders = mail.list()
+    for f in folders:
+        print(f"  {f.decode()}")
+
+    status, _ = mail.select(folder, readonly=True)  # READONLY fuer forensische Integritaet
+    if status != "OK":
+        print(f"FEHLER: Kann Ordner {folder} nicht oeffnen")
+        mail.logout()
+        return
+
+    _, uidvalidity_data = mail.response("UIDVALIDITY")
+    uidvalidity = int(uidvalidity_data[0]) if uidvalidity_data and uidvalidity_data[0] else 0
+    stored_validity, last_uid = _folder_state(conn, folder)
+    if stored_validity is not None and stored_validity != uidvalidity:
+        print(f"UIDVALIDITY von {folder} geaendert → kompletter Rescan (Duplikate per SHA256 erkannt)")
+        last_uid = 0
+
+    # Only UIDs above the high-water mark ("n:*" always returns the newest UID, hence the filter)
+    status, messages = mail.uid("SEARCH", None, f"UID {last_uid + 1}:*")
+    if status != "OK":
+        print(f"FEHLER: Kann Ordner {folder} nicht durchsuchen")
+        mail.logout()
+        return
+    uids = sorted(int(u) for u in messages[0].split() if int(u) > last_uid)
+    print(f"\nGefunden: {len(uids)} neue Emails in {folder} (seit UID {last_uid})")
+
+    track = True
+    if limit and len(uids) > limit:
+        uids = uids[-limit:]  # Neueste zuerst
+        track = False  # aeltere Mails bleiben offen → Markierung nicht verschieben
+        print(f"Verarbeite die letzten {limit} Emails (UID-Markierung bleibt unveraendert)")
+
+    failed_uid = None
+
+    def advance(conn, batch, parsed):
+        # Die Markierung bleibt vor der ersten fehlerhaften Mail stehen → naechster Scan holt sie erneut
+        nonlocal failed_uid
+        if not track or failed_uid is not None:
+            return
+        mark = None
+        for (uid, _), p in zip(batch, parsed):
+            if "error" in p:
+                failed_uid = uid
+                print(f"  UID-Markierung bleibt vor UID {uid} stehen (Parse-Fehler)")
+                break
+            mark = uid
+        if mark is not None:
+            _save_folder_state(conn, folder, uidvalidity, mark)
+
+    stats = new_stats()
+    if uids:
+        stats = ingest_batches(
+            conn,
+            folder,
+            _imap_batches(mail, uids, batch_size),
+            len(uids),
+            "IMAP (readonly)",
+            workers=workers,
+            on_batch=advance,
+        )
+    elif track:
+        _save_folder_state(conn, folder, uidvalidity, last_uid)
+        conn.commit()
+
+    mail.logout()
+    if uids:
+        print_summary(folder, stats)
     return stats
 
 
+def import_mbox(path, workers=PARSE_WORKERS, batch_size=FETCH_BATCH_SIZE):
+    """Archive an mbox file through the same pipeline (also a local benchmark for --scan)"""
+    conn = init_db()
+    box = mailbox.mbox(path, create=False)
+    keys = list(box.keys())
+    folder = f"mbox:{os.path.basename(path)}"
+    print(f"Gefunden: {len(keys)} Emails in {path}")
+
+    def batches():
+        for i in range(0, len(keys), batch_size):
+            yield [(n, box.get_bytes(key)) for n, key in enumerate(keys[i : i + batch_size], i + 1)]
+
+    stats = ingest_batches(conn, folder, batches(), len(keys), "mbox import", workers=workers)
+    box.close()
+    print_summary(folder, stats)
+    return stats
+
+
+# ============================================
+# SUCHE (FTS5)
+# ============================================
+def fts_query(text):
+    """Freitext → FTS5-Ausdruck: jedes Wort als Phrase (UND), "wort*" bleibt Praefixsuche"""
+    terms = []
+    for token in text.split():
+        prefix = token.endswith("*")
+        token = token.rstrip("*").replace('"', "")
+        if token:
+            terms.append(f'"{token}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_emails(query, folder=None, category=None, since=None, until=None, limit=SEARCH_DEFAULT_LIMIT, raw=False, conn=None):
+    """Ranked full-text search (bm25: Betreff > Absender > Text) with snippet.
+
+    since/until: ISO-Datum ("2024-01-31"), beide inklusive, gegen das UTC-Sendedatum.
+    raw=True reicht `query` unveraendert als FTS5-Syntax durch (OR, NEAR, Spalte:wort).
+    """
+    match = query if raw else fts_query(query)
+    if not match:
+        return []
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(DB_FILE)
+    sql = """SELECT e.id, e.date_utc, e.date_sent, e.from_addr, e.subject, e.folder, e.category,
+                    e.file_path, snippet(emails_fts, -1, '[', ']', ' ... ', 12),
+                    emails_fts.rank
+             FROM emails_fts JOIN emails e ON e.id = emails_fts.rowid
+             WHERE emails_fts MATCH ?"""
+    args = [match]
+    if folder:
+        sql += " AND e.folder = ?"
+        args.append(folder)
+    if category:
+        sql += " AND e.category = ?"
+        args.append(category)
+    if since or until:
+        sql += " AND e.date_utc != ''"  # Mails ohne Datum passen zu keinem Zeitraum
+    if since:
+        sql += " AND e.date_utc >= ?"
+        args.append(since)
+    if until:
+        sql += " AND substr(e.date_utc, 1, 10) <= ?"
+        args.append(until)
+    sql += " ORDER BY emails_fts.rank LIMIT ?"
+    args.append(limit)
+    try:
+        rows = conn.execute(sql, args).fetchall()
+    finally:
+        if own_conn:
+            conn.close()
+    keys = ("id", "date_utc", "date_sent", "from_addr", "subject", "folder", "category", "file_path", "snippet", "score")
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def reindex_bodies(batch_size=500):
+    """Text + UTC-Datum fuer Mails nachtragen, die vor der Suche archiviert wurden (aus den .eml)"""
+    conn = init_db()
+    rows = conn.execute("SELECT id, file_path, date_sent FROM emails WHERE body_text IS NULL").fetchall()
+    print(f"Nachzuindizieren: {len(rows)} Emails")
+    for i in range(0, len(rows), batch_size):
+        updates = []
+        for email_id, file_path, date_sent in rows[i : i + batch_size]:
+            try:
+                with open(file_path, "rb") as f:
+                    body = extract_body_text(email.message_from_bytes(f.read()))
+            except (OSError, TypeError):
+                body = ""  # .eml fehlt → nicht bei jedem Lauf erneut versuchen
+            updates.append((body, normalize_date(date_sent or ""), email_id))
+        conn.executemany("UPDATE emails SET body_text = ?, date_utc = ? WHERE id = ?", updates)
+        conn.commit()  # Trigger halten emails_fts synchron
+        print(f"  [{min(i + batch_size, len(rows))}/{len(rows)}]")
+    conn.close()
+
+
+def print_search_results(results):
+    if not results:
+        print("Keine Treffer.")
+        return
+    for n, hit in enumerate(results, 1):
+        date = (hit["date_utc"] or hit["date_sent"] or "")[:10]
+        print(f"{n:3d}. {date}  {hit['from_addr'][:40]}  [{hit['folder']}/{hit['category']}]")
+        print(f"     {hit['subject'][:100]}")
+        print(f"     {' '.join(hit['snippet'].split())}")
+        print(f"     {hit['file_path']}")
+
+
 def export_legal_report(output_file=None):
     """Export forensischer Report fuer Anwalt"""
     conn = sqlite3.connect(DB_FILE)
@@ -510,9 +916,9 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Email Archiver System")
     parser.add_argument("--scan", action="store_true", help="Scan und archiviere alle Emails")
-    parser.add_argument("--folder", default="INBOX", help="IMAP Ordner (default: INBOX)")
+    parser.add_argument("--folder", help="IMAP Ordner (default: INBOX) / Filter fuer --search")
     parser.add_argument("--all-folders", action="store_true", help="Alle Ordner scannen")
-    parser.add_argument("--limit", type=int, help="Max Emails pro Ordner")
+    parser.add_argument("--limit", type=int, help="Max Emails pro Ordner / Max Treffer bei --search")
     parser.add_argument("--stats", action="store_true", help="Zeige Statistiken")
     parser.add_argument("--legal-report", action="store_true", help="Beweismittel-Report erstellen")
     parser.add_argument(
@@ -520,6 +926,15 @@ if __name__ == "__main__":
         action="store_true",
         help="Nur pfeifer-sicherheit.de exportieren",
     )
+    parser.add_argument("--search", metavar="BEGRIFFE", help="Volltextsuche (Betreff, Absender, Text)")
+    parser.add_argument("--raw-query", action="store_true", help="--search als FTS5-Syntax (OR, NEAR, subject:...)")
+    parser.add_argument("--category", help="Filter fuer --search")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", help="Filter fuer --search (inklusive)")
+    parser.add_argument("--until", metavar="YYYY-MM-DD", help="Filter fuer --search (inklusive)")
+    parser.add_argument("--reindex", action="store_true", help="Suchindex fuer bereits archivierte Mails nachtragen")
+    parser.add_argument("--import-mbox", metavar="PFAD", help="mbox-Datei archivieren (lokaler Benchmark)")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS, help="Parser-Prozesse")
+    parser.add_argument("--batch-size", type=int, default=FETCH_BATCH_SIZE, help="UIDs pro FETCH / Transaktion")
 
     args = parser.parse_args()
 
@@ -537,9 +952,34 @@ if __name__ == "__main__":
             for f in folders:
                 folder_name = f.decode().split('"')[-2] if '"' in f.decode() else "INBOX"
                 print(f"\n--- Scanne Ordner: {folder_name} ---")
-                scan_mailbox(config, folder_name, args.limit)
+                scan_mailbox(config, folder_name, args.limit, args.workers, args.batch_size)
         else:
-            scan_mailbox(config, args.folder, args.limit)
+            scan_mailbox(config, args.folder or "INBOX", args.limit, args.workers, args.batch_size)
+    elif args.import_mbox:
+        import_mbox(args.import_mbox, args.workers, args.batch_size)
+    elif args.search:
+        if not os.path.exists(DB_FILE):
+            print("Keine Datenbank gefunden. Fuehre zuerst --scan aus.")
+            sys.exit(1)
+        init_db().close()  # Alt-DB: Suchindex anlegen
+        started = time.perf_counter()
+        try:
+            results = search_emails(
+                args.search,
+                folder=args.folder,
+                category=args.category,
+                since=args.since,
+                until=args.until,
+                limit=args.limit or SEARCH_DEFAULT_LIMIT,
+                raw=args.raw_query,
+            )
+        except sqlite3.OperationalError as e:
+            print(f"FEHLER: Suche fehlgeschlagen ({e})")
+            sys.exit(1)
+        print_search_results(results)
+        print(f"\n{len(results)} Treffer in {(time.perf_counter() - started) * 1000:.1f} ms")
+    elif args.reindex:
+        reindex_bodies()
     elif args.legal_report:
         export_legal_report()
     else:
@@ -548,5 +988,7 @@ if __name__ == "__main__":
         print("  python email_archiver.py --scan                    # Inbox scannen")
         print("  python email_archiver.py --scan --all-folders      # ALLE Ordner")
         print("  python email_archiver.py --scan --limit 100        # Letzte 100")
+        print("  python email_archiver.py --import-mbox inbox.mbox  # mbox archivieren")
+        print('  python email_archiver.py --search "rechnung mai*" --since 2024-01-01')
         print("  python email_archiver.py --stats                   # Statistiken")
         print("  python email_archiver.py --legal-report            # Beweismittel-Report")
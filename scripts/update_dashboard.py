@@ -71,17 +71,13 @@ def get_system_health():
 
 def get_workflow_state():
     """Read workflow cycle info."""
-    p = ROOT_DIR / "workflow_system" / "state" / "current_state.json"
-    if p.exists():
-        try:
-            s = json.loads(p.read_text())
-            return {
-                "cycle": s.get("cycle", 0),
-                "steps": len(s.get("steps_completed", [])),
-            }
-        except Exception:
-            pass
-    return {"cycle": 0, "steps": 0}
+    from state.store import WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON, load_snapshot
+
+    s = load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
+    return {
+        "cycle": s.get("cycle", 0),
+        "steps": len(s.get("steps_completed", [])),
+    }
 
 
 def collect_stats():
@@ -1,15 +1,32 @@
 import asyncio
+import json
 import logging
 import os
-from typing import Any, Dict, Optional
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
 
 import aiohttp
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from antigravity.http_pool import pooled_session
+from antigravity.response_cache import get_response_cache, make_key
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("kimi_client")
 
 
+class KimiAPIError(Exception):
+    """Non-200 answer from the Moonshot API (status lets callers tell 429 from other failures)."""
+
+    def __init__(self, status: int, text: str, retry_after: Optional[str] = None):
+        super().__init__(f"Moonshot API Error: {status} - {text}")
+        self.status = status
+        self.retry_after = retry_after
+
+
 class KimiClient:
     """
     Hybrid Client for 'Kimi' Intelligence.
@@ -28,6 +45,7 @@ class KimiClient:
         # Default to a common local IP or localhost if bridged via USB
         self.ipad_url = os.getenv("IPAD_LLM_URL", "http://192.168.178.45:3000/v1")
         self.ipad_model = "default"  # Most iPad apps ignore this or use loaded model
+        self.cache = get_response_cache()
 
     async def _check_ipad(self) -> bool:
         """Check if iPad Compute Node is available."""
@@ -36,8 +54,8 @@ class KimiClient:
         try:
             # Short timeout for check
             timeout = aiohttp.ClientTimeout(total=2)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(f"{self.ipad_url}/models") as resp:
+            async with pooled_session() as session:
+                async with session.get(f"{self.ipad_url}/models", timeout=timeout) as resp:
                     if resp.status == 200:
                         logger.info("📱 iPad Compute Node DETECTED! Offloading task...")
                         return True
@@ -58,7 +76,24 @@ class KimiClient:
         1. iPad Compute Node (if available & use_local=True) - Saves Mac resources
         2. Local Mac Ollama (if use_local=True) - Backup local
         3. Moonshot Cloud API - High intel / Fallback
+
+        Low-temperature calls are served from the shared response cache.
         """
+        cache_key = None
+        if self.cache.cacheable(temperature):
+            provider = "kimi_hybrid" if use_local else "moonshot"
+            cache_key = make_key(provider, model or self.api_model, messages, temperature)
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        response = await self._chat_uncached(messages, temperature, use_local)
+        if cache_key and response.get("content"):
+            await self.cache.aput(cache_key, response, provider=response["source"], model=response["model"])
+        return response
+
+    async def _chat_uncached(self, messages: list, temperature: float, use_local: bool) -> Dict[str, Any]:
+        """Provider cascade behind chat()."""
         if use_local:
             # 1. Try iPad
             if await self._check_ipad():
@@ -95,11 +130,121 @@ class KimiClient:
         response = await self._chat_api(messages, temperature)
         return {"content": response, "source": "moonshot_api", "model": self.api_model}
 
+    async def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        use_local: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of chat(): yields meta / token / done / error events
+        (format of antigravity/token_stream.py).
+        Local Ollama first, Moonshot as fallback — failover only before the first token.
+        """
+        sources = []
+        if use_local:
+            sources.append(("local_ollama", self.local_model, self._stream_ollama))
+        if self.api_key:
+            sources.append(("moonshot_api", self.api_model, self._stream_api))
+
+        errors = []
+        for source, model, stream in sources:
+            start = time.time()
+            ttft_ms = None
+            try:
+                async for chunk in stream(messages, temperature):
+                    if ttft_ms is None:
+                        ttft_ms = (time.time() - start) * 1000
+                        yield {"type": "meta", "source": source, "model": model}
+                    yield {"type": "token", "content": chunk}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{source} stream failed: {e}")
+                errors.append(f"{source}: {e}")
+                if ttft_ms is not None:
+                    yield {"type": "error", "source": source, "errors": errors}
+                    return
+                continue
+            latency_ms = (time.time() - start) * 1000
+            yield {
+                "type": "done",
+                "source": source,
+                "ttft_ms": round(ttft_ms or latency_ms, 1),
+                "latency_ms": round(latency_ms, 1),
+            }
+            return
+
+        if not self.api_key:
+            errors.append("no MOONSHOT_API_KEY provided for fallback")
+        yield {"type": "error", "errors": errors}
+
+    async def _stream_ollama(self, messages: list, temperature: float) -> AsyncIterator[str]:
+        """Ollama /api/chat with stream=True (newline-delimited JSON)."""
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=120)
+        payload = {
+            "model": self.local_model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+        }
+        async with pooled_session() as session:
+            async with session.post(f"{self.ollama_url}/api/chat", json=payload, timeout=timeout) as resp:
+                if resp.status != 200:
+                    text = await resp.text()
+                    raise Exception(f"Ollama HTTP {resp.status}: {text[:200]}")
+                async for line in resp.content:
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    content = chunk.get("message", {}).get("content", "")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        break
+
+    async def _stream_api(self, messages: list, temperature: float) -> AsyncIterator[str]:
+        """Moonshot API with stream=True (OpenAI-style SSE)."""
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=120)  # long answers may stream past the pool's total
+        payload = {
+            "model": self.api_model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        async with pooled_session() as session:
+            async with session.post(
+                "https://api.moonshot.ai/v1/chat/completions",
+                json=payload,
+                headers=headers,
+                timeout=timeout,
+            ) as resp:
+                if resp.status != 200:
+                    text = await resp.text()
+                    raise KimiAPIError(resp.status, text, resp.headers.get("Retry-After"))
+                async for raw in resp.content:
+                    line = raw.decode("utf-8", errors="replace").strip()
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = json.loads(data)["choices"][0].get("delta", {})
+                    except (json.JSONDecodeError, KeyError, IndexError):
+                        continue
+                    if delta.get("content"):
+                        yield delta["content"]
+
     async def _chat_ipad(self, messages: list, temperature: float) -> str:
         """Internal method to call iPad LLM Server (OpenAI compatible)."""
         # Apple Neural Engine can be slow on first token, give it 180s
         timeout = aiohttp.ClientTimeout(total=180)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with pooled_session() as session:
             payload = {
                 "model": self.ipad_model,
                 "messages": messages,
@@ -109,7 +254,7 @@ class KimiClient:
             target_url = f"{self.ipad_url.rstrip('/v1')}/v1/chat/completions"
 
             try:
-                async with session.post(target_url, json=payload) as resp:
+                async with session.post(target_url, json=payload, timeout=timeout) as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         return data["choices"][0]["message"]["content"]
@@ -122,7 +267,7 @@ class KimiClient:
     async def _chat_ollama(self, messages: list, temperature: float) -> str:
         """Internal method to call Ollama. Uses 120s timeout for large models like glm-4.7-flash (19GB)."""
         timeout = aiohttp.ClientTimeout(total=120)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with pooled_session() as session:
             payload = {
                 "model": self.local_model,
                 "messages": messages,
@@ -130,7 +275,7 @@ class KimiClient:
                 "stream": False,
             }
             try:
-                async with session.post(f"{self.ollama_url}/api/chat", json=payload) as resp:
+                async with session.post(f"{self.ollama_url}/api/chat", json=payload, timeout=timeout) as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         return data["message"]["content"]
@@ -138,7 +283,9 @@ class KimiClient:
                         # Try fallback model (smaller, faster)
                         logger.info(f"Model {self.local_model} not found, trying {self.fallback_local_model}")
                         payload["model"] = self.fallback_local_model
-                        async with session.post(f"{self.ollama_url}/api/chat", json=payload) as resp_fallback:
+                        async with session.post(
+                            f"{self.ollama_url}/api/chat", json=payload, timeout=timeout
+                        ) as resp_fallback:
                             if resp_fallback.status == 200:
                                 data = await resp_fallback.json()
                                 self.local_model = self.fallback_local_model  # Cache for next calls
@@ -157,7 +304,7 @@ class KimiClient:
 
     async def _chat_api(self, messages: list, temperature: float) -> str:
         """Internal method to call Moonshot API."""
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             payload = {
                 "model": self.api_model,
                 "messages": messages,
@@ -177,4 +324,4 @@ class KimiClient:
                     return data["choices"][0]["message"]["content"]
                 else:
                     text = await resp.text()
-                    raise Exception(f"Moonshot API Error: {resp.status} - {text}")
+                    raise KimiAPIError(resp.status, text, resp.headers.get("Retry-After"))
@@ -4,9 +4,13 @@ from typing import List, Optional
 
 import uvicorn
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from kimi_client import KimiClient
 from pydantic import BaseModel
 
+from antigravity.http_pool import aclose_all
+from antigravity.token_stream import SSE_HEADERS, coalesced, sse_events
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("kimi_bridge_server")
@@ -32,6 +36,11 @@ class ChatRequest(BaseModel):
     use_local: Optional[bool] = True
 
 
+@app.on_event("shutdown")
+async def close_http_pools():
+    await aclose_all()
+
+
 @app.get("/health")
 async def health_check():
     return {
@@ -59,6 +68,18 @@ async def chat_endpoint(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """Same request as /chat, answered as Server-Sent Events while tokens arrive."""
+    messages_dict = [{"role": m.role, "content": m.content} for m in request.messages]
+    events = client.chat_stream(
+        messages=messages_dict,
+        temperature=request.temperature,
+        use_local=request.use_local,
+    )
+    return StreamingResponse(sse_events(coalesced(events)), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 if __name__ == "__main__":
     port = int(os.getenv("KIMI_BRIDGE_PORT", 8090))
     uvicorn.run(app, host="0.0.0.0", port=port)
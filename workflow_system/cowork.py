@@ -30,12 +30,13 @@ from typing import Dict, Optional
 
 import aiohttp
 from resource_guard import ResourceGuard
+from state.store import COWORK_LOGS, WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON, cowork_backend, load_snapshot
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 WORKFLOW_DIR = Path(__file__).parent
 COWORK_DIR = WORKFLOW_DIR / "cowork_output"
-COWORK_STATE_FILE = WORKFLOW_DIR / "state" / "cowork_state.json"
+MAX_ACTIONS = 50  # actions_taken keeps only the newest N
 
 COWORK_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -80,22 +81,27 @@ FOCUS_AREAS = {
 
 def load_cowork_state() -> Dict:
     """Load persistent cowork state."""
-    if COWORK_STATE_FILE.exists():
-        return json.loads(COWORK_STATE_FILE.read_text())
-    return {
-        "created": datetime.now().isoformat(),
-        "total_cycles": 0,
-        "actions_taken": [],
-        "observations": [],
-        "active_focus": "revenue",
-        "pending_recommendations": [],
-        "patterns_discovered": [],
+    backend = cowork_backend()
+    if backend.get_meta("created") is None:
+        backend.set_meta(created=datetime.now().isoformat())
+    state = {
+        "created": backend.get_meta("created"),
+        "total_cycles": backend.get_meta("total_cycles", 0),
+        "actions_taken": backend.read_log("actions_taken", limit=MAX_ACTIONS),
+        "observations": backend.get_meta("observations", []),
+        "active_focus": backend.get_meta("active_focus", "revenue"),
+        "pending_recommendations": backend.get_meta("pending_recommendations", []),
+        "patterns_discovered": backend.read_log("patterns_discovered"),
     }
+    updated = backend.get_meta("updated")
+    if updated:
+        state["updated"] = updated
+    return state
 
 
 def save_cowork_state(state: Dict) -> None:
-    state["updated"] = datetime.now().isoformat()
-    COWORK_STATE_FILE.write_text(json.dumps(state, indent=2, ensure_ascii=False))
+    """Persist the whole cowork state (full rewrite — run_cycle uses targeted updates)."""
+    cowork_backend().replace(state, logs=COWORK_LOGS)
 
 
 # ── OBSERVE ──────────────────────────────────────────────
@@ -125,7 +131,20 @@ def observe_project() -> Dict:
     for rel_path, key in scan_targets:
         target = PROJECT_ROOT / rel_path
         if target.exists():
-            if target.is_dir():
+            shard_index = target / "results_index.json"
+            if shard_index.exists():
+                # Swarm results live in JSONL shards - read counts from the index instead of walking files
+                index = json.loads(shard_index.read_text())
+                observations["files"][key] = {
+                    "count": sum(
+                        shard.get("records", 0)
+                        for entry in index.get("task_types", {}).values()
+                        for shard in entry.get("shards", [])
+                    ),
+                    "recent": sorted(index.get("task_types", {}))[:5],
+                    "newest_age_hours": _file_age_hours(shard_index),
+                }
+            elif target.is_dir():
                 files = sorted(
                     target.glob("*"),
                     key=lambda f: f.stat().st_mtime if f.exists() else 0,
@@ -143,9 +162,8 @@ def observe_project() -> Dict:
                 }
 
     # Check workflow state
-    wf_state_file = WORKFLOW_DIR / "state" / "current_state.json"
-    if wf_state_file.exists():
-        wf_state = json.loads(wf_state_file.read_text())
+    wf_state = load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
+    if wf_state:
         observations["system_health"]["workflow_cycle"] = wf_state.get("cycle", 0)
         observations["system_health"]["steps_completed"] = len(wf_state.get("steps_completed", []))
         observations["system_health"]["patterns_count"] = len(wf_state.get("patterns", []))
@@ -399,7 +417,7 @@ async def run_cycle(focus: Optional[str] = None, guard: Optional[ResourceGuard]
     async with guard.check() as gs:
         if gs.paused:
             print("  GUARD: System overloaded. Cycle deferred.")
-            save_cowork_state(state)
+            cowork_backend().set_meta(total_cycles=cycle_num, active_focus=state.get("active_focus", "revenue"))
             return {
                 "cycle": cycle_num,
                 "status": "deferred_by_guard",
@@ -448,25 +466,24 @@ async def run_cycle(focus: Optional[str] = None, guard: Optional[ResourceGuard]
     print(f"         Score: {score}/10")
     print(f"         Learned: {reflection.get('what_worked', 'N/A')[:60]}")
 
-    # Update state
-    state["actions_taken"].append(
+    # Update state (row appends, no whole-state rewrite)
+    backend = cowork_backend()
+    backend.append_log(
+        "actions_taken",
         {
             "cycle": cycle_num,
             "timestamp": datetime.now().isoformat(),
             "action": action_title,
             "score": score,
             "focus": state.get("active_focus"),
-        }
+        },
+        keep=MAX_ACTIONS,
     )
 
-    # Keep only last 50 actions
-    if len(state["actions_taken"]) > 50:
-        state["actions_taken"] = state["actions_taken"][-50:]
-
     # Store pattern if discovered
     pattern = reflection.get("pattern_discovered", {})
     if pattern and pattern.get("name"):
-        state.setdefault("patterns_discovered", []).append(pattern)
+        backend.append_log("patterns_discovered", pattern)
 
     # Shift focus if recommended
     recommended = reflection.get("recommended_focus_shift", "stay")
@@ -478,7 +495,11 @@ async def run_cycle(focus: Optional[str] = None, guard: Optional[ResourceGuard]
     secondary = plan.get("secondary_actions", [])
     state["pending_recommendations"] = secondary[:5]
 
-    save_cowork_state(state)
+    backend.set_meta(
+        total_cycles=cycle_num,
+        active_focus=state.get("active_focus"),
+        pending_recommendations=state["pending_recommendations"],
+    )
 
     # Save cycle output
     cycle_file = COWORK_DIR / f"cycle_{cycle_num:04d}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -67,9 +67,16 @@ def show_full_status():
     print()
 
     # 2. Workflow System
-    state_file = WORKFLOW_DIR / "state" / "current_state.json"
-    if state_file.exists():
-        state = json.loads(state_file.read_text())
+    from state.store import (
+        COWORK_STATE_DB,
+        COWORK_STATE_JSON,
+        WORKFLOW_STATE_DB,
+        WORKFLOW_STATE_JSON,
+        load_snapshot,
+    )
+
+    state = load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
+    if state:
         cycle = state.get("cycle", 0)
         steps = len(state.get("steps_completed", []))
         patterns = len(state.get("patterns", []))
@@ -91,9 +98,8 @@ def show_full_status():
     print()
 
     # 3. Cowork Engine
-    cowork_file = WORKFLOW_DIR / "state" / "cowork_state.json"
-    if cowork_file.exists():
-        cw = json.loads(cowork_file.read_text())
+    cw = load_snapshot(COWORK_STATE_DB, COWORK_STATE_JSON)
+    if cw:
         print("  COWORK:")
         print(f"    Cycles:   {cw.get('total_cycles', 0)}")
         print(f"    Focus:    {cw.get('active_focus', 'N/A')}")
@@ -9,10 +9,17 @@ Step 3 - ANALYST:    Engineering review with tradeoffs
 Step 4 - REFINERY:   Convergence loop until quality threshold
 Step 5 - COMPOUNDER: Weekly review, pattern library, next priorities
 
+The full loop runs as a step DAG (step_dag.py): each step starts as soon
+as the steps it reads are done, and steps whose inputs did not change
+since they last ran in this cycle are reused — an interrupted cycle
+resumes where it stopped.
+
 Usage:
   python orchestrator.py                    # Run all 5 steps
+  python orchestrator.py --no-cache         # Run all 5 steps, ignore memoized results
   python orchestrator.py --step audit       # Run single step
   python orchestrator.py --step refinery    # Run from step 4
+  python orchestrator.py --candidates 3     # Refinery: 3 parallel candidates per iteration
   python orchestrator.py --new-cycle        # Start new weekly cycle
   python orchestrator.py --status           # Show current state
 """
@@ -24,6 +31,7 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
+from typing import Tuple
 
 import aiohttp
 
@@ -37,9 +45,12 @@ from state.context import (
     advance_cycle,
     append_step_result,
     get_context_for_step,
+    get_step_memo,
     load_pattern_library,
     load_state,
+    set_step_memo,
 )
+from step_dag import StepDAG, execute, input_hash
 from steps import (
     step1_audit,
     step2_architect,
@@ -58,6 +69,8 @@ MODEL_CONFIG = {
     "compounder": {"provider": "kimi", "model": "moonshot-v1-32k"},
 }
 
+MAX_TOKENS = 4000  # completion cap per call
+
 OUTPUT_DIR = Path(__file__).parent / "output"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -71,9 +84,23 @@ STEPS = {
 
 STEP_ORDER = ["audit", "architect", "analyst", "refinery", "compounder"]
 
+# Edges come from each step module's INPUTS declaration
+STEP_DAG = StepDAG({name: module.INPUTS for name, module in STEPS.items()})
+
 
 async def call_model(step_name: str, system_prompt: str, user_prompt: str) -> str:
     """Call the configured model for a step."""
+    content, _ = await call_model_with_usage(step_name, system_prompt, user_prompt)
+    return content
+
+
+async def call_model_with_usage(
+    step_name: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float = 0.7,
+) -> Tuple[str, int]:
+    """Call the configured model for a step → (content, total tokens)."""
     config = MODEL_CONFIG[step_name]
 
     if config["provider"] == "kimi":
@@ -90,8 +117,8 @@ async def call_model(step_name: str, system_prompt: str, user_prompt: str) -> st
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            "temperature": 0.7,
-            "max_tokens": 4000,
+            "temperature": temperature,
+            "max_tokens": MAX_TOKENS,
         }
     else:
         raise ValueError(f"Unknown provider: {config['provider']}")
@@ -109,7 +136,7 @@ async def call_model(step_name: str, system_prompt: str, user_prompt: str) -> st
                 tokens = data.get("usage", {}).get("total_tokens", 0)
                 cost = (tokens / 1000) * 0.001
                 print(f"    Tokens: {tokens:,} | Cost: ${cost:.4f}")
-                return content
+                return content, tokens
             else:
                 text = await resp.text()
                 raise RuntimeError(f"API error {resp.status}: {text[:200]}")
@@ -148,8 +175,58 @@ async def run_step(step_name: str, context: dict = None) -> dict:
     return result
 
 
-async def run_refinery_loop(context: dict = None) -> dict:
-    """Run the convergence loop for Step 4."""
+async def _refinery_candidates(prompt: str, k: int, previous_score: float) -> Tuple[dict, float, int, int]:
+    """Generate k refinements in parallel and keep the best → (best, score, tokens, calls).
+
+    Candidates are scored as they arrive; one that reaches TARGET_SCORE
+    cancels the others still in flight.
+    """
+    temperatures = step4_refinery.CANDIDATE_TEMPERATURES
+    tasks = [
+        asyncio.create_task(
+            call_model_with_usage(
+                "refinery",
+                step4_refinery.SYSTEM_PROMPT,
+                prompt,
+                temperature=temperatures[j % len(temperatures)],
+            )
+        )
+        for j in range(k)
+    ]
+    best, best_score, tokens, calls = None, -1.0, 0, 0
+    try:
+        for finished in asyncio.as_completed(tasks):
+            try:
+                raw, used = await finished
+            except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if k == 1:
+                    raise
+                print(f"    Candidate failed: {e}")
+                continue
+            tokens += used or MAX_TOKENS  # no usage reported: count the cap, keeps the budget estimate > 0
+            calls += 1
+            candidate = step4_refinery.parse_result(raw)
+            _, score = step4_refinery.check_convergence(candidate, previous_score)
+            if score > best_score:
+                best, best_score = candidate, score
+            if score >= step4_refinery.TARGET_SCORE:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if best is None:
+        raise RuntimeError(f"All {k} refinery candidates failed")
+    return best, best_score, tokens, calls
+
+
+async def run_refinery_loop(
+    context: dict = None,
+    candidates: int = step4_refinery.CANDIDATES,
+    token_budget: int = step4_refinery.TOKEN_BUDGET,
+) -> dict:
+    """Run the convergence loop for Step 4 (candidates > 1: speculative best-of-K per iteration)."""
     if context is None:
         context = get_context_for_step("refinery")
 
@@ -158,13 +235,25 @@ async def run_refinery_loop(context: dict = None) -> dict:
     print(f"  Max iterations: {step4_refinery.MAX_ITERATIONS}")
     print(f"  Target score: {step4_refinery.TARGET_SCORE}")
     print(f"  Convergence threshold: {step4_refinery.CONVERGENCE_THRESHOLD}")
+    if candidates > 1:
+        print(f"  Candidates per iteration: {candidates} | Token budget: {token_budget:,}")
     print(f"{'=' * 60}")
 
     previous_score = 0.0
     previous_result = None
+    tokens_used = 0
+    calls = 0
 
     for i in range(1, step4_refinery.MAX_ITERATIONS + 1):
-        print(f"\n  --- Iteration {i}/{step4_refinery.MAX_ITERATIONS} ---")
+        # Fit the candidate count into the remaining budget (estimated from the calls so far)
+        k = candidates
+        if calls:
+            k = min(k, int((token_budget - tokens_used) // (tokens_used / calls)))
+            if k < 1:
+                print(f"\n  Token budget exhausted ({tokens_used:,}/{token_budget:,}) - stopping")
+                break
+
+        print(f"\n  --- Iteration {i}/{step4_refinery.MAX_ITERATIONS}" + (f" ({k} candidates) ---" if k > 1 else " ---"))
 
         prompt = step4_refinery.build_prompt(
             context,
@@ -173,21 +262,28 @@ async def run_refinery_loop(context: dict = None) -> dict:
             previous_result=previous_result,
         )
 
-        raw = await call_model("refinery", step4_refinery.SYSTEM_PROMPT, prompt)
-        result = step4_refinery.parse_result(raw)
-
-        converged, current_score = step4_refinery.check_convergence(result, previous_score)
+        candidate, current_score, used, made = await _refinery_candidates(prompt, k, previous_score)
+        tokens_used += used
+        calls += made
+        converged, _ = step4_refinery.check_convergence(candidate, previous_score)
         delta = current_score - previous_score
 
         print(f"  Score: {current_score}/10 (delta: {delta:+.1f})")
         print(f"  Converged: {converged}")
 
+        # Keep the best version so far; the next iteration refines that one
+        if previous_result is None or current_score >= previous_score:
+            result = candidate
         if converged:
             print(f"  Convergence reached at iteration {i}!")
             break
 
-        previous_score = current_score
-        previous_result = result
+        if current_score >= previous_score:
+            previous_score = current_score
+            previous_result = candidate
+
+    if candidates > 1:
+        print(f"  Tokens used: {tokens_used:,}/{token_budget:,} in {calls} calls")
 
     # Save final refinery result
     append_step_result("refinery", result)
@@ -198,8 +294,8 @@ async def run_refinery_loop(context: dict = None) -> dict:
     return result
 
 
-async def run_full_loop() -> dict:
-    """Run all 5 steps in sequence. Context accumulates."""
+async def run_full_loop(use_cache: bool = True, refinery_candidates: int = step4_refinery.CANDIDATES) -> dict:
+    """Run all 5 steps as a DAG. Context accumulates; unchanged steps are reused."""
     start = time.time()
     guard = ResourceGuard()
 
@@ -217,41 +313,45 @@ async def run_full_loop() -> dict:
     print(f"Prior improvements: {len(state.get('improvements', []))}")
     print(f"Guard: {guard.format_status()}")
 
-    results = {}
-
-    # Step 1: AUDIT
     async with guard.check() as gs:
         if gs.paused:
             print("GUARD: System overloaded. Aborting loop.")
             return {"status": "aborted_by_guard", "guard": guard.get_status()}
-    results["audit"] = await run_step("audit")
-
-    # Step 2: ARCHITECT (feeds from audit)
-    async with guard.check():
-        pass
-    results["architect"] = await run_step("architect")
-
-    # Step 3: ANALYST (feeds from architect + audit)
-    async with guard.check():
-        pass
-    results["analyst"] = await run_step("analyst")
-
-    # Step 4: REFINERY (convergence loop)
-    async with guard.check():
-        pass
-    results["refinery"] = await run_refinery_loop()
-
-    # Step 5: COMPOUNDER (weekly review of entire cycle)
-    async with guard.check():
-        pass
-    results["compounder"] = await run_step("compounder")
-
-    # Extract and persist new patterns from compounder
-    if not results["compounder"].get("parse_error"):
+
+    # Results already stored in this cycle (resume / memoization)
+    base = get_context_for_step("audit")
+    stored = base.get("prior_steps", {})
+
+    async def run_node(step_name: str, inputs: dict):
+        # A step only sees the outputs it declares in INPUTS
+        context = {**base, "prior_steps": inputs}
+        module = STEPS[step_name]
+        key = input_hash(context.get("cycle", 0), module.SYSTEM_PROMPT, module.build_prompt(context))
+        if use_cache and step_name in stored and get_step_memo(step_name) == key:
+            print(f"\n  [{step_name.upper()}] inputs unchanged - reusing result from this cycle")
+            return stored[step_name], True
+
+        async with guard.check():
+            pass
+        if step_name == "refinery":
+            result = await run_refinery_loop(context, candidates=refinery_candidates)
+        else:
+            result = await run_step(step_name, context)
+        if not result.get("parse_error"):
+            set_step_memo(step_name, key)
+        return result, False
+
+    results, runs = await execute(STEP_DAG, run_node)
+
+    # Extract and persist new patterns from compounder (once per compounder run)
+    if not results["compounder"].get("parse_error") and not runs["compounder"].cached:
         for pattern in step5_compounder.extract_patterns(results["compounder"]):
             add_pattern(pattern)
 
     elapsed = time.time() - start
+    durations = {name: run.duration for name, run in runs.items()}
+    critical_sec, critical_path = STEP_DAG.critical_path(durations)
+    reused = [name for name, run in runs.items() if run.cached]
 
     print(f"""
 ╔══════════════════════════════════════════════════════════╗
@@ -262,6 +362,11 @@ async def run_full_loop() -> dict:
 ║  New patterns: {len(step5_compounder.extract_patterns(results.get("compounder", {})))}{" " * (43 - len(str(len(step5_compounder.extract_patterns(results.get("compounder", {}))))))}║
 ╚══════════════════════════════════════════════════════════╝
     """)
+    print(f"  Step time (sum): {sum(durations.values()):.0f}s")
+    print(f"  Critical path:   {critical_sec:.0f}s ({' -> '.join(critical_path)})")
+    if reused:
+        print(f"  Reused:          {', '.join(reused)}")
+    print()
 
     # Save full loop result
     loop_file = OUTPUT_DIR / f"full_loop_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -270,6 +375,13 @@ async def run_full_loop() -> dict:
             {
                 "cycle": state.get("cycle", 0),
                 "duration_sec": elapsed,
+                "step_time_sec": sum(durations.values()),
+                "critical_path_sec": critical_sec,
+                "critical_path": critical_path,
+                "step_runs": {
+                    name: {"started": run.started, "duration_sec": run.duration, "reused": run.cached}
+                    for name, run in runs.items()
+                },
                 "steps": {k: v.get("summary", "") for k, v in results.items()},
                 "completed_at": datetime.now().isoformat(),
             },
@@ -319,6 +431,17 @@ async def main():
         help="Start a new weekly cycle (archives current state)",
     )
     parser.add_argument("--status", action="store_true", help="Show current workflow state")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run every step even if its inputs are unchanged in this cycle",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=step4_refinery.CANDIDATES,
+        help="Refinery: parallel candidates per iteration (best one wins, bounded by a token budget)",
+    )
     args = parser.parse_args()
 
     if args.status:
@@ -332,11 +455,11 @@ async def main():
 
     if args.step:
         if args.step == "refinery":
-            await run_refinery_loop()
+            await run_refinery_loop(candidates=args.candidates)
         else:
             await run_step(args.step)
     else:
-        await run_full_loop()
+        await run_full_loop(use_cache=not args.no_cache, refinery_candidates=args.candidates)
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ RESOURCE GUARD - System-Ueberlastungsschutz
 Verhindert dass Agents den Rechner ueberlasten.
 
 Features:
-- CPU/RAM/Disk Monitoring
+- CPU/RAM/Disk Monitoring (Hintergrund-Sampler, Checks lesen nur den Snapshot)
 - Automatisches Throttling bei hoher Last
 - Concurrency-Reduktion bei Engpaessen
 - Outsource-Modus: Verlagert Arbeit auf externe APIs wenn lokal voll
@@ -18,11 +18,14 @@ Usage:
 """
 
 import asyncio
-import os
-import time
+import sys
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Awaitable, Callable, Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from antigravity.resource_sampler import direction, get_sampler
+
 # ── Thresholds ───────────────────────────────────────────
 
 
@@ -48,76 +51,22 @@ class ResourceLimits:
 
 
 # ── Resource Sampling ────────────────────────────────────
-
-
-def _get_cpu_percent() -> float:
-    """CPU-Auslastung ohne psutil (pure /proc/stat oder Fallback)."""
-    try:
-        with open("/proc/stat", "r") as f:
-            line = f.readline()
-        parts = line.split()
-        idle = int(parts[4])
-        total = sum(int(p) for p in parts[1:])
-        # Speichere fuer Delta-Berechnung
-        if not hasattr(_get_cpu_percent, "_prev"):
-            _get_cpu_percent._prev = (idle, total)
-            time.sleep(0.1)
-            return _get_cpu_percent()  # Zweite Messung fuer Delta
-        prev_idle, prev_total = _get_cpu_percent._prev
-        _get_cpu_percent._prev = (idle, total)
-        d_idle = idle - prev_idle
-        d_total = total - prev_total
-        if d_total == 0:
-            return 0.0
-        return (1.0 - d_idle / d_total) * 100.0
-    except (FileNotFoundError, IndexError, ValueError):
-        # Fallback: load average (rough approximation)
-        try:
-            load = os.getloadavg()[0]
-            cpu_count = os.cpu_count() or 1
-            return min((load / cpu_count) * 100.0, 100.0)
-        except OSError:
-            return 0.0
-
-
-def _get_ram_percent() -> float:
-    """RAM-Auslastung ohne psutil."""
-    try:
-        with open("/proc/meminfo", "r") as f:
-            lines = f.readlines()
-        info = {}
-        for line in lines[:10]:
-            parts = line.split()
-            if len(parts) >= 2:
-                info[parts[0].rstrip(":")] = int(parts[1])
-        total = info.get("MemTotal", 1)
-        available = info.get("MemAvailable", info.get("MemFree", 0))
-        used_pct = (1.0 - available / total) * 100.0
-        return used_pct
-    except (FileNotFoundError, KeyError, ValueError, ZeroDivisionError):
-        return 0.0
-
-
-def _get_disk_percent(path: str = "/") -> float:
-    """Disk-Auslastung."""
-    try:
-        st = os.statvfs(path)
-        total = st.f_blocks * st.f_frsize
-        free = st.f_bavail * st.f_frsize
-        if total == 0:
-            return 0.0
-        return (1.0 - free / total) * 100.0
-    except OSError:
-        return 0.0
+# Gemessen wird in einem Hintergrund-Thread (antigravity/resource_sampler.py).
+# evaluate() liest nur den letzten Snapshot: kein sleep, kein I/O im Event-Loop.
 
 
 def sample_resources() -> Dict:
-    """Alle Metriken auf einmal samplen."""
+    """Letzter Snapshot aller Metriken (inkl. EWMA und Trend)."""
+    snap = get_sampler().latest()
     return {
-        "cpu_percent": round(_get_cpu_percent(), 1),
-        "ram_percent": round(_get_ram_percent(), 1),
-        "disk_percent": round(_get_disk_percent(), 1),
-        "timestamp": time.time(),
+        "cpu_percent": snap.cpu_percent,
+        "ram_percent": snap.ram_percent,
+        "disk_percent": snap.disk_percent,
+        "cpu_ewma": round(snap.cpu_ewma, 1),
+        "ram_ewma": round(snap.ram_ewma, 1),
+        "cpu_trend": round(snap.cpu_trend, 1),
+        "ram_trend": round(snap.ram_trend, 1),
+        "timestamp": snap.timestamp,
     }
 
 
@@ -132,7 +81,7 @@ class GuardState:
     paused: bool = False
     outsource_mode: bool = False  # True = Arbeit auf externe API verlagern
     last_sample: Dict = field(default_factory=dict)
-    history: list = field(default_factory=list)  # Letzte 60 Samples
+    history: list = field(default_factory=list)  # Letzte 60 ausgewertete Samples
 
 
 # ── Resource Guard ───────────────────────────────────────
@@ -156,9 +105,10 @@ class ResourceGuard:
     def evaluate(self) -> GuardState:
         """Bewerte aktuelle Ressourcen und setze Guard-Level."""
         metrics = sample_resources()
+        if metrics["timestamp"] == self.state.last_sample.get("timestamp"):
+            return self.state  # Gleicher Snapshot wie beim letzten Check
         self.state.last_sample = metrics
 
-        # History fuer Trendanalyse
         self.state.history.append(metrics)
         if len(self.state.history) > 60:
             self.state.history.pop(0)
@@ -266,23 +216,19 @@ class ResourceGuard:
         }
 
     def get_trend(self) -> Dict:
-        """CPU/RAM Trend ueber die letzten Samples."""
-        if len(self.state.history) < 2:
+        """CPU/RAM Trend (EWMA-Steigung des Samplers, %-Punkte pro Minute)."""
+        sampler = get_sampler()
+        recent = sampler.history(seconds=60)
+        if len(recent) < 2:
             return {"trend": "insufficient_data"}
-        recent = self.state.history[-10:]
-        avg_cpu = sum(s["cpu_percent"] for s in recent) / len(recent)
-        avg_ram = sum(s["ram_percent"] for s in recent) / len(recent)
-        first_cpu = recent[0]["cpu_percent"]
-        last_cpu = recent[-1]["cpu_percent"]
+        snap = recent[-1]
         return {
-            "avg_cpu": round(avg_cpu, 1),
-            "avg_ram": round(avg_ram, 1),
-            "cpu_direction": "rising"
-            if last_cpu > first_cpu + 5
-            else "falling"
-            if last_cpu < first_cpu - 5
-            else "stable",
-            "ram_direction": "stable",
+            "avg_cpu": round(snap.cpu_ewma, 1),
+            "avg_ram": round(snap.ram_ewma, 1),
+            "cpu_trend_per_min": round(snap.cpu_trend, 1),
+            "ram_trend_per_min": round(snap.ram_trend, 1),
+            "cpu_direction": direction(snap.cpu_trend),
+            "ram_direction": direction(snap.ram_trend),
             "samples": len(recent),
         }
 
@@ -2,116 +2,67 @@
 Workflow State Management - Context accumulates across steps.
 Each step reads prior context and appends its own findings.
 This is the memory layer that makes the system compound.
+
+Storage is pluggable (see store.py): SQLite WAL by default, so each
+update is a single row write and concurrent runs do not clobber
+each other. WORKFLOW_STATE_BACKEND=json keeps the old file layout.
 """
 
 import json
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from .store import STATE_DIR, workflow_backend
 
-STATE_DIR = Path(__file__).parent
 HISTORY_DIR = STATE_DIR / "history"
 HISTORY_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _state_file() -> Path:
-    return STATE_DIR / "current_state.json"
-
-
-def _pattern_file() -> Path:
-    return STATE_DIR / "pattern_library.json"
-
-
 def load_state() -> Dict:
     """Load accumulated workflow state."""
-    f = _state_file()
-    if f.exists():
-        return json.loads(f.read_text())
-    return {
-        "created": datetime.now().isoformat(),
-        "cycle": 0,
-        "steps_completed": [],
-        "context": {},
-        "patterns": [],
-        "improvements": [],
-    }
+    return workflow_backend().snapshot()
 
 
 def save_state(state: Dict) -> None:
-    """Persist workflow state."""
-    state["updated"] = datetime.now().isoformat()
-    _state_file().write_text(json.dumps(state, indent=2, ensure_ascii=False))
+    """Persist workflow state (full rewrite — prefer the targeted functions below)."""
+    workflow_backend().replace(state)
 
 
 def append_step_result(step_name: str, result: Dict) -> Dict:
-    """Add a step's output to the accumulated context."""
-    state = load_state()
-    state["steps_completed"].append(
-        {
-            "step": step_name,
-            "timestamp": datetime.now().isoformat(),
-            "summary": result.get("summary", ""),
-        }
-    )
-    state["context"][step_name] = result
-    save_state(state)
-    return state
+    """Add a step's output to the accumulated context. Returns the result."""
+    workflow_backend().append_step(step_name, result.get("summary", ""), result)
+    return result
 
 
 def get_context_for_step(step_name: str) -> Dict:
     """Get all prior context relevant to the next step."""
-    state = load_state()
-    return {
-        "cycle": state.get("cycle", 0),
-        "prior_steps": state.get("context", {}),
-        "patterns": state.get("patterns", []),
-        "improvements": state.get("improvements", []),
-    }
+    return workflow_backend().step_context()
 
 
 def advance_cycle() -> int:
     """Start a new weekly cycle. Archives old state."""
-    state = load_state()
-    cycle = state.get("cycle", 0) + 1
+    state, cycle = workflow_backend().advance_cycle()
 
-    # Archive previous cycle
+    # Archive previous cycle (patterns and improvements carry forward)
     archive = HISTORY_DIR / f"cycle_{cycle - 1}_{datetime.now().strftime('%Y%m%d')}.json"
     archive.write_text(json.dumps(state, indent=2, ensure_ascii=False))
-
-    # Carry forward patterns and improvements only
-    new_state = {
-        "created": datetime.now().isoformat(),
-        "cycle": cycle,
-        "steps_completed": [],
-        "context": {},
-        "patterns": state.get("patterns", []),
-        "improvements": state.get("improvements", []),
-    }
-    save_state(new_state)
     return cycle
 
 
 def add_pattern(pattern: Dict) -> None:
     """Add a discovered pattern to the persistent library."""
-    state = load_state()
-    state.setdefault("patterns", []).append(
-        {
-            **pattern,
-            "discovered": datetime.now().isoformat(),
-            "cycle": state.get("cycle", 0),
-        }
-    )
-    save_state(state)
-
-    # Also update standalone pattern library
-    lib = load_pattern_library()
-    lib.append(pattern)
-    _pattern_file().write_text(json.dumps(lib, indent=2, ensure_ascii=False))
+    workflow_backend().add_pattern(pattern)
 
 
 def load_pattern_library() -> List[Dict]:
     """Load the persistent pattern library across all cycles."""
-    f = _pattern_file()
-    if f.exists():
-        return json.loads(f.read_text())
-    return []
+    return workflow_backend().pattern_library()
+
+
+def get_step_memo(step_name: str) -> Optional[str]:
+    """Input hash of the step's stored result in this cycle (see step_dag)."""
+    return workflow_backend().get_meta(f"input_hash.{step_name}")
+
+
+def set_step_memo(step_name: str, key: str) -> None:
+    workflow_backend().set_meta(**{f"input_hash.{step_name}": key})
@@ -0,0 +1,650 @@
+"""
+State Store — Pluggable Backend for Workflow, Cowork and Mirror State
+======================================================================
+The workflow state used to be one JSON blob per system: every
+append_step_result / add_pattern / get_context_for_step re-read and
+rewrote the whole file (non-atomically). Two daemons updating the
+same state silently overwrote each other's changes.
+
+Backends:
+- SQLiteStateBackend (default): WAL database, one row write per update.
+    meta         key → JSON value (cycle, created, active_focus, ...)
+    cycles       cycle → created / archived
+    steps        step results per cycle (context = latest result per step)
+    patterns     discovered patterns (state view + pattern library)
+    improvements improvement records (carried across cycles)
+    log          append-only named lists (e.g. cowork actions_taken)
+- JsonStateBackend: the old single-file layout, now written atomically.
+
+Existing JSON files are migrated into a fresh database on first open
+(the JSON files are left in place untouched).
+
+Usage:
+    from state.store import workflow_backend
+    backend = workflow_backend()
+    backend.append_step("audit", summary, result)
+    context = backend.step_context()
+
+    # Read-only view for other systems (gemini-mirror, status pages)
+    state = load_snapshot(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON)
+
+Environment:
+    WORKFLOW_STATE_BACKEND=sqlite|json   (default: sqlite)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# ─── Config ─────────────────────────────────────────────────────────
+STATE_DIR = Path(__file__).parent
+WORKFLOW_STATE_DB = STATE_DIR / "workflow_state.db"
+WORKFLOW_STATE_JSON = STATE_DIR / "current_state.json"
+PATTERN_LIBRARY_JSON = STATE_DIR / "pattern_library.json"
+COWORK_STATE_DB = STATE_DIR / "cowork_state.db"
+COWORK_STATE_JSON = STATE_DIR / "cowork_state.json"
+
+STATE_BACKEND = os.getenv("WORKFLOW_STATE_BACKEND", "sqlite").lower()
+STATE_BACKENDS = ("sqlite", "json")
+
+# Keys of the workflow layout — everything else in a state dict is meta
+_WORKFLOW_KEYS = ("cycle", "created", "updated", "steps_completed", "context", "patterns", "improvements")
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """tmp + rename: readers never see a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.stem}_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, json.JSONDecodeError):
+        return default
+
+
+def _pattern_entry(pattern: Dict, cycle: int, discovered: str) -> Dict:
+    return {**pattern, "discovered": discovered, "cycle": cycle}
+
+
+# ─── Interface ──────────────────────────────────────────────────────
+class StateBackend(ABC):
+    """Operations the state modules need. Each one is a single update on SQLite."""
+
+    @abstractmethod
+    def snapshot(self) -> Dict:
+        """Full state in the legacy dict layout (steps_completed, context, patterns, ...)."""
+
+    @abstractmethod
+    def replace(self, state: Dict, logs: Iterable[str] = ()) -> None:
+        """Overwrite the current state with a legacy dict (compat for save_state).
+
+        logs: keys whose list values are named logs (see append_log).
+        """
+
+    @abstractmethod
+    def get_meta(self, key: str, default: Any = None) -> Any: ...
+
+    @abstractmethod
+    def set_meta(self, **values: Any) -> None: ...
+
+    @abstractmethod
+    def append_step(self, step: str, summary: str, result: Optional[Dict] = None) -> None:
+        """Record a step of the current cycle; result becomes context[step]."""
+
+    @abstractmethod
+    def step_context(self) -> Dict:
+        """{cycle, prior_steps, patterns, improvements} for the next step."""
+
+    @abstractmethod
+    def add_pattern(self, pattern: Dict, library: bool = True) -> None:
+        """Add a pattern to the state (and to the cross-cycle pattern library)."""
+
+    @abstractmethod
+    def pattern_library(self) -> List[Dict]: ...
+
+    @abstractmethod
+    def add_improvement(self, improvement: Dict) -> None: ...
+
+    @abstractmethod
+    def advance_cycle(self) -> Tuple[Dict, int]:
+        """Start the next cycle (patterns + improvements carry over). Returns (old state, new cycle)."""
+
+    @abstractmethod
+    def append_log(self, name: str, entry: Any, keep: Optional[int] = None) -> None:
+        """Append to a named list; keep = only retain the newest N entries."""
+
+    @abstractmethod
+    def read_log(self, name: str, limit: Optional[int] = None) -> List[Any]:
+        """Named list, oldest first (limit = newest N)."""
+
+
+# ─── JSON (legacy layout) ───────────────────────────────────────────
+class JsonStateBackend(StateBackend):
+    """Whole state in one JSON file, rewritten atomically on every update."""
+
+    def __init__(self, path: Path, pattern_file: Optional[Path] = None, defaults: Optional[Dict] = None):
+        self.path = Path(path)
+        self.pattern_file = Path(pattern_file) if pattern_file else None
+        self.defaults = defaults or {}
+        self._lock = threading.Lock()
+
+    def _default_state(self) -> Dict:
+        return {
+            "created": _now(),
+            "cycle": 0,
+            "steps_completed": [],
+            "context": {},
+            "patterns": [],
+            "improvements": [],
+            **self.defaults,
+        }
+
+    def _load(self) -> Dict:
+        if self.path.exists():
+            return _read_json(self.path, None) or self._default_state()
+        return self._default_state()
+
+    def _save(self, state: Dict) -> None:
+        state["updated"] = _now()
+        _write_json_atomic(self.path, state)
+
+    @contextmanager
+    def _update(self):
+        with self._lock:
+            state = self._load()
+            yield state
+            self._save(state)
+
+    def snapshot(self) -> Dict:
+        return self._load()
+
+    def replace(self, state: Dict, logs: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._save(state)
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        return self._load().get(key, default)
+
+    def set_meta(self, **values: Any) -> None:
+        with self._update() as state:
+            state.update(values)
+
+    def append_step(self, step: str, summary: str, result: Optional[Dict] = None) -> None:
+        with self._update() as state:
+            state.setdefault("steps_completed", []).append({"step": step, "timestamp": _now(), "summary": summary})
+            if result is not None:
+                state.setdefault("context", {})[step] = result
+
+    def step_context(self) -> Dict:
+        state = self._load()
+        return {
+            "cycle": state.get("cycle", 0),
+            "prior_steps": state.get("context", {}),
+            "patterns": state.get("patterns", []),
+            "improvements": state.get("improvements", []),
+        }
+
+    def add_pattern(self, pattern: Dict, library: bool = True) -> None:
+        with self._update() as state:
+            state.setdefault("patterns", []).append(_pattern_entry(pattern, state.get("cycle", 0), _now()))
+        if library and self.pattern_file is not None:
+            with self._lock:
+                lib = self.pattern_library()
+                lib.append(pattern)
+                _write_json_atomic(self.pattern_file, lib)
+
+    def pattern_library(self) -> List[Dict]:
+        if self.pattern_file is None or not self.pattern_file.exists():
+            return []
+        return _read_json(self.pattern_file, [])
+
+    def add_improvement(self, improvement: Dict) -> None:
+        with self._update() as state:
+            state.setdefault("improvements", []).append(improvement)
+
+    def advance_cycle(self) -> Tuple[Dict, int]:
+        with self._lock:
+            state = self._load()
+            cycle = state.get("cycle", 0) + 1
+            self._save(
+                {
+                    **{k: v for k, v in state.items() if k not in _WORKFLOW_KEYS},
+                    "created": _now(),
+                    "cycle": cycle,
+                    "steps_completed": [],
+                    "context": {},
+                    "patterns": state.get("patterns", []),
+                    "improvements": state.get("improvements", []),
+                }
+            )
+        return state, cycle
+
+    def append_log(self, name: str, entry: Any, keep: Optional[int] = None) -> None:
+        with self._update() as state:
+            entries = state.setdefault(name, [])
+            entries.append(entry)
+            if keep is not None and len(entries) > keep:
+                state[name] = entries[-keep:]
+
+    def read_log(self, name: str, limit: Optional[int] = None) -> List[Any]:
+        entries = self._load().get(name, [])
+        return entries[-limit:] if limit else entries
+
+
+# ─── SQLite (WAL) ───────────────────────────────────────────────────
+class SQLiteStateBackend(StateBackend):
+    """Row-per-update state in a WAL database — safe for several processes."""
+
+    def __init__(self, path: Path, defaults: Optional[Dict] = None, read_only: bool = False):
+        self.path = Path(path)
+        self.defaults = defaults or {}
+        self.read_only = read_only  # no schema, no writes (views for other systems)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None and self.read_only:
+            self._conn = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False, timeout=10.0
+            )
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None → explicit transactions via _tx()
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS cycles (
+                    cycle INTEGER PRIMARY KEY,
+                    created TEXT NOT NULL,
+                    archived TEXT
+                );
+                CREATE TABLE IF NOT EXISTS steps (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cycle INTEGER NOT NULL,
+                    step TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    summary TEXT,
+                    result TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_steps_cycle ON steps(cycle, step);
+                CREATE TABLE IF NOT EXISTS patterns (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cycle INTEGER,
+                    discovered TEXT,
+                    data TEXT NOT NULL,
+                    in_state INTEGER NOT NULL DEFAULT 1,
+                    in_library INTEGER NOT NULL DEFAULT 1
+                );
+                CREATE TABLE IF NOT EXISTS improvements (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cycle INTEGER,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_log_name ON log(name, id);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def _tx(self):
+        """BEGIN IMMEDIATE: take the write lock up front so read-modify-write is atomic across processes."""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+                db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('updated', ?)", (json.dumps(_now()),)
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _read(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            return self._db().execute(sql, tuple(params)).fetchall()
+
+    def _cycle(self, db: sqlite3.Connection) -> int:
+        row = db.execute("SELECT value FROM meta WHERE key = 'cycle'").fetchone()
+        return json.loads(row[0]) if row else self.defaults.get("cycle", 0)
+
+    def _ensure_cycle(self, db: sqlite3.Connection) -> int:
+        cycle = self._cycle(db)
+        db.execute("INSERT OR IGNORE INTO cycles (cycle, created) VALUES (?, ?)", (cycle, _now()))
+        db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('cycle', ?)", (json.dumps(cycle),))
+        return cycle
+
+    def is_empty(self) -> bool:
+        return not self._read("SELECT 1 FROM meta LIMIT 1")
+
+    # ─── Meta ───────────────────────────────────────────────────────
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        rows = self._read("SELECT value FROM meta WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else self.defaults.get(key, default)
+
+    def set_meta(self, **values: Any) -> None:
+        with self._tx() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(k, json.dumps(v, ensure_ascii=False)) for k, v in values.items()],
+            )
+
+    # ─── Steps / Patterns / Improvements ────────────────────────────
+    def append_step(self, step: str, summary: str, result: Optional[Dict] = None) -> None:
+        with self._tx() as db:
+            cycle = self._ensure_cycle(db)
+            db.execute(
+                "INSERT INTO steps (cycle, step, timestamp, summary, result) VALUES (?, ?, ?, ?, ?)",
+                (cycle, step, _now(), summary, None if result is None else json.dumps(result, ensure_ascii=False)),
+            )
+
+    def _context(self, db: sqlite3.Connection, cycle: int) -> Dict:
+        rows = db.execute(
+            "SELECT step, result FROM steps WHERE id IN ("
+            "  SELECT MAX(id) FROM steps WHERE cycle = ? AND result IS NOT NULL GROUP BY step"
+            ") ORDER BY id",
+            (cycle,),
+        ).fetchall()
+        return {step: json.loads(result) for step, result in rows}
+
+    def _patterns(self, db: sqlite3.Connection) -> List[Dict]:
+        rows = db.execute("SELECT data, cycle, discovered FROM patterns WHERE in_state = 1 ORDER BY id").fetchall()
+        return [_pattern_entry(json.loads(data), cycle, discovered) for data, cycle, discovered in rows]
+
+    def _improvements(self, db: sqlite3.Connection) -> List[Dict]:
+        return [json.loads(data) for (data,) in db.execute("SELECT data FROM improvements ORDER BY id")]
+
+    def step_context(self) -> Dict:
+        with self._lock:
+            db = self._db()
+            cycle = self._cycle(db)
+            return {
+                "cycle": cycle,
+                "prior_steps": self._context(db, cycle),
+                "patterns": self._patterns(db),
+                "improvements": self._improvements(db),
+            }
+
+    def add_pattern(self, pattern: Dict, library: bool = True) -> None:
+        with self._tx() as db:
+            db.execute(
+                "INSERT INTO patterns (cycle, discovered, data, in_state, in_library) VALUES (?, ?, ?, 1, ?)",
+                (self._cycle(db), _now(), json.dumps(pattern, ensure_ascii=False), int(library)),
+            )
+
+    def pattern_library(self) -> List[Dict]:
+        return [json.loads(data) for (data,) in self._read("SELECT data FROM patterns WHERE in_library = 1 ORDER BY id")]
+
+    def add_improvement(self, improvement: Dict) -> None:
+        with self._tx() as db:
+            db.execute(
+                "INSERT INTO improvements (cycle, data) VALUES (?, ?)",
+                (self._cycle(db), json.dumps(improvement, ensure_ascii=False)),
+            )
+
+    def advance_cycle(self) -> Tuple[Dict, int]:
+        with self._tx() as db:
+            old_state = self._snapshot(db)
+            cycle = self._ensure_cycle(db) + 1
+            db.execute("UPDATE cycles SET archived = ? WHERE cycle = ?", (_now(), cycle - 1))
+            db.execute("INSERT OR REPLACE INTO cycles (cycle, created) VALUES (?, ?)", (cycle, _now()))
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cycle', ?)", (json.dumps(cycle),))
+        return old_state, cycle
+
+    # ─── Named logs ─────────────────────────────────────────────────
+    def append_log(self, name: str, entry: Any, keep: Optional[int] = None) -> None:
+        with self._tx() as db:
+            cursor = db.execute(
+                "INSERT INTO log (name, data) VALUES (?, ?)", (name, json.dumps(entry, ensure_ascii=False))
+            )
+            if keep is not None:
+                db.execute(
+                    "DELETE FROM log WHERE name = ? AND id <= ("
+                    "  SELECT id FROM log WHERE name = ? AND id <= ? ORDER BY id DESC LIMIT 1 OFFSET ?"
+                    ")",
+                    (name, name, cursor.lastrowid, keep),
+                )
+
+    def read_log(self, name: str, limit: Optional[int] = None) -> List[Any]:
+        if limit:
+            rows = self._read("SELECT data FROM log WHERE name = ? ORDER BY id DESC LIMIT ?", (name, limit))[::-1]
+        else:
+            rows = self._read("SELECT data FROM log WHERE name = ? ORDER BY id", (name,))
+        return [json.loads(data) for (data,) in rows]
+
+    # ─── Whole-state views ──────────────────────────────────────────
+    def _snapshot(self, db: sqlite3.Connection) -> Dict:
+        state = {**self.defaults}
+        state.update({key: json.loads(value) for key, value in db.execute("SELECT key, value FROM meta")})
+        cycle = self._cycle(db)
+        row = db.execute("SELECT created FROM cycles WHERE cycle = ?", (cycle,)).fetchone()
+        state["cycle"] = cycle
+        state["created"] = row[0] if row else state.get("created", _now())
+        state["steps_completed"] = [
+            {"step": step, "timestamp": timestamp, "summary": summary}
+            for step, timestamp, summary in db.execute(
+                "SELECT step, timestamp, summary FROM steps WHERE cycle = ? ORDER BY id", (cycle,)
+            )
+        ]
+        state["context"] = self._context(db, cycle)
+        state["patterns"] = self._patterns(db)
+        state["improvements"] = self._improvements(db)
+        for (name,) in db.execute("SELECT DISTINCT name FROM log").fetchall():
+            state[name] = [json.loads(d) for (d,) in db.execute("SELECT data FROM log WHERE name = ? ORDER BY id", (name,))]
+        return state
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return self._snapshot(self._db())
+
+    def replace(self, state: Dict, logs: Iterable[str] = ()) -> None:
+        with self._tx() as db:
+            self._replace(db, state, set(logs))
+
+    def _replace(self, db: sqlite3.Connection, state: Dict, logs: set) -> None:
+        cycle = state.get("cycle", self._cycle(db))
+        db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cycle', ?)", (json.dumps(cycle),))
+        db.execute(
+            "INSERT OR REPLACE INTO cycles (cycle, created) VALUES (?, ?)", (cycle, state.get("created", _now()))
+        )
+
+        # Steps of the current cycle; context results attach to the last entry of their step
+        db.execute("DELETE FROM steps WHERE cycle = ?", (cycle,))
+        context = dict(state.get("context", {}))
+        entries = list(state.get("steps_completed", []))
+        last_index = {e.get("step"): i for i, e in enumerate(entries)}
+        for i, entry in enumerate(entries):
+            step = entry.get("step", "")
+            result = context.pop(step) if last_index.get(step) == i and step in context else None
+            db.execute(
+                "INSERT INTO steps (cycle, step, timestamp, summary, result) VALUES (?, ?, ?, ?, ?)",
+                (
+                    cycle,
+                    step,
+                    entry.get("timestamp", _now()),
+                    entry.get("summary", ""),
+                    None if result is None else json.dumps(result, ensure_ascii=False),
+                ),
+            )
+        for step, result in context.items():  # context without a steps_completed entry
+            db.execute(
+                "INSERT INTO steps (cycle, step, timestamp, summary, result) VALUES (?, ?, ?, '', ?)",
+                (cycle, step, _now(), json.dumps(result, ensure_ascii=False)),
+            )
+
+        # State patterns (library-only rows stay)
+        db.execute("DELETE FROM patterns WHERE in_state = 1 AND in_library = 0")
+        db.execute("UPDATE patterns SET in_state = 0")
+        for p in state.get("patterns", []):
+            data = {k: v for k, v in p.items() if k not in ("discovered", "cycle")}
+            db.execute(
+                "INSERT INTO patterns (cycle, discovered, data, in_state, in_library) VALUES (?, ?, ?, 1, 0)",
+                (p.get("cycle", cycle), p.get("discovered", _now()), json.dumps(data, ensure_ascii=False)),
+            )
+
+        db.execute("DELETE FROM improvements")
+        db.executemany(
+            "INSERT INTO improvements (cycle, data) VALUES (?, ?)",
+            [(cycle, json.dumps(i, ensure_ascii=False)) for i in state.get("improvements", [])],
+        )
+
+        for key, value in state.items():
+            if key in _WORKFLOW_KEYS:
+                continue
+            if key in logs:
+                db.execute("DELETE FROM log WHERE name = ?", (key,))
+                db.executemany(
+                    "INSERT INTO log (name, data) VALUES (?, ?)",
+                    [(key, json.dumps(v, ensure_ascii=False)) for v in value],
+                )
+            else:
+                db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False)),
+                )
+
+    # ─── Migration ──────────────────────────────────────────────────
+    def migrate_json(
+        self,
+        state_file: Optional[Path] = None,
+        pattern_file: Optional[Path] = None,
+        logs: Iterable[str] = (),
+    ) -> bool:
+        """Import legacy JSON state (+ pattern library) into an empty database. Returns True if imported.
+
+        Check and import run in one BEGIN IMMEDIATE transaction, so when several
+        processes open a fresh database at once exactly one of them imports.
+        The migration row in meta marks the database as initialised either way.
+        """
+        state = _read_json(state_file, None) if state_file is not None and Path(state_file).exists() else None
+        library = _read_json(pattern_file, []) if pattern_file is not None and Path(pattern_file).exists() else []
+        with self._tx() as db:
+            if db.execute("SELECT 1 FROM meta LIMIT 1").fetchone():
+                return False  # initialised meanwhile (other thread / process)
+            imported = False
+            if isinstance(state, dict):
+                self._replace(db, state, set(logs))
+                imported = True
+            if isinstance(library, list) and library:
+                db.executemany(
+                    "INSERT INTO patterns (cycle, discovered, data, in_state, in_library) VALUES (NULL, NULL, ?, 0, 1)",
+                    [(json.dumps(p, ensure_ascii=False),) for p in library],
+                )
+                imported = True
+            db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("migrated_from", json.dumps(str(state_file or pattern_file) if imported else None)),
+                    ("migrated_at", json.dumps(_now())),
+                ],
+            )
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# ─── Registry ───────────────────────────────────────────────────────
+_backends: Dict[Tuple[str, str], StateBackend] = {}
+_registry_lock = threading.Lock()
+
+
+def open_state_backend(
+    db_path: Path,
+    json_path: Path,
+    pattern_file: Optional[Path] = None,
+    defaults: Optional[Dict] = None,
+    logs: Iterable[str] = (),
+    kind: Optional[str] = None,
+) -> StateBackend:
+    """Shared backend for one state (per process). Fresh databases import json_path once."""
+    kind = (kind or STATE_BACKEND).lower()
+    if kind not in STATE_BACKENDS:
+        raise ValueError(f"Unknown state backend: {kind}. Available: {STATE_BACKENDS}")
+    key = (kind, str(db_path if kind == "sqlite" else json_path))
+    with _registry_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            if kind == "json":
+                backend = JsonStateBackend(json_path, pattern_file=pattern_file, defaults=defaults)
+            else:
+                backend = SQLiteStateBackend(db_path, defaults=defaults)
+                if backend.is_empty():  # cheap pre-check; migrate_json re-checks under the write lock
+                    backend.migrate_json(json_path, pattern_file, logs=logs)
+            _backends[key] = backend
+        return backend
+
+
+def workflow_backend() -> StateBackend:
+    """State of the 5-step workflow (orchestrator / state.context)."""
+    return open_state_backend(WORKFLOW_STATE_DB, WORKFLOW_STATE_JSON, PATTERN_LIBRARY_JSON)
+
+
+COWORK_LOGS = ("actions_taken", "patterns_discovered")
+
+
+def cowork_backend() -> StateBackend:
+    """State of the cowork daemon (actions and patterns are append-only logs)."""
+    return open_state_backend(COWORK_STATE_DB, COWORK_STATE_JSON, logs=COWORK_LOGS)
+
+
+def load_snapshot(db_path: Path, json_path: Path) -> Dict:
+    """Read-only state view for other systems: the database if present, else the legacy JSON ({} if neither)."""
+    if STATE_BACKEND == "sqlite" and Path(db_path).exists():
+        backend = SQLiteStateBackend(db_path, read_only=True)
+        try:
+            return backend.snapshot()
+        except sqlite3.Error:
+            return {}
+        finally:
+            backend.close()
+    return _read_json(json_path, {}) if Path(json_path).exists() else {}
+
+
+def load_pattern_library(db_path: Path = WORKFLOW_STATE_DB, json_path: Path = PATTERN_LIBRARY_JSON) -> List[Dict]:
+    """Read-only pattern library for other systems (database if present, else the legacy JSON)."""
+    if STATE_BACKEND == "sqlite" and Path(db_path).exists():
+        backend = SQLiteStateBackend(db_path, read_only=True)
+        try:
+            return backend.pattern_library()
+        except sqlite3.Error:
+            return []
+        finally:
+            backend.close()
+    return _read_json(json_path, []) if Path(json_path).exists() else []
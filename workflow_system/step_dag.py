@@ -0,0 +1,137 @@
+"""
+Step DAG - Dependency-driven execution of the workflow steps.
+
+Each step module declares INPUTS: the prior steps whose output its
+prompt reads. The scheduler starts a step as soon as all its inputs
+are done, so independent steps run concurrently instead of strictly
+one after another.
+
+Step outputs are memoized per cycle, keyed by a hash of the step's
+prompt (which is built only from its declared inputs). Re-running a
+cycle skips every step whose inputs did not change — a cycle that
+crashed halfway resumes at the first missing step.
+
+After a run, critical_path() shows the longest dependency chain next
+to the total step time: that is the floor for the loop's wall time.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+# run(step_name, {input_step: output}) -> (result, reused_from_memo)
+StepRunner = Callable[[str, Dict[str, dict]], Awaitable[Tuple[dict, bool]]]
+
+
+def input_hash(cycle: int, system_prompt: str, prompt: str) -> str:
+    """Memo key for a step: same cycle + same prompt → same result."""
+    return hashlib.sha256(f"{cycle}\x00{system_prompt}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StepRun:
+    """Timing of one executed (or reused) step, relative to the start of the run."""
+
+    name: str
+    started: float
+    finished: float
+    cached: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class StepDAG:
+    """Validated step graph: inputs, dependents and a topological order."""
+
+    def __init__(self, inputs: Dict[str, Sequence[str]]):
+        self.inputs = {name: tuple(deps) for name, deps in inputs.items()}
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.inputs}
+        for name, deps in self.inputs.items():
+            for dep in deps:
+                if dep not in self.inputs:
+                    raise ValueError(f"Step '{name}' depends on unknown step '{dep}'")
+                self.dependents[dep].append(name)
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        pending = {name: len(deps) for name, deps in self.inputs.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents[name]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.inputs):
+            cyclic = sorted(name for name, count in pending.items() if count > 0)
+            raise ValueError(f"Step graph has a cycle: {', '.join(cyclic)}")
+        return order
+
+    def critical_path(self, durations: Dict[str, float]) -> Tuple[float, List[str]]:
+        """Longest chain through the graph by step duration → (seconds, [steps])."""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in self.order:
+            before = max(self.inputs[name], key=lambda dep: finish[dep], default=None)
+            finish[name] = (finish[before] if before else 0.0) + durations.get(name, 0.0)
+            previous[name] = before
+        if not finish:
+            return 0.0, []
+        last = max(finish, key=finish.get)
+        path = []
+        node: Optional[str] = last
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return finish[last], path[::-1]
+
+
+async def execute(
+    dag: StepDAG,
+    run: StepRunner,
+    max_parallel: Optional[int] = None,
+) -> Tuple[Dict[str, dict], Dict[str, StepRun]]:
+    """Run every step once its inputs are done. A failing step cancels the rest and re-raises."""
+    outputs: Dict[str, dict] = {}
+    runs: Dict[str, StepRun] = {}
+    waiting = {name: set(deps) for name, deps in dag.inputs.items()}
+    running: Dict[asyncio.Task, str] = {}
+    slots = asyncio.Semaphore(max_parallel or len(dag.order) or 1)
+    t0 = time.monotonic()
+
+    async def run_one(name: str):
+        async with slots:
+            started = time.monotonic() - t0
+            result, cached = await run(name, {dep: outputs[dep] for dep in dag.inputs[name]})
+            return result, cached, started, time.monotonic() - t0
+
+    def launch_ready():
+        for name in dag.order:
+            if name in waiting and not waiting[name]:
+                del waiting[name]
+                running[asyncio.create_task(run_one(name))] = name
+
+    launch_ready()
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                result, cached, started, finished = task.result()
+                outputs[name] = result
+                runs[name] = StepRun(name, started, finished, cached)
+                for dependent in dag.dependents[name]:
+                    waiting[dependent].discard(name)
+            launch_ready()
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    return outputs, runs
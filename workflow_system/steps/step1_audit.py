@@ -8,6 +8,10 @@ Output: prioritized 4-week automation plan with clear setup steps.
 import json
 from typing import Dict
 
+# Prior steps whose output build_prompt() reads (step DAG edges).
+# Audit starts the cycle: it only reads patterns from earlier cycles.
+INPUTS = ()
+
 SYSTEM_PROMPT = """Du bist ein Elite Productivity Analyst fuer Maurice's AI Empire.
 Dein Job: Identifiziere was WIRKLICH Zeit und Energie frisst.
 Sei brutal ehrlich. Keine Schoenrederei.
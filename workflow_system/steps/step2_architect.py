@@ -8,6 +8,9 @@ Feeds from: Step 1 (Audit) - knows what to automate.
 import json
 from typing import Dict
 
+# Prior steps whose output build_prompt() reads (step DAG edges)
+INPUTS = ("audit",)
+
 SYSTEM_PROMPT = """Du bist ein System-Architekt fuer AI-gesteuerte Business Automation.
 Du planst BEVOR gebaut wird. Mehrere Ansaetze, nach Einfachheit gerankt.
 Liefere klare Blueprints. Antworte IMMER als valides JSON."""
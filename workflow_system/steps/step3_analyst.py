@@ -9,6 +9,9 @@ Feeds from: Step 2 (Architect) blueprint.
 import json
 from typing import Dict
 
+# Prior steps whose output build_prompt() reads (step DAG edges)
+INPUTS = ("architect", "audit")
+
 SYSTEM_PROMPT = """Du bist ein Senior Engineering Reviewer.
 Kein Lob, keine vagen Kommentare. Nur strukturierte Analyse.
 Jedes Issue: Tradeoff + Optionen + Empfehlung.
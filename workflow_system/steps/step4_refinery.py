@@ -2,12 +2,16 @@
 STEP 4 - THE REFINERY
 Convergence loop: generate, score, diagnose, rewrite, re-score.
 Stops when quality converges (score delta < threshold).
+Optionally speculative: several candidates per iteration, best one wins.
 This is the step that turns good into great.
 """
 
 import json
 from typing import Dict, Tuple
 
+# Prior steps whose output build_prompt() reads (step DAG edges)
+INPUTS = ("analyst", "architect")
+
 SYSTEM_PROMPT = """Du bist ein Qualitaets-Optimizer. Dein Job: Iterativ verbessern.
 Generiere v1, bewerte, diagnostiziere Schwaechen, schreibe um, bewerte erneut.
 Stoppe wenn die Qualitaet konvergiert. Antworte IMMER als valides JSON."""
@@ -60,6 +64,12 @@ MAX_ITERATIONS = 3
 CONVERGENCE_THRESHOLD = 0.3
 TARGET_SCORE = 8.0
 
+# Speculative mode: K candidates per iteration, generated in parallel at
+# different temperatures; the best-scoring one carries on. 1 = classic loop.
+CANDIDATES = 1
+CANDIDATE_TEMPERATURES = (0.7, 0.4, 1.0, 0.2, 0.9)
+TOKEN_BUDGET = 60_000  # total tokens the loop may spend across all candidates
+
 
 def build_prompt(
     context: Dict,
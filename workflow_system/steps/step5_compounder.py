@@ -9,6 +9,9 @@ THIS is what makes the system compound over time.
 import json
 from typing import Dict, List
 
+# Prior steps whose output build_prompt() reads (step DAG edges)
+INPUTS = ("audit", "architect", "analyst", "refinery")
+
 SYSTEM_PROMPT = """Du bist der Meta-Optimizer. Du analysierst den gesamten Zyklus
 und extrahierst Patterns die das System BESSER machen.
 Jede Woche smarter. Compounding Intelligence.
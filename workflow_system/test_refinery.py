@@ -0,0 +1,73 @@
+"""Tests for the speculative refinery loop (Step 4)."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import orchestrator  # noqa: E402
+from steps import step4_refinery  # noqa: E402
+
+
+def _reply(score: float) -> str:
+    return json.dumps({"iteration": 1, "quality_scores": {"overall": score}})
+
+
+@pytest.fixture
+def model(monkeypatch, tmp_path):
+    """Fake model: pops replies per temperature, records every call."""
+    calls = []
+    saved = []
+    replies = {}
+
+    async def fake_call(step_name, system_prompt, user_prompt, temperature=0.7):
+        calls.append(temperature)
+        score, used, delay = replies[temperature].pop(0)
+        await asyncio.sleep(delay)
+        return _reply(score), used
+
+    monkeypatch.setattr(orchestrator, "call_model_with_usage", fake_call)
+    monkeypatch.setattr(orchestrator, "append_step_result", lambda step, result: saved.append(result))
+    monkeypatch.setattr(orchestrator, "OUTPUT_DIR", tmp_path)
+    return replies, calls, saved
+
+
+def test_candidates_pick_best(model):
+    replies, calls, _ = model
+    t = step4_refinery.CANDIDATE_TEMPERATURES
+    replies.update({t[0]: [(5.0, 100, 0)], t[1]: [(7.0, 100, 0.01)], t[2]: [(6.0, 100, 0.02)]})
+    best, score, tokens, made = asyncio.run(orchestrator._refinery_candidates("p", 3, 0.0))
+    assert score == 7.0 and best["quality_scores"]["overall"] == 7.0
+    assert (tokens, made) == (300, 3)
+
+
+def test_candidates_stop_at_target(model):
+    replies, _, _ = model
+    t = step4_refinery.CANDIDATE_TEMPERATURES
+    replies.update({t[0]: [(9.0, 100, 0)], t[1]: [(9.5, 100, 1.0)]})
+    _, score, tokens, made = asyncio.run(orchestrator._refinery_candidates("p", 2, 0.0))
+    assert score == 9.0 and (tokens, made) == (100, 1)  # the slow candidate was cancelled
+
+
+def test_budget_shrinks_candidates(model):
+    replies, calls, saved = model
+    t = step4_refinery.CANDIDATE_TEMPERATURES
+    # Iteration 1: 3 calls × 1000 tokens; 3500 left → room for 3; iteration 2 uses 3 more; 500 left → stop
+    replies.update({temp: [(3.0, 1000, 0), (4.0, 1000, 0)] for temp in t[:3]})
+    result = asyncio.run(orchestrator.run_refinery_loop(context={}, candidates=3, token_budget=6500))
+    assert len(calls) == 6
+    assert result["quality_scores"]["overall"] == 4.0 and saved == [result]
+
+
+def test_budget_without_reported_usage(model):
+    replies, calls, _ = model
+    t = step4_refinery.CANDIDATE_TEMPERATURES
+    replies.update({temp: [(3.0, 0, 0), (4.0, 0, 0)] for temp in t[:2]})
+    # No usage in the replies: each call counts as MAX_TOKENS, so one round fits
+    budget = 3 * orchestrator.MAX_TOKENS
+    asyncio.run(orchestrator.run_refinery_loop(context={}, candidates=2, token_budget=budget))
+    assert len(calls) == 3
@@ -0,0 +1,137 @@
+"""Tests for the pluggable workflow state store."""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state import store  # noqa: E402
+from state.store import JsonStateBackend, SQLiteStateBackend, StateBackend, load_snapshot  # noqa: E402
+
+
+@pytest.fixture(params=["sqlite", "json"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        b = SQLiteStateBackend(tmp_path / "state.db")
+        yield b
+        b.close()
+    else:
+        yield JsonStateBackend(tmp_path / "state.json", pattern_file=tmp_path / "patterns.json")
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        StateBackend()
+
+
+def test_round_trip_and_cycle_carry_over(backend):
+    backend.append_step("audit", "first", {"summary": "first", "score": 1})
+    backend.append_step("audit", "second", {"summary": "second", "score": 2})
+    backend.add_pattern({"name": "retry"})
+    backend.add_improvement({"what": "cache"})
+    backend.set_meta(active_focus="speed")
+    backend.append_log("actions", {"n": 1}, keep=2)
+    backend.append_log("actions", {"n": 2}, keep=2)
+    backend.append_log("actions", {"n": 3}, keep=2)
+
+    context = backend.step_context()
+    assert context["prior_steps"] == {"audit": {"summary": "second", "score": 2}}
+    assert [p["name"] for p in context["patterns"]] == ["retry"]
+    assert backend.get_meta("active_focus") == "speed"
+    assert backend.read_log("actions") == [{"n": 2}, {"n": 3}]
+    assert backend.pattern_library() == [{"name": "retry"}]
+
+    old, cycle = backend.advance_cycle()
+    assert cycle == 1
+    assert len(old["steps_completed"]) == 2
+    state = backend.snapshot()
+    assert state["cycle"] == 1
+    assert state["steps_completed"] == [] and state["context"] == {}
+    assert [p["name"] for p in state["patterns"]] == ["retry"]  # carried over
+    assert state["improvements"] == [{"what": "cache"}]
+    assert state["active_focus"] == "speed"
+
+
+def test_replace_matches_snapshot(tmp_path):
+    b = SQLiteStateBackend(tmp_path / "state.db")
+    b.replace(
+        {
+            "cycle": 3,
+            "created": "2024-01-01T00:00:00",
+            "steps_completed": [{"step": "plan", "timestamp": "t1", "summary": "s"}],
+            "context": {"plan": {"summary": "s"}},
+            "patterns": [{"name": "p", "cycle": 2, "discovered": "d"}],
+            "improvements": [],
+            "actions_taken": [1, 2],
+            "focus": "x",
+        },
+        logs=["actions_taken"],
+    )
+    state = b.snapshot()
+    assert state["cycle"] == 3 and state["created"] == "2024-01-01T00:00:00"
+    assert state["context"] == {"plan": {"summary": "s"}}
+    assert state["patterns"] == [{"name": "p", "cycle": 2, "discovered": "d"}]
+    assert b.read_log("actions_taken") == [1, 2]
+    assert state["focus"] == "x"
+    b.close()
+
+
+def _legacy_files(tmp_path):
+    state_file = tmp_path / "current_state.json"
+    pattern_file = tmp_path / "pattern_library.json"
+    state_file.write_text(json.dumps({"cycle": 2, "steps_completed": [], "context": {}, "patterns": [], "improvements": []}))
+    pattern_file.write_text(json.dumps([{"name": "a"}, {"name": "b"}]))
+    return state_file, pattern_file
+
+
+def test_migration_imports_once(tmp_path):
+    state_file, pattern_file = _legacy_files(tmp_path)
+    b = SQLiteStateBackend(tmp_path / "state.db")
+    assert b.migrate_json(state_file, pattern_file)
+    assert not b.migrate_json(state_file, pattern_file)
+    assert b.get_meta("cycle") == 2
+    assert b.pattern_library() == [{"name": "a"}, {"name": "b"}]
+    b.close()
+
+
+def test_concurrent_fresh_open_migrates_once(tmp_path):
+    state_file, pattern_file = _legacy_files(tmp_path)
+    db_path = tmp_path / "state.db"
+    barrier = threading.Barrier(4)
+    backends = [SQLiteStateBackend(db_path) for _ in range(4)]  # one connection each, like separate daemons
+    results = []
+
+    def open_and_migrate(b):
+        empty = b.is_empty()
+        barrier.wait()  # everybody saw the empty database
+        results.append(empty and b.migrate_json(state_file, pattern_file))
+
+    threads = [threading.Thread(target=open_and_migrate, args=(b,)) for b in backends]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == [False, False, False, True]
+    assert len(backends[0].pattern_library()) == 2
+    for b in backends:
+        b.close()
+
+
+def test_load_snapshot_is_read_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STATE_BACKEND", "sqlite")
+    db_path = tmp_path / "other.db"
+    sqlite3.connect(str(db_path)).close()  # exists, but no schema
+    assert load_snapshot(db_path, tmp_path / "missing.json") == {}
+    tables = sqlite3.connect(str(db_path)).execute("SELECT name FROM sqlite_master").fetchall()
+    assert tables == []
+
+    b = SQLiteStateBackend(tmp_path / "state.db")
+    b.set_meta(cycle=5)
+    b.close()
+    assert load_snapshot(tmp_path / "state.db", tmp_path / "missing.json")["cycle"] == 5
@@ -0,0 +1,75 @@
+"""Tests for the step DAG scheduler."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from step_dag import StepDAG, execute  # noqa: E402
+
+# audit → (architect, analyst) → refinery
+DIAMOND = {"audit": [], "architect": ["audit"], "analyst": ["audit"], "refinery": ["architect", "analyst"]}
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    with pytest.raises(ValueError, match="unknown step 'missing'"):
+        StepDAG({"a": ["missing"]})
+    with pytest.raises(ValueError, match="cycle: a, b"):
+        StepDAG({"a": ["b"], "b": ["a"], "c": []})
+
+
+def test_order_and_critical_path():
+    dag = StepDAG(DIAMOND)
+    assert dag.order[0] == "audit" and dag.order[-1] == "refinery"
+    seconds, path = dag.critical_path({"audit": 1.0, "architect": 5.0, "analyst": 2.0, "refinery": 1.0})
+    assert seconds == 7.0
+    assert path == ["audit", "architect", "refinery"]
+    assert StepDAG({}).critical_path({}) == (0.0, [])
+
+
+def test_execute_runs_independent_steps_concurrently():
+    dag = StepDAG(DIAMOND)
+    active = []
+    peak = [0]
+    seen_inputs = {}
+
+    async def run(name, inputs):
+        seen_inputs[name] = sorted(inputs)
+        active.append(name)
+        peak[0] = max(peak[0], len(active))
+        await asyncio.sleep(0.01)
+        active.remove(name)
+        return {"step": name}, name == "audit"
+
+    outputs, runs = asyncio.run(execute(dag, run))
+    assert set(outputs) == set(DIAMOND)
+    assert peak[0] == 2  # architect and analyst overlap
+    assert seen_inputs["refinery"] == ["analyst", "architect"]
+    assert runs["audit"].cached and not runs["refinery"].cached
+    assert runs["refinery"].started >= max(runs["architect"].finished, runs["analyst"].finished)
+
+    peak[0] = 0
+    asyncio.run(execute(dag, run, max_parallel=1))
+    assert peak[0] == 1
+
+
+def test_failure_cancels_running_steps():
+    dag = StepDAG(DIAMOND)
+    cancelled = []
+
+    async def run(name, inputs):
+        if name == "analyst":
+            raise RuntimeError("analyst failed")
+        try:
+            await asyncio.sleep(0 if name == "audit" else 10)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return {"step": name}, False
+
+    with pytest.raises(RuntimeError, match="analyst failed"):
+        asyncio.run(execute(dag, run))
+    assert cancelled == ["architect"]  # refinery never started